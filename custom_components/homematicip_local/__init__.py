@@ -1,65 +1,237 @@
 from __future__ import annotations
 
 from datetime import timedelta
-from typing import Callable, cast, override
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Callable, TypeVar, cast, override
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN, PLATFORMS
+from .const import (
+    CONF_COALESCE_MAX_LATENCY,
+    CONF_COALESCE_WINDOW,
+    CONF_IGNORED_FIELDS,
+    CONF_RECORD_TRAFFIC,
+    CONF_VALIDATION_MODE,
+    CONF_VALIDATION_SAMPLE_RATE,
+    DEFAULT_COALESCE_MAX_LATENCY_MS,
+    DEFAULT_COALESCE_WINDOW_MS,
+    DEFAULT_IGNORED_FIELDS,
+    DEFAULT_RECORD_TRAFFIC,
+    DEFAULT_VALIDATION_MODE,
+    DEFAULT_VALIDATION_SAMPLE_RATE,
+    DOMAIN,
+    PLATFORMS,
+)
+from .server.recorder import FrameRecorder
 from .server.server import HCUController
-from .server.types.hmip_system import SystemState
+from .server.state import StateChanges, full_changes
+from .server.types.hmip_system import Device, SystemState
+from .server.validator import ValidationMode, ValidationPolicy
+
+_E = TypeVar("_E")
+
+# Safety-net poll interval, only used while the push connection is down
+FALLBACK_UPDATE_INTERVAL = timedelta(seconds=30)
+# Last known SystemState, persisted so entities come up before the HCU answers
+STATE_STORAGE_VERSION = 1
+# Changes are written at most this often (seconds) and at shutdown
+STATE_SAVE_DELAY = 60
+# How long setup waits for the push connection without a cached state (seconds)
+CONNECT_TIMEOUT = 5.0
+
+
+def _state_cache(hass: HomeAssistant, entry: ConfigEntry) -> Store[SystemState]:
+    return Store(hass, STATE_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.state")
 
 
 class HCUCoordinator(DataUpdateCoordinator[SystemState]):
     controller: HCUController
+    last_changes: StateChanges
     _remove_controller_listener: Callable[[], None] | None
+    _remove_connection_listener: Callable[[], None] | None
+    _cache: Store[SystemState] | None
+    _save_scheduled: bool
 
-    def __init__(self, hass: HomeAssistant, controller: HCUController) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        controller: HCUController,
+        cache: Store[SystemState] | None = None,
+    ) -> None:
         super().__init__(
             hass,
             logger=controller.logger,
             name="HCU System State",
-            update_interval=timedelta(seconds=30),
+            update_interval=None if controller.connected else FALLBACK_UPDATE_INTERVAL,
         )
         self.controller = controller
+        self.last_changes = full_changes()
+        self._cache = cache
+        self._save_scheduled = False
         self._remove_controller_listener = controller.add_state_listener(
             self._on_state_changed
         )
+        self._remove_connection_listener = controller.add_connection_listener(
+            self._on_connection_changed
+        )
+
+    def _on_state_changed(self, state: SystemState, changes: StateChanges) -> None:
+        # The controller already merged the event; hand the result straight to
+        # the loop instead of re-fetching the whole state for every push.
+        _ = self.hass.loop.call_soon_threadsafe(self._async_publish, state, changes)
 
-    async def _async_pull_and_update(self) -> None:
-        def _get() -> SystemState | None:
-            resp = self.controller.get_system_state()
-            return resp
+    @callback
+    def _async_publish(self, state: SystemState, changes: StateChanges) -> None:
+        self.last_changes = changes
+        self.async_set_updated_data(state)
+        self._schedule_save()
 
-        data = await self.hass.async_add_executor_job(_get)
-        if data:
-            self.async_set_updated_data(data)
+    @callback
+    def _schedule_save(self) -> None:
+        """Persist the current state within STATE_SAVE_DELAY seconds.
+
+        Store.async_delay_save restarts its delay on every call, which under a
+        steady stream of pushes would postpone the write until shutdown, so
+        it is only called when no write is pending.
+        """
+        if self._cache is None or self._save_scheduled:
+            return
+        self._save_scheduled = True
+        self._cache.async_delay_save(self._state_to_save, STATE_SAVE_DELAY)
+
+    @callback
+    def _state_to_save(self) -> SystemState:
+        # Called when the write happens: the latest published (immutable) state
+        self._save_scheduled = False
+        return self.data
+
+    async def async_restore(self) -> bool:
+        """Publish the persisted state, if any, without contacting the HCU."""
+        if self._cache is None:
+            return False
+        try:
+            cached = await self._cache.async_load()
+        except Exception:
+            self.logger.exception("Discarding unreadable cached system state")
+            return False
+        if not isinstance(cached, dict) or "devices" not in cached:
+            return False
+        await self.controller.async_restore_state(cached)
+        self.last_changes = full_changes()
+        self.async_set_updated_data(cached)
+        return True
+
+    def discovery_devices(
+        self, *channel_types: str, full: bool = False
+    ) -> list[Device]:
+        """Devices a platform's discovery has to look at for the last update.
+
+        After a full refresh these are all devices (restricted, when
+        channel_types are given, to devices having such a channel); otherwise
+        only the devices touched by the update. Pass full=True for a platform's
+        initial discovery. Uses the controller's state indexes, so discovery
+        costs O(changed devices) per push event.
+        """
+        devices = self.data["devices"]
+        store = self.controller.state_store
+        changes = self.last_changes
+        if full or changes["full"]:
+            if not channel_types:
+                return list(devices.values())
+            ids: set[str] = store.devices_with_channel_type(*channel_types)
+        elif channel_types:
+            wanted = set(channel_types)
+            ids = {
+                did
+                for did in changes["devices"]
+                if wanted.intersection(store.device_channels(did).values())
+            }
         else:
-            self.logger.error("Failed to fetch system state from HCU")
+            ids = changes["devices"]
+        return [devices[did] for did in ids if did in devices]
+
+    def discovery_groups(self, *group_types: str, full: bool = False) -> list[str]:
+        """Ids of groups of the given types touched by the last update (all if full)."""
+        groups = self.data["groups"]
+        candidates = self.controller.state_store.groups_of_type(*group_types)
+        if not (full or self.last_changes["full"]):
+            candidates &= self.last_changes["groups"]
+        return [gid for gid in candidates if gid in groups]
 
-    def _on_state_changed(self) -> None:
-        _ = self.hass.loop.call_soon_threadsafe(
-            self.hass.async_create_task, self._async_pull_and_update()
+    def dirty_channel_entities(
+        self,
+        by_channel: Mapping[tuple[str, str], Sequence[_E]],
+        all_entities: Sequence[_E],
+    ) -> Iterable[_E]:
+        """Entities bound to a (device id, channel key) touched by the last update.
+
+        Every entity is returned after a full refresh.
+        """
+        changes = self.last_changes
+        if changes["full"]:
+            return all_entities
+        return [ent for key in changes["channels"] for ent in by_channel.get(key, ())]
+
+    def dirty_group_entities(
+        self,
+        by_group: Mapping[str, Sequence[_E]],
+        all_entities: Sequence[_E],
+    ) -> Iterable[_E]:
+        """Entities bound to a group id touched by the last update.
+
+        Every entity is returned after a full refresh.
+        """
+        changes = self.last_changes
+        if changes["full"]:
+            return all_entities
+        return [ent for gid in changes["groups"] for ent in by_group.get(gid, ())]
+
+    def _on_connection_changed(self, connected: bool) -> None:
+        _ = self.hass.loop.call_soon_threadsafe(self._async_set_polling, not connected)
+
+    @callback
+    def _async_set_polling(self, polling: bool) -> None:
+        interval = FALLBACK_UPDATE_INTERVAL if polling else None
+        if self.update_interval == interval:
+            return
+        self.logger.debug(
+            "Push connection %s, %s fallback polling",
+            "lost" if polling else "restored",
+            "enabling" if polling else "disabling",
         )
+        self.update_interval = interval
+        # async_set_updated_data re-arms the timer on every push; with no
+        # interval that is a no-op, so only the polling case needs a kick.
+        if polling:
+            self._schedule_refresh()
+        else:
+            self._unschedule_refresh()
 
     def close(self) -> None:
-        cb = self._remove_controller_listener
+        for cb in (self._remove_controller_listener, self._remove_connection_listener):
+            if cb is not None:
+                try:
+                    cb()
+                except Exception:
+                    pass
         self._remove_controller_listener = None
-        if cb is not None:
-            try:
-                cb()
-            except Exception:
-                pass
+        self._remove_connection_listener = None
 
     @override
-    async def _async_update_data(self):
-        def _get():
-            resp = self.controller.get_system_state()
-            return resp
-
-        return await self.hass.async_add_executor_job(_get)
+    async def _async_update_data(self) -> SystemState:
+        try:
+            state = await self.controller.async_fetch_system_state()
+        except Exception as err:
+            raise UpdateFailed(f"Failed to fetch system state from HCU: {err}") from err
+        # Diffed against the state the controller held before the fetch
+        self.last_changes = self.controller.last_fetch_changes
+        self._schedule_save()
+        return state
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -68,25 +240,77 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     activation_key = str(data.get("activation_key"))
     auth_token = str(data.get("auth_token"))
     client_id = cast(str, data.get("client_id", ""))
+    options = entry.options
+    coalesce_window_ms = cast(
+        int, options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW_MS)
+    )
+    coalesce_max_latency_ms = cast(
+        int, options.get(CONF_COALESCE_MAX_LATENCY, DEFAULT_COALESCE_MAX_LATENCY_MS)
+    )
+    ignored_fields = str(options.get(CONF_IGNORED_FIELDS, DEFAULT_IGNORED_FIELDS))
+    validation_policy = ValidationPolicy(
+        cast(
+            ValidationMode, options.get(CONF_VALIDATION_MODE, DEFAULT_VALIDATION_MODE)
+        ),
+        cast(
+            int,
+            options.get(CONF_VALIDATION_SAMPLE_RATE, DEFAULT_VALIDATION_SAMPLE_RATE),
+        ),
+    )
+    recorder = (
+        FrameRecorder(hass.config.path(DOMAIN, f"capture-{entry.entry_id}.jsonl.gz"))
+        if options.get(CONF_RECORD_TRAFFIC, DEFAULT_RECORD_TRAFFIC)
+        else None
+    )
 
-    controller = HCUController(host, activation_key, auth_token, client_id)
-    controller.start()
-    _ready = await hass.async_add_executor_job(controller.wait_until_ready, 5.0)
+    controller = HCUController(
+        host,
+        activation_key,
+        auth_token,
+        client_id,
+        session=async_get_clientsession(hass, verify_ssl=False),
+        coalesce_window=coalesce_window_ms / 1000,
+        coalesce_max_latency=max(coalesce_max_latency_ms, coalesce_window_ms) / 1000,
+        ignored_fields=[f.strip() for f in ignored_fields.split(",") if f.strip()],
+        validation_policy=validation_policy,
+        recorder=recorder,
+    )
+    coordinator = HCUCoordinator(hass, controller, _state_cache(hass, entry))
+    try:
+        # Restore before connecting: the controller's resync on the first
+        # connection is then diffed against the cache and only publishes what
+        # changed
+        restored = await coordinator.async_restore()
+        await controller.async_start()
+        if not restored:
+            if not await controller.async_wait_until_ready(CONNECT_TIMEOUT):
+                raise ConfigEntryNotReady(f"Cannot connect to the HCU at {host}")
+            await coordinator.async_config_entry_first_refresh()
 
-    coordinator = HCUCoordinator(hass, controller)
-    await coordinator.async_config_entry_first_refresh()
+        if DOMAIN not in hass.data:
+            hass.data[DOMAIN] = {}
+        hass.data[DOMAIN][entry.entry_id] = {
+            "controller": controller,
+            "coordinator": coordinator,
+        }
 
-    if DOMAIN not in hass.data:
-        hass.data[DOMAIN] = {}
-    hass.data[DOMAIN][entry.entry_id] = {
-        "controller": controller,
-        "coordinator": coordinator,
-    }
+        entry.async_on_unload(entry.add_update_listener(_async_options_updated))
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except BaseException:
+        # Every setup retry starts a new controller: stop this one (its
+        # reconnect loop and recorder thread) before giving up
+        _ = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        coordinator.close()
+        await controller.async_stop()
+        raise
     return True
 
 
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    _ = await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     domain_bucket_obj = hass.data.get(cast(str, DOMAIN))
@@ -112,10 +336,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if coordinator:
         coordinator.close()
     if controller:
-        await hass.async_add_executor_job(controller.stop)
+        await controller.async_stop()
     if cast(str, DOMAIN) in hass.data and not hass.data[cast(str, DOMAIN)]:
         removed: dict[str, object] | None = cast(
             dict[str, object] | None, hass.data.pop(cast(str, DOMAIN), None)
         )
         _ = removed
     return bool(unload_ok)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await _state_cache(hass, entry).async_remove()
@@ -46,6 +46,11 @@ class HCUHeatingGroupClimate(ClimateEntity):
         self._attr_name = name
         self._attr_unique_id = f"{DOMAIN}:{uid}"
 
+    @property
+    def hcu_group_id(self) -> str:
+        """Public accessor for the underlying group id."""
+        return self._group_id
+
     def _groups_map(self):
         gm = self._coordinator.data["groups"]
         return gm
@@ -55,15 +60,11 @@ class HCUHeatingGroupClimate(ClimateEntity):
         return g
 
     def _suggested_area_name(self) -> str | None:
-        g = self._group()
-        mgi = g["metaGroupId"]
-        if isinstance(mgi, str):
-            mg = self._groups_map()[mgi]
-            if mg["type"] == "META":
-                lbl = mg["label"]
-                if lbl.strip():
-                    return lbl.strip()
+        room = self._coordinator.controller.state_store.room_of_group(self._group_id)
+        if room:
+            return room
 
+        g = self._group()
         lbl2 = g["label"]
         if lbl2.strip():
             return lbl2.strip()
@@ -154,11 +155,9 @@ class HCUHeatingGroupClimate(ClimateEntity):
         if not isinstance(temp_obj, (int, float)):
             return
         controller = self._coordinator.controller
-
-        def _send() -> None:
-            controller.set_heating_group_setpoint(self._group_id, float(temp_obj))
-
-        await self.hass.async_add_executor_job(_send)
+        await controller.async_set_heating_group_setpoint(
+            self._group_id, float(temp_obj)
+        )
         self.async_write_ha_state()
 
 
@@ -170,16 +169,21 @@ async def async_setup_entry(
     coordinator: HCUCoordinator = cast("HCUCoordinator", stored.get("coordinator"))
 
     known: set[str] = set()
-    all_entities: list[ClimateEntity] = []
+    all_entities: list[HCUHeatingGroupClimate] = []
+    by_group: dict[str, list[HCUHeatingGroupClimate]] = {}
 
-    def _discover() -> list[ClimateEntity]:
+    def _track(entities: list[HCUHeatingGroupClimate]) -> None:
+        all_entities.extend(entities)
+        for ent in entities:
+            by_group.setdefault(ent.hcu_group_id, []).append(ent)
+
+    def _discover(full: bool = False) -> list[HCUHeatingGroupClimate]:
         groups = coordinator.data["groups"]
 
-        new_entities: list[ClimateEntity] = []
+        new_entities: list[HCUHeatingGroupClimate] = []
 
-        for gid, g_map in groups.items():
-            if g_map["type"] != "HEATING":
-                continue
+        for gid in coordinator.discovery_groups("HEATING", full=full):
+            g_map = groups[gid]
             uid = f"heating_group:{gid}"
             if uid in known:
                 continue
@@ -189,17 +193,17 @@ async def async_setup_entry(
             new_entities.append(ent)
         return new_entities
 
-    initial = _discover()
+    initial = _discover(full=True)
     if initial:
         async_add_entities(initial, True)
-        all_entities.extend(initial)
+        _track(initial)
 
     def _on_update() -> None:
         new = _discover()
         if new:
             async_add_entities(new)
-            all_entities.extend(new)
-        for ent in all_entities:
+            _track(new)
+        for ent in coordinator.dirty_group_entities(by_group, all_entities):
             for attr in (
                 "hvac_mode",
                 "current_temperature",
@@ -1,14 +1,30 @@
 from __future__ import annotations
 
 import re
-from typing import override
+from typing import cast, override
 
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.config_entries import ConfigFlowResult
-
-from .const import DOMAIN
+from homeassistant.config_entries import ConfigEntry, ConfigFlowResult
+from homeassistant.core import callback
+
+from .const import (
+    CONF_COALESCE_MAX_LATENCY,
+    CONF_COALESCE_WINDOW,
+    CONF_IGNORED_FIELDS,
+    CONF_RECORD_TRAFFIC,
+    CONF_VALIDATION_MODE,
+    CONF_VALIDATION_SAMPLE_RATE,
+    DEFAULT_COALESCE_MAX_LATENCY_MS,
+    DEFAULT_COALESCE_WINDOW_MS,
+    DEFAULT_IGNORED_FIELDS,
+    DEFAULT_RECORD_TRAFFIC,
+    DEFAULT_VALIDATION_MODE,
+    DEFAULT_VALIDATION_SAMPLE_RATE,
+    DOMAIN,
+)
 from .server.server import confirm_auth_token, init_hcu_plugin
+from .server.validator import VALIDATION_MODES
 
 
 class HomematicIPLocalConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -21,6 +37,14 @@ class HomematicIPLocalConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._activation_key: str | None = None
         self._existing: bool = False
 
+    @staticmethod
+    @callback
+    @override
+    def async_get_options_flow(
+        config_entry: ConfigEntry,
+    ) -> HomematicIPLocalOptionsFlow:
+        return HomematicIPLocalOptionsFlow()
+
     @override
     async def async_step_user(
         self, user_input: dict[str, object] | None = None
@@ -104,3 +128,60 @@ class HomematicIPLocalConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="credentials", data_schema=schema, errors=errors
         )
+
+
+class HomematicIPLocalOptionsFlow(config_entries.OptionsFlow):
+    """Handle tuning options for an existing HCU entry."""
+
+    async def async_step_init(
+        self, user_input: dict[str, object] | None = None
+    ) -> ConfigFlowResult:
+        errors: dict[str, str] = {}
+        options = self.config_entry.options
+        if user_input is not None:
+            window = cast(int, user_input[CONF_COALESCE_WINDOW])
+            max_latency = cast(int, user_input[CONF_COALESCE_MAX_LATENCY])
+            if max_latency < window:
+                errors[CONF_COALESCE_MAX_LATENCY] = "max_latency_below_window"
+            else:
+                fields = str(user_input.get(CONF_IGNORED_FIELDS, ""))
+                user_input[CONF_IGNORED_FIELDS] = ", ".join(
+                    f.strip() for f in fields.split(",") if f.strip()
+                )
+                return self.async_create_entry(data={**options, **user_input})
+
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_COALESCE_WINDOW,
+                    default=options.get(
+                        CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW_MS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+                vol.Required(
+                    CONF_COALESCE_MAX_LATENCY,
+                    default=options.get(
+                        CONF_COALESCE_MAX_LATENCY, DEFAULT_COALESCE_MAX_LATENCY_MS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5000)),
+                vol.Optional(
+                    CONF_IGNORED_FIELDS,
+                    default=options.get(CONF_IGNORED_FIELDS, DEFAULT_IGNORED_FIELDS),
+                ): str,
+                vol.Required(
+                    CONF_VALIDATION_MODE,
+                    default=options.get(CONF_VALIDATION_MODE, DEFAULT_VALIDATION_MODE),
+                ): vol.In(VALIDATION_MODES),
+                vol.Required(
+                    CONF_VALIDATION_SAMPLE_RATE,
+                    default=options.get(
+                        CONF_VALIDATION_SAMPLE_RATE, DEFAULT_VALIDATION_SAMPLE_RATE
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100000)),
+                vol.Required(
+                    CONF_RECORD_TRAFFIC,
+                    default=options.get(CONF_RECORD_TRAFFIC, DEFAULT_RECORD_TRAFFIC),
+                ): bool,
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
@@ -10,3 +10,20 @@ PLATFORMS: list[Platform] = [
     Platform.CLIMATE,
     Platform.SWITCH,
 ]
+
+# Options (milliseconds in the UI, seconds in the controller)
+CONF_COALESCE_WINDOW = "coalesce_window_ms"
+CONF_COALESCE_MAX_LATENCY = "coalesce_max_latency_ms"
+DEFAULT_COALESCE_WINDOW_MS = 100
+DEFAULT_COALESCE_MAX_LATENCY_MS = 500
+CONF_IGNORED_FIELDS = "ignored_fields"
+# Comma separated device/channel field names that never trigger entity updates
+DEFAULT_IGNORED_FIELDS = "lastStatusUpdate"
+CONF_VALIDATION_MODE = "validation_mode"
+# off, sampled, first_shape or strict (see server.validator.ValidationPolicy)
+DEFAULT_VALIDATION_MODE = "first_shape"
+CONF_VALIDATION_SAMPLE_RATE = "validation_sample_rate"
+DEFAULT_VALIDATION_SAMPLE_RATE = 100
+CONF_RECORD_TRAFFIC = "record_traffic"
+# Received frames go to <config>/homematicip_local/capture-<entry id>.jsonl.gz
+DEFAULT_RECORD_TRAFFIC = False
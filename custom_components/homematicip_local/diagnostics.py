@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import cast
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .server.server import HCUController
+
+TO_REDACT = {"activation_key", "auth_token", "client_id", "host"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, object]:
+    """Schema drift and validation statistics of a config entry."""
+    stored = cast(dict[str, object], hass.data.get(DOMAIN, {}).get(entry.entry_id, {}))
+    diagnostics: dict[str, object] = {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+    }
+    controller = stored.get("controller")
+    if not isinstance(controller, HCUController):
+        return diagnostics
+    policy = controller.validation_policy
+    worker = controller._validation_worker  # pyright: ignore[reportPrivateUsage]
+    diagnostics["validation"] = {
+        "mode": policy.mode,
+        "sample_rate": policy.sample_rate,
+        "validated": policy.validated,
+        "skipped": policy.skipped,
+        "worker_submitted": worker.submitted,
+        "worker_dropped": worker.dropped,
+        "worker_pending": worker.pending,
+    }
+    diagnostics["stale_events_dropped"] = controller.state_store.stale_events
+    diagnostics["schema_drift"] = controller.drift_registry.as_dict()
+    if controller.recorder is not None:
+        diagnostics["recorder"] = {
+            "path": str(controller.recorder.path),
+            "recorded": controller.recorder.recorded,
+            "dropped": controller.recorder.dropped,
+        }
+    return diagnostics
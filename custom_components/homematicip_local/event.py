@@ -43,27 +43,26 @@ class _BaseHcuEventEntity(EventEntity):
         self._attr_name = name
         self._attr_unique_id = f"{DOMAIN}:{uid}"
 
+    @property
+    def hcu_device_id(self) -> str:
+        """Public accessor for the underlying device id."""
+        return self._device_id
+
+    @property
+    def hcu_channel_key(self) -> str:
+        """Public accessor for the functional channel key."""
+        return self._channel_key
+
     def _get_channel(self) -> FunctionalChannel:
         devices = self._coordinator.data["devices"]
         dev = devices[self._device_id]
         return dev["functionalChannels"][self._channel_key]
 
     def _suggested_area_name(self) -> str | None:
-        body = self._coordinator.data
-        devices = body["devices"]
-        dev = devices[self._device_id]
-        channel = dev["functionalChannels"][self._channel_key]
-        groups_list = channel.get("groups") or []
-        if not groups_list:
-            return None
-        groups_map = body["groups"]
-        for gid in groups_list:
-            group = groups_map[gid]
-            if group["type"] == "META":
-                label = group["label"]
-                if label.strip():
-                    return label.strip()
-        return None
+        store = self._coordinator.controller.state_store
+        return store.room_of_channel(
+            self._device_id, self._channel_key, device_fallback=True
+        )
 
     @override
     async def async_added_to_hass(self) -> None:
@@ -144,12 +143,17 @@ async def async_setup_entry(
 
     known: set[str] = set()
     all_entities: list[HCUDoorBellEventEntity] = []
+    by_channel: dict[tuple[str, str], list[HCUDoorBellEventEntity]] = {}
+
+    def _track(entities: list[HCUDoorBellEventEntity]) -> None:
+        all_entities.extend(entities)
+        for ent in entities:
+            key = (ent.hcu_device_id, ent.hcu_channel_key)
+            by_channel.setdefault(key, []).append(ent)
 
-    def _discover() -> list[EventEntity]:
-        body = coordinator.data
-        devices = body["devices"]
+    def _discover(full: bool = False) -> list[EventEntity]:
         new_entities: list[EventEntity] = []
-        for dev in devices.values():
+        for dev in coordinator.discovery_devices("MULTI_MODE_INPUT_CHANNEL", full=full):
             dev_id = dev["id"]
             label = dev["label"]
             channels = dev["functionalChannels"]
@@ -166,17 +170,18 @@ async def async_setup_entry(
                         known.add(uid)
         return new_entities
 
-    initial = _discover()
+    initial = _discover(full=True)
     if initial:
         async_add_entities(initial, True)
-        all_entities.extend(cast(list[HCUDoorBellEventEntity], initial))
+        _track(cast(list[HCUDoorBellEventEntity], initial))
 
     def _on_update() -> None:
         new = _discover()
         if new:
             async_add_entities(new)
-            all_entities.extend(cast(list[HCUDoorBellEventEntity], new))
-        for ent in all_entities:
+            _track(cast(list[HCUDoorBellEventEntity], new))
+        dirty = coordinator.dirty_channel_entities(by_channel, all_entities)
+        for ent in dirty:
             try:
                 ent.maybe_fire()
             except Exception:
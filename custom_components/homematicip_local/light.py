@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Mapping
-from functools import cached_property, partial
+from functools import cached_property
 from typing import TYPE_CHECKING, cast
 
 from homeassistant.components.light import (
@@ -46,44 +46,22 @@ class _BaseHCULight(LightEntity):
         self._attr_name = name
         self._attr_unique_id = f"{DOMAIN}:{uid}"
 
+    @property
+    def hcu_device_id(self) -> str:
+        """Public accessor for the underlying device id."""
+        return self._device_id
+
+    @property
+    def hcu_channel_key(self) -> str:
+        """Public accessor for the functional channel key."""
+        return self._channel_key
+
     def _suggested_area_name(self) -> str | None:
         """Return room name from META group, if present for this channel."""
-        body = self._coordinator.data
-        device = body["devices"][self._device_id]
-        channels = device["functionalChannels"]
-        ch = channels[self._channel_key]
-        groups_list = ch["groups"]
-        groups_map = body["groups"]
-        # First try: resolve META from channel-linked groups; also follow metaGroupId on non-META groups
-        if groups_list:
-            for gid in groups_list:
-                g = groups_map[gid]
-                if g["type"] == "META":
-                    lbl = g["label"]
-                    if lbl.strip():
-                        return lbl.strip()
-                else:
-                    mgi = g["metaGroupId"]
-                    if isinstance(mgi, str):
-                        mg = groups_map[mgi]
-                        mg_type = mg["type"]
-                        if mg_type == "META":
-                            mlbl = mg["label"]
-                            if mlbl.strip():
-                                return mlbl.strip()
-
-        for gmeta in groups_map.values():
-            gtype2 = gmeta["type"]
-            if gtype2 != "META":
-                continue
-            chans2 = gmeta["channels"]
-            for chd in chans2:
-                did2 = chd.get("deviceId")
-                if did2 == self._device_id:
-                    glbl2 = gmeta.get("label")
-                    if glbl2.strip():
-                        return glbl2.strip()
-        return None
+        store = self._coordinator.controller.state_store
+        return store.room_of_channel(
+            self._device_id, self._channel_key, device_fallback=True
+        )
 
     @override
     async def async_added_to_hass(self) -> None:
@@ -195,27 +173,23 @@ class HCUAccessPointNotificationLight(_BaseHCULight):
             if up in self._ALLOWED_SIMPLE_COLORS:
                 color = up
         ctrl = self._coordinator.controller
-        func = partial(
-            ctrl.set_notification_light,
+        await ctrl.async_set_notification_light(
             self._device_id,
             int(self._channel_key),
             dim_level=float(dim),
             **({"simple_rgb_color_state": color} if color else {}),
         )
-        await self.hass.async_add_executor_job(func)
 
     @override
     async def async_turn_off(self, **kwargs: Mapping[str, object]) -> None:
         ctrl = self._coordinator.controller
-        func = partial(
-            ctrl.set_notification_light,
+        await ctrl.async_set_notification_light(
             self._device_id,
             int(self._channel_key),
             simple_rgb_color_state="BLACK",
             optical_signal_behaviour="OFF",
             dim_level=0.0,
         )
-        await self.hass.async_add_executor_job(func)
 
 
 class HCUDimmerLight(_BaseHCULight):
@@ -270,24 +244,20 @@ class HCUDimmerLight(_BaseHCULight):
                 else self._min_on_level()
             )
         ctrl = self._coordinator.controller
-        func = partial(
-            ctrl.set_dimmer_level,
+        await ctrl.async_set_dimmer_level(
             self._device_id,
             int(self._channel_key),
             dim_level=float(dim),
         )
-        await self.hass.async_add_executor_job(func)
 
     @override
     async def async_turn_off(self, **kwargs: Mapping[str, object]) -> None:
         ctrl = self._coordinator.controller
-        func = partial(
-            ctrl.set_switch_state,
+        await ctrl.async_set_switch_state(
             self._device_id,
             int(self._channel_key),
             on=False,
         )
-        await self.hass.async_add_executor_job(func)
 
 
 class HCUSwitchMeasuringLight(_BaseHCULight):
@@ -328,24 +298,20 @@ class HCUSwitchMeasuringLight(_BaseHCULight):
     @override
     async def async_turn_on(self, **kwargs: Mapping[str, object]) -> None:
         ctrl = self._coordinator.controller
-        func = partial(
-            ctrl.set_switch_state,
+        await ctrl.async_set_switch_state(
             self._device_id,
             int(self._channel_key),
             on=True,
         )
-        await self.hass.async_add_executor_job(func)
 
     @override
     async def async_turn_off(self, **kwargs: Mapping[str, object]) -> None:
         ctrl = self._coordinator.controller
-        func = partial(
-            ctrl.set_switch_state,
+        await ctrl.async_set_switch_state(
             self._device_id,
             int(self._channel_key),
             on=False,
         )
-        await self.hass.async_add_executor_job(func)
 
 
 class HCUUniversalLight(_BaseHCULight):
@@ -450,34 +416,28 @@ class HCUUniversalLight(_BaseHCULight):
         if isinstance(hs, (tuple, list)) and len(hs) >= 2:
             hue = int(hs[0])
             sat_pct = float(hs[1])
-            func = partial(
-                ctrl.set_hue_saturation_dim_level,
+            await ctrl.async_set_hue_saturation_dim_level(
                 self._device_id,
                 int(self._channel_key),
                 hue=hue,
                 saturation_level=sat_pct / 100,
                 dim_level=dim,
             )
-            await self.hass.async_add_executor_job(func)
         else:
-            func = partial(
-                ctrl.set_dimmer_level,
+            await ctrl.async_set_dimmer_level(
                 self._device_id,
                 int(self._channel_key),
                 dim_level=float(dim),
             )
-            await self.hass.async_add_executor_job(func)
 
     @override
     async def async_turn_off(self, **kwargs: Mapping[str, object]) -> None:
         ctrl = self._coordinator.controller
-        func = partial(
-            ctrl.set_dimmer_level,
+        await ctrl.async_set_dimmer_level(
             self._device_id,
             int(self._channel_key),
             dim_level=0.0,
         )
-        await self.hass.async_add_executor_job(func)
 
 
 async def async_setup_entry(
@@ -489,12 +449,23 @@ async def async_setup_entry(
 
     known: set[str] = set()
     all_entities: list[_BaseHCULight] = []
+    by_channel: dict[tuple[str, str], list[_BaseHCULight]] = {}
+
+    def _track(entities: list[_BaseHCULight]) -> None:
+        all_entities.extend(entities)
+        for ent in entities:
+            key = (ent.hcu_device_id, ent.hcu_channel_key)
+            by_channel.setdefault(key, []).append(ent)
 
-    def _discover() -> list[LightEntity]:
-        body = coordinator.data
-        devices = body["devices"]
+    def _discover(full: bool = False) -> list[LightEntity]:
         new_entities: list[LightEntity] = []
-        for dev in devices.values():
+        for dev in coordinator.discovery_devices(
+            "NOTIFICATION_LIGHT_CHANNEL",
+            "DIMMER_CHANNEL",
+            "UNIVERSAL_LIGHT_CHANNEL",
+            "SWITCH_MEASURING_CHANNEL",
+            full=full,
+        ):
             device_type = dev["type"]
             dev_id = dev["id"]
             label = dev["label"]
@@ -573,17 +544,18 @@ async def async_setup_entry(
 
         return new_entities
 
-    initial = _discover()
+    initial = _discover(full=True)
     if initial:
         async_add_entities(initial, True)
-        all_entities.extend(cast(list[_BaseHCULight], initial))
+        _track(cast(list[_BaseHCULight], initial))
 
     def _on_update() -> None:
         new = _discover()
         if new:
             async_add_entities(new)
-            all_entities.extend(cast(list[_BaseHCULight], new))
-        for ent in all_entities:
+            _track(cast(list[_BaseHCULight], new))
+        dirty = coordinator.dirty_channel_entities(by_channel, all_entities)
+        for ent in dirty:
             if getattr(ent, "hass", None) is None:
                 continue
             for attr in ("is_on", "brightness", "hs_color", "color_mode", "effect"):
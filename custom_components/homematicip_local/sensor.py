@@ -43,22 +43,22 @@ class _BaseDeviceSensor(SensorEntity):
         self._attr_name = name
         self._attr_unique_id = f"{DOMAIN}:{uid}"
 
+    @property
+    def hcu_device_id(self) -> str:
+        """Public accessor for the underlying device id."""
+        return self._device_id
+
+    @property
+    def hcu_channel_key(self) -> str:
+        """Public accessor for the functional channel key."""
+        return self._channel_key
+
     def _suggested_area_name(self) -> str | None:
-        """Return room name from META group, if present for this channel."""
-        body = self._coordinator.data
-        device = body["devices"][self._device_id]
-        channels = device["functionalChannels"]
-        ch = channels[self._channel_key]
-        groups_list = ch["groups"]
-        if not groups_list:
-            return None
-        groups_map = body["groups"]
-        for group_id in groups_list:
-            group = groups_map[group_id]
-            if group["type"] == "META":
-                label = group["label"]
-                return label.strip()
-        return None
+        """Room of this channel, else of its device, from the META groups."""
+        store = self._coordinator.controller.state_store
+        return store.room_of_channel(
+            self._device_id, self._channel_key, device_fallback=True
+        )
 
     @override
     async def async_added_to_hass(self) -> None:
@@ -304,13 +304,17 @@ async def async_setup_entry(
 
     known: set[str] = set()
     all_entities: list[_BaseDeviceSensor] = []
+    by_channel: dict[tuple[str, str], list[_BaseDeviceSensor]] = {}
 
-    def _discover() -> list[SensorEntity]:
-        body = coordinator.data
-        devices = body["devices"]
+    def _track(entities: list[_BaseDeviceSensor]) -> None:
+        all_entities.extend(entities)
+        for ent in entities:
+            key = (ent.hcu_device_id, ent.hcu_channel_key)
+            by_channel.setdefault(key, []).append(ent)
 
+    def _discover(full: bool = False) -> list[SensorEntity]:
         new_entities: list[SensorEntity] = []
-        for dev in devices.values():
+        for dev in coordinator.discovery_devices(full=full):
             dev_type = dev["type"]
             dev_id = dev["id"]
             label = dev["label"]
@@ -504,18 +508,19 @@ async def async_setup_entry(
 
         return new_entities
 
-    initial = _discover()
+    initial = _discover(full=True)
     if initial:
         async_add_entities(initial, True)
-        all_entities.extend(cast(list[_BaseDeviceSensor], initial))
+        _track(cast(list[_BaseDeviceSensor], initial))
 
     def _on_update() -> None:
         new = _discover()
         if new:
             async_add_entities(new)
-            all_entities.extend(cast(list[_BaseDeviceSensor], new))
-        # Invalidate cached properties and push state update for existing entities
-        for ent in all_entities:
+            _track(cast(list[_BaseDeviceSensor], new))
+        dirty = coordinator.dirty_channel_entities(by_channel, all_entities)
+        # Invalidate cached properties and push state update for touched entities
+        for ent in dirty:
             if getattr(ent, "hass", None) is None:
                 continue
             try:
@@ -0,0 +1,116 @@
+import asyncio
+from collections.abc import Callable, Iterable
+import logging
+from typing import TypeAlias
+
+from .state import StateChanges, StateStore, has_changes
+from .types.hmip_system import Event, SystemState
+
+# A merge operation, run by the actor with exclusive access to the store
+MergeOp: TypeAlias = Callable[[StateStore], StateChanges]
+_QueueItem: TypeAlias = tuple[MergeOp, asyncio.Future[StateChanges] | None]
+
+
+class StateActor:
+    """The single writer of a StateStore.
+
+    Every mutation (pushed events, full replacements) is queued as a merge
+    operation and applied in order by one task, so merges never interleave and
+    need no locks. Readers keep using the store's published snapshots.
+    Submitting must happen on the actor's event loop.
+    """
+
+    def __init__(
+        self,
+        store: StateStore,
+        on_changes: Callable[[StateChanges], None],
+        *,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.store: StateStore = store
+        self._on_changes: Callable[[StateChanges], None] = on_changes
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self._queue: asyncio.Queue[_QueueItem] = asyncio.Queue()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Start consuming on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(
+            self._run(), name="hcu-state-actor"
+        )
+
+    async def stop(self) -> None:
+        """Stop consuming; queued operations are dropped."""
+        task = self._task
+        self._task = None
+        if task is not None:
+            _ = task.cancel()
+            _ = await asyncio.gather(task, return_exceptions=True)
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if future is not None and not future.done():
+                future.set_exception(ConnectionError("State actor stopped"))
+
+    def submit(
+        self, op: MergeOp, *, wait: bool = False
+    ) -> asyncio.Future[StateChanges] | None:
+        """Queue op.
+
+        Without wait, its changes are published through on_changes. With
+        wait=True they are returned through the future instead and publishing
+        is left to the caller.
+        """
+        future: asyncio.Future[StateChanges] | None = None
+        if wait:
+            future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((op, future))
+        return future
+
+    def submit_events(
+        self, events: Iterable[Event], timestamp: int | None = None
+    ) -> None:
+        """Queue pushed events of a transaction for merging (fire and forget)."""
+        batch = list(events)
+        _ = self.submit(lambda store: store.apply_events(batch, timestamp))
+
+    def begin_fetch(self) -> None:
+        """Queue StateStore.begin_fetch, ahead of events pushed from now on."""
+        _ = self.submit(lambda store: store.begin_fetch())
+
+    def cancel_fetch(self) -> None:
+        _ = self.submit(lambda store: store.cancel_fetch())
+
+    async def replace(
+        self, state: SystemState, *, clock_reset: bool = False
+    ) -> StateChanges:
+        """Queue a full replacement and wait until it has been applied."""
+        future = self.submit(
+            lambda store: store.replace(state, clock_reset=clock_reset), wait=True
+        )
+        assert future is not None
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            op, future = await self._queue.get()
+            try:
+                changes = op(self.store)
+            except Exception as exc:
+                self.logger.exception("State merge operation failed")
+                if future is not None and not future.done():
+                    future.set_exception(exc)
+                continue
+            if future is not None:
+                if not future.done():
+                    future.set_result(changes)
+            elif has_changes(changes):
+                try:
+                    self._on_changes(changes)
+                except Exception:
+                    self.logger.exception("Publishing state changes failed")
@@ -0,0 +1,227 @@
+"""Schema drift registry.
+
+Validation issues repeat: a firmware that adds a field to every device
+reports the same problem once per device on every full fetch. The registry
+folds issues into one entry per (schema path, kind), where the schema path
+has concrete ids and list indexes replaced by ``[*]``, keeps a trimmed sample
+of the payload that first showed the issue and otherwise only counts.
+Recording an issue seen before is a couple of dict lookups.
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Literal, TypeAlias, TypedDict, cast
+
+DriftKind: TypeAlias = Literal[
+    "missing_key", "unexpected_key", "type", "literal", "union", "other"
+]
+
+# Unique (path, kind) entries kept; further new issues are only counted
+MAX_DRIFT_ENTRIES = 512
+# Parsed issue strings remembered before the parse cache starts over
+_MAX_PARSED_ISSUES = 8192
+# Samples: nesting depth and container items kept
+_SAMPLE_DEPTH = 3
+_SAMPLE_ITEMS = 25
+
+# "[<repr of a key>]" or "[<index>]" inside an issue path
+_INDEX_RE = re.compile(r"\[(?:'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|[^\]]*)\]")
+# Path segments after the root label: ".name" or "[<repr or index>]"
+_SEGMENT_RE = re.compile(
+    r"\.([^.\[]+)|\[('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|-?\d+)\]"
+)
+
+
+class DriftEntry(TypedDict):
+    path: str
+    kind: DriftKind
+    source: str
+    count: int
+    first_seen: float
+    last_seen: float
+    issue: str
+    sample: object
+
+
+# Schema path and kind identifying an entry
+_DriftKey: TypeAlias = tuple[str, DriftKind]
+# Parsed issue: key and path segments below the root label (None: not recorded)
+_ParsedIssue: TypeAlias = tuple[_DriftKey, tuple[str | int, ...]] | None
+
+
+def issue_kind(message: str) -> DriftKind:
+    """Classify the message part of an issue string."""
+    if message.endswith("missing key"):
+        return "missing_key"
+    if message.endswith("unexpected key"):
+        return "unexpected_key"
+    if "compatible with any" in message:
+        return "union"
+    if message.startswith("value ") and " not in " in message:
+        return "literal"
+    if message.startswith("expected "):
+        return "type"
+    return "other"
+
+
+def parse_issue(issue: str) -> _ParsedIssue:
+    """Split an issue string into its drift key and path segments."""
+    if issue[:1] in ("'", '"'):
+        # "path: unexpected key(s) [...]" summary; every key has its own issue
+        return None
+    path, sep, message = issue.partition(": ")
+    if not sep:
+        return (("", "other"), ())
+    start = min(
+        (i for i in (path.find("."), path.find("[")) if i > 0), default=len(path)
+    )
+    segments: list[str | int] = []
+    for match in _SEGMENT_RE.finditer(path, start):
+        name, index = match.groups()
+        if name is not None:
+            segments.append(name)
+        elif index[0] in ("'", '"'):
+            segments.append(index[1:-1])
+        else:
+            segments.append(int(index))
+    return ((_INDEX_RE.sub("[*]", path), issue_kind(message)), tuple(segments))
+
+
+def _trim(value: object, depth: int = _SAMPLE_DEPTH) -> object:
+    """A bounded copy of value, safe to keep and to dump as JSON."""
+    if isinstance(value, dict):
+        mapping = cast(dict[object, object], value)
+        if depth <= 0:
+            return f"<dict with {len(mapping)} keys>"
+        trimmed: dict[str, object] = {}
+        for i, (key, item) in enumerate(mapping.items()):
+            if i >= _SAMPLE_ITEMS:
+                trimmed["..."] = f"{len(mapping) - i} more"
+                break
+            trimmed[str(key)] = _trim(item, depth - 1)
+        return trimmed
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = list(cast(list[object], value))
+        if depth <= 0:
+            return f"<{type(value).__name__} with {len(items)} items>"
+        trimmed_items = [_trim(item, depth - 1) for item in items[:_SAMPLE_ITEMS]]
+        if len(items) > _SAMPLE_ITEMS:
+            trimmed_items.append(f"... {len(items) - _SAMPLE_ITEMS} more")
+        return trimmed_items
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+
+def _sample_of(
+    payload: object, kind: DriftKind, segments: tuple[str | int, ...]
+) -> object:
+    """The offending value, or the dict missing or adding a key, trimmed."""
+    if kind in ("missing_key", "unexpected_key"):
+        segments = segments[:-1]
+    node = payload
+    for segment in segments:
+        try:
+            node = cast(dict[object, object], node)[segment]
+        except (KeyError, IndexError, TypeError):
+            break
+    return _trim(node)
+
+
+class DriftRegistry:
+    """Counts validation issues by schema path and kind.
+
+    Thread-safe: issues arrive from the event loop (request validation) and
+    from the validation worker thread.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MAX_DRIFT_ENTRIES,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.max_entries: int = max_entries
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self._entries: dict[_DriftKey, DriftEntry] = {}
+        self._parsed: dict[str, _ParsedIssue] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self.recorded: int = 0
+        self.overflow: int = 0
+
+    def record(self, source: str, issues: list[str], payload: object) -> int:
+        """Record issues found validating payload; returns the new entries.
+
+        New (path, kind) entries are logged once, repeats are only counted.
+        """
+        if not issues:
+            return 0
+        now = time.time()
+        new: list[DriftEntry] = []
+        with self._lock:
+            parsed_cache = self._parsed
+            entries = self._entries
+            for issue in issues:
+                try:
+                    parsed = parsed_cache[issue]
+                except KeyError:
+                    if len(parsed_cache) >= _MAX_PARSED_ISSUES:
+                        parsed_cache.clear()
+                    parsed = parsed_cache[issue] = parse_issue(issue)
+                if parsed is None:
+                    continue
+                self.recorded += 1
+                key, segments = parsed
+                entry = entries.get(key)
+                if entry is not None:
+                    entry["count"] += 1
+                    entry["last_seen"] = now
+                    continue
+                if len(entries) >= self.max_entries:
+                    self.overflow += 1
+                    continue
+                entry = entries[key] = DriftEntry(
+                    path=key[0],
+                    kind=key[1],
+                    source=source,
+                    count=1,
+                    first_seen=now,
+                    last_seen=now,
+                    issue=issue,
+                    sample=_sample_of(payload, key[1], segments),
+                )
+                new.append(entry)
+        for entry in new:
+            self.logger.warning(
+                "Schema drift in %s: %s (%s), e.g. %s",
+                entry["source"],
+                entry["path"],
+                entry["kind"],
+                entry["issue"],
+            )
+        return len(new)
+
+    def entries(self) -> list[DriftEntry]:
+        """Entries, most frequent first (copies)."""
+        with self._lock:
+            entries = [DriftEntry(**entry) for entry in self._entries.values()]
+        entries.sort(key=lambda entry: entry["count"], reverse=True)
+        return entries
+
+    def as_dict(self) -> dict[str, object]:
+        """Summary for diagnostics."""
+        entries = self.entries()
+        return {
+            "unique": len(entries),
+            "recorded": self.recorded,
+            "overflow": self.overflow,
+            "entries": entries,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._parsed.clear()
+            self.recorded = 0
+            self.overflow = 0
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, TypeAlias, TypedDict
+import uuid
+
+# Requests on the wire at the same time, unless configured otherwise
+DEFAULT_MAX_IN_FLIGHT = 8
+# Seconds to wait for the HCU to answer a request once it has been sent
+DEFAULT_REQUEST_TIMEOUT = 10.0
+
+SendCallable: TypeAlias = Callable[
+    [str, str, dict[str, Any]],  # pyright: ignore[reportExplicitAny]
+    Awaitable[None],
+]
+
+
+class PendingEntry(TypedDict):
+    """Type for requests tracked by RequestMultiplexer.
+
+    Keys:
+    - id: message id the response will carry
+    - msg_type: request type (e.g. HMIP_SYSTEM_REQUEST)
+    - expected_type: the response type expected for the request
+    - body: request body, kept until the request is sent
+    - future: resolved with the response payload ({"success", "body"}) on arrival
+    - timer: timeout handle, armed once the request is on the wire
+    """
+
+    id: str
+    msg_type: str
+    expected_type: str
+    body: dict[str, Any]  # pyright: ignore[reportExplicitAny]
+    future: asyncio.Future[dict[str, Any]]  # pyright: ignore[reportExplicitAny]
+    timer: asyncio.TimerHandle | None
+
+
+PendingMap: TypeAlias = dict[str, PendingEntry]
+
+
+def to_response_type(request_type: str) -> str:
+    if request_type.endswith("_REQUEST"):
+        return request_type[:-8] + "_RESPONSE"
+    else:
+        raise ValueError(f"Unknown request type: {request_type}")
+
+
+class RequestMultiplexer:
+    """Pipeline requests over the single plugin websocket.
+
+    Every request gets an awaitable future keyed by its message id. Up to
+    max_in_flight requests are on the wire at once; further requests wait in
+    a FIFO backlog and are sent as soon as a response (or timeout) frees a
+    slot. Must be used from one event loop.
+    """
+
+    def __init__(
+        self,
+        send: SendCallable,
+        *,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self._send: SendCallable = send
+        self.max_in_flight: int = max_in_flight
+        self.timeout: float = timeout
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self._in_flight: PendingMap = {}
+        # Insertion ordered, so iteration order is FIFO and removal is O(1)
+        self._backlog: PendingMap = {}
+        self._send_tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    @property
+    def backlog(self) -> int:
+        return len(self._backlog)
+
+    def submit(
+        self,
+        msg_type: str,
+        body: dict[str, Any],  # pyright: ignore[reportExplicitAny]
+    ) -> asyncio.Future[dict[str, Any]]:  # pyright: ignore[reportExplicitAny]
+        """Queue a request and return the future for its response.
+
+        Cancelling the future withdraws the request (or frees its slot).
+        """
+        msg_id = str(uuid.uuid4())
+        future: asyncio.Future[dict[str, Any]] = (  # pyright: ignore[reportExplicitAny]
+            asyncio.get_running_loop().create_future()
+        )
+        entry: PendingEntry = {
+            "id": msg_id,
+            "msg_type": msg_type,
+            "expected_type": to_response_type(msg_type),
+            "body": body,
+            "future": future,
+            "timer": None,
+        }
+        future.add_done_callback(lambda _f: self._release(msg_id))
+        if len(self._in_flight) < self.max_in_flight and not self._backlog:
+            self._dispatch(entry)
+        else:
+            self._backlog[msg_id] = entry
+            self.logger.debug(
+                "Request %s with id %s queued (in flight=%d, backlog=%d)",
+                msg_type,
+                msg_id,
+                len(self._in_flight),
+                len(self._backlog),
+            )
+        return future
+
+    def resolve(
+        self,
+        msg_id: str,
+        body: dict[str, Any],  # pyright: ignore[reportExplicitAny]
+    ) -> bool:
+        """Complete the in-flight request msg_id; False if it is not pending."""
+        entry = self._in_flight.get(msg_id)
+        if entry is None:
+            return False
+        response = {"success": True, "body": body}
+        if "error" in body or entry["expected_type"] == "ERROR_RESPONSE":
+            response["success"] = False
+        if not entry["future"].done():
+            entry["future"].set_result(response)
+        return True
+
+    def fail_all(self, exc: Exception) -> None:
+        """Fail every in-flight and queued request, e.g. on connection loss."""
+        # Clear the backlog first so releasing in-flight slots doesn't send it
+        backlog = list(self._backlog.values())
+        self._backlog.clear()
+        for entry in [*self._in_flight.values(), *backlog]:
+            if not entry["future"].done():
+                entry["future"].set_exception(exc)
+
+    def _dispatch(self, entry: PendingEntry) -> None:
+        loop = asyncio.get_running_loop()
+        self._in_flight[entry["id"]] = entry
+        entry["timer"] = loop.call_later(self.timeout, self._expire, entry["id"])
+        # Tasks start in creation order, so frames go out in FIFO order
+        task = loop.create_task(self._async_send(entry))
+        self._send_tasks.add(task)
+        task.add_done_callback(self._send_tasks.discard)
+
+    async def _async_send(self, entry: PendingEntry) -> None:
+        body = entry["body"]
+        try:
+            await self._send(entry["id"], entry["msg_type"], body)
+        except Exception as exc:
+            if not entry["future"].done():
+                entry["future"].set_exception(exc)
+
+    def _expire(self, msg_id: str) -> None:
+        entry = self._in_flight.get(msg_id)
+        if entry is not None and not entry["future"].done():
+            entry["future"].set_exception(
+                TimeoutError(
+                    f"Timed out waiting for response to {entry['msg_type']} with id {msg_id}"
+                )
+            )
+
+    def _release(self, msg_id: str) -> None:
+        entry = self._in_flight.pop(msg_id, None)
+        if entry is None:
+            # Withdrawn while still queued
+            _ = self._backlog.pop(msg_id, None)
+            return
+        if entry["timer"] is not None:
+            entry["timer"].cancel()
+        while self._backlog and len(self._in_flight) < self.max_in_flight:
+            next_id = next(iter(self._backlog))
+            self._dispatch(self._backlog.pop(next_id))
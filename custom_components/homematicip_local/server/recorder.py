@@ -0,0 +1,185 @@
+"""Websocket traffic recorder.
+
+Received frames are appended, with their monotonic receive time, to a gzip
+compressed JSONL capture that rotates like logging's RotatingFileHandler
+(frames.jsonl.gz, frames.jsonl.gz.1, ...). Every file starts with a header
+line, every further line is one frame:
+
+    {"recorder": 1, "started": "<ISO wall clock>", "t": <monotonic>}
+    {"t": <monotonic seconds>, "frame": "<raw websocket text>"}
+
+read_capture yields the frames of all files oldest first; tools/replay_capture.py
+plays them back at their original pace.
+"""
+
+from collections.abc import Iterator
+import datetime
+import gzip
+import json
+import logging
+from pathlib import Path
+import queue
+import threading
+import time
+from typing import TypeAlias, TypedDict, cast
+
+CAPTURE_VERSION = 1
+DEFAULT_CAPTURE_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_CAPTURE_BACKUPS = 4
+DEFAULT_CAPTURE_QUEUE_SIZE = 4096
+
+# receive time, raw frame; None stops the writer
+_Job: TypeAlias = tuple[float, str] | None
+
+
+class CapturedFrame(TypedDict):
+    t: float
+    frame: str
+
+
+def capture_files(path: str | Path) -> list[Path]:
+    """Existing files of a capture, oldest first."""
+    base = Path(path)
+    backups: list[Path] = []
+    index = 1
+    while (backup := base.with_name(f"{base.name}.{index}")).exists():
+        backups.append(backup)
+        index += 1
+    files = list(reversed(backups))
+    if base.exists():
+        files.append(base)
+    return files
+
+
+def read_capture(path: str | Path) -> Iterator[CapturedFrame]:
+    """Frames of a capture in receive order.
+
+    A file cut short (the process died while recording) ends at its last
+    complete line.
+    """
+    for file in capture_files(path):
+        with gzip.open(file, "rt", encoding="utf-8") as fh:
+            try:
+                for line in fh:
+                    try:
+                        record = cast(dict[str, object], json.loads(line))
+                    except ValueError:
+                        break  # truncated last line
+                    if "frame" in record:
+                        yield cast(CapturedFrame, cast(object, record))
+            except EOFError:
+                pass
+
+
+class FrameRecorder:
+    """Writes received websocket frames to a rotating capture on a thread.
+
+    record() only takes a timestamp and queues the frame; compression and
+    file I/O happen on the writer thread. When the writer falls behind, frames
+    are dropped and counted rather than delaying the receive path.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_bytes: int = DEFAULT_CAPTURE_MAX_BYTES,
+        backup_count: int = DEFAULT_CAPTURE_BACKUPS,
+        maxsize: int = DEFAULT_CAPTURE_QUEUE_SIZE,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self.path: Path = Path(path)
+        self.max_bytes: int = max_bytes
+        self.backup_count: int = backup_count
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self._queue: queue.Queue[_Job] = queue.Queue(maxsize)
+        self._thread: threading.Thread | None = None
+        self.recorded: int = 0
+        self.dropped: int = 0
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="hcu-recorder", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the writer after it has written the frames already queued."""
+        thread = self._thread
+        self._thread = None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def record(self, frame: str) -> bool:
+        """Queue a received frame; False if not recording or dropped."""
+        if self._thread is None:
+            return False
+        try:
+            self._queue.put_nowait((time.monotonic(), frame))
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped & (self.dropped - 1) == 0:
+                log_fn = self.logger.warning if self.dropped == 1 else self.logger.debug
+                log_fn("Capture queue full, %d frame(s) not recorded", self.dropped)
+            return False
+        return True
+
+    def _open(self) -> gzip.GzipFile:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fh = gzip.GzipFile(self.path, "ab")
+        header = {
+            "recorder": CAPTURE_VERSION,
+            "started": datetime.datetime.now(datetime.UTC).isoformat(),
+            "t": time.monotonic(),
+        }
+        _ = fh.write(json.dumps(header).encode() + b"\n")
+        return fh
+
+    def _rotate(self, fh: gzip.GzipFile) -> gzip.GzipFile:
+        fh.close()
+        if self.backup_count > 0:
+            oldest = self.path.with_name(f"{self.path.name}.{self.backup_count}")
+            oldest.unlink(missing_ok=True)
+            for index in range(self.backup_count - 1, 0, -1):
+                src = self.path.with_name(f"{self.path.name}.{index}")
+                if src.exists():
+                    _ = src.replace(
+                        self.path.with_name(f"{self.path.name}.{index + 1}")
+                    )
+            _ = self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink(missing_ok=True)
+        return self._open()
+
+    def _run(self) -> None:
+        try:
+            fh = self._open()
+        except OSError:
+            self.logger.exception("Cannot open capture %s", self.path)
+            self._thread = None
+            return
+        try:
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    return
+                received, frame = job
+                line = json.dumps({"t": round(received, 6), "frame": frame})
+                _ = fh.write(line.encode() + b"\n")
+                self.recorded += 1
+                if self._queue.empty() or self.recorded % 1024 == 0:
+                    # Make what was written so far readable, check the size
+                    fh.flush()
+                    if fh.fileobj is not None and fh.fileobj.tell() >= self.max_bytes:
+                        fh = self._rotate(fh)
+        except OSError:
+            self.logger.exception("Writing capture %s failed", self.path)
+            self._thread = None
+        finally:
+            fh.close()
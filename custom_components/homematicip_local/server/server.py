@@ -1,21 +1,17 @@
-from collections.abc import Mapping
+import asyncio
+from collections.abc import Coroutine, Iterable, Mapping
+import enum
 import functools
-import inspect
 import json
 import logging
-import ssl
 import threading
 import time
-import types
 from typing import (
     Any,
     Callable,
     Literal,
     ParamSpec,
-    TypeAlias,
     TypeVar,
-    TypedDict,
-    Union,
     cast,
     get_args,
     get_origin,
@@ -25,10 +21,23 @@ from typing import (
 import uuid
 import warnings
 
+import aiohttp
 import requests
 from urllib3.exceptions import InsecureRequestWarning
-from websocket import WebSocket, WebSocketApp
 
+from .actor import StateActor
+from .multiplexer import DEFAULT_MAX_IN_FLIGHT, RequestMultiplexer
+from .singleflight import SingleFlight
+from .state import (
+    DEFAULT_COALESCE_MAX_LATENCY,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_IGNORED_FIELDS,
+    StateChanges,
+    StateStore,
+    empty_changes,
+    has_changes,
+    merge_changes,
+)
 from .types.hmip_system import Event
 from .types.hmip_system import SystemState
 from .types.hmip_system_requests import (
@@ -63,27 +72,20 @@ from .types.messages import (
     HmipSystemEventBody,
     PluginMessage,
 )
+from .drift import DriftRegistry
+from .recorder import FrameRecorder
+from .validation_worker import ValidationWorker
+from .validator import (
+    SystemStateValidator,
+    ValidationPolicy,
+    Validator,
+    compile_validator,
+    quick_match,
+)
 
 plugin_id = "com.homeassistant.custom"
 
 
-class PendingEntry(TypedDict):
-    """Type for entries stored in HCUController._pending.
-
-    Keys:
-    - expected_type: the response type expected for a given request id
-    - event: a threading.Event used to signal response arrival
-    - response: the response payload (or None until set)
-    """
-
-    expected_type: str
-    event: threading.Event
-    response: dict[str, Any] | None  # pyright: ignore[reportExplicitAny]
-
-
-PendingMap: TypeAlias = dict[str, PendingEntry]
-
-
 def make_request(ip: str, method: str, path: str, data: dict[str, Any]):  # pyright: ignore[reportExplicitAny]
     headers = {"VERSION": "12"}
     # Suppress only this self-signed HTTPS request warning
@@ -137,555 +139,28 @@ logging.basicConfig(level=logging.INFO)
 _TType = TypeVar("_TType")
 
 
-def _is_typed_dict(tp: object) -> bool:
-    if not isinstance(tp, type):  # not a class
-        return False
-    if not hasattr(tp, "__annotations__"):
-        return False
-    return hasattr(tp, "__total__") or hasattr(tp, "__required_keys__")
-
-
-def _validate_typed_dict(
-    name: str,
-    spec: type,
-    value: object,
-    issues: list[str],
-    *,
-    allow_extra: bool = False,
-    record_unexpected: bool = True,
-) -> None:
-    """Validate a TypedDict-like object.
-
-    allow_extra controls whether unexpected keys raise (False) or are just
-    collected as issues (True). Used with union probing to avoid premature
-    failure before picking the best variant.
-    """
-    if not isinstance(value, dict):
-        issues.append(
-            f"{name}: expected dict (TypedDict {spec.__name__}), got {type(value).__name__}"
-        )
-        return
-    annotations: dict[str, object] = getattr(spec, "__annotations__", {})  # type: ignore[reportExplicitAny]
-    for k, tp in annotations.items():
-        if k not in value:  # type: ignore[reportUnknownArgumentType]
-            # Suppress missing-key report when the field is Optional (i.e. Union[..., None])
-            is_optional = False
-            try:
-                if _is_union_type(tp):
-                    args = get_args(tp)
-                    # Optional if a NoneType member exists
-                    if any(a is type(None) for a in args):  # noqa: E721
-                        is_optional = True
-                elif tp is None or tp is type(None):  # direct None annotation
-                    is_optional = True
-            except Exception:  # pragma: no cover - defensive
-                pass
-            if not is_optional:
-                issues.append(f"{name}.{k}: missing key")
-            continue
-        # Use full runtime checker (handles unions & nested TypedDicts)
-        _runtime_type_check(tp, value[k], f"{name}.{k}", issues)
-    if record_unexpected:
-        extras = [str(k) for k in value.keys() if k not in annotations]
-        if extras:
-            for ex in extras:
-                issues.append(f"{name}.{ex}: unexpected key")
-            if not allow_extra:
-                raise KeyError(f"{name}: unexpected key(s) {extras}")
-
-
-def _is_union_type(tp: object) -> bool:
-    """Return True if tp is a typing / PEP 604 union construct."""
-    origin = get_origin(tp)
-    if origin is Union:
-        return True
-    return origin is types.UnionType
-
-
-_UNION_DISCRIMINATOR_KEYS: tuple[str, ...] = (
-    "type",
-    "pushEventType",
-    "functionalChannelType",
-    "channelRole",
-)
-
-
-def _literal_values(tp: object) -> set[object]:
-    if get_origin(tp) is Literal:
-        return set(get_args(tp))
-    return set()
-
-
-def _pick_typed_dict_union_variant(
-    variants: tuple[object, ...], value: object
-) -> object | None:
-    if not isinstance(value, dict):
-        return None
-    best: object | None = None
-    best_score = -10
-    for variant in variants:
-        if not _is_typed_dict(variant):
-            continue
-        ann = getattr(variant, "__annotations__", {})
-        score = 0
-        matched = False
-        for key in _UNION_DISCRIMINATOR_KEYS:
-            if key in value and key in ann:
-                tp = ann[key]
-                lits = _literal_values(tp)
-                # Literal discriminator = strongest signal
-                if lits:
-                    if value[key] in lits:
-                        score += 50
-                        matched = True
-                    else:
-                        # Hard mismatch -> invalidate this variant completely
-                        score = -100
-                        matched = False
-                        break
-                else:
-                    # Non-literal discriminator: soft signal if runtime value type matches annotation base
-                    base = _unwrap_optional(tp)
-                    try:
-                        if isinstance(base, type) and isinstance(value[key], base):
-                            score += 5
-                            matched = True
-                        else:
-                            score += 1  # weak hint due to key presence
-                    except TypeError:
-                        score += 1
-        if score < 0:
-            continue
-        required_keys = set(getattr(variant, "__annotations__", {}).keys())
-        present = required_keys.intersection(value.keys())
-        missing = required_keys - value.keys()
-        score += len(present) * 0.05
-        score -= len(missing) * 0.02
-        if matched and score > best_score:
-            best_score = score
-            best = variant
-    return best
-
-
-def _variant_literal_mismatch(variant: object, value: object) -> bool:
-    """Return True if any literal discriminator key on variant mismatches value.
-
-    Only considers keys in _UNION_DISCRIMINATOR_KEYS that are annotated as Literal[...] on the variant.
-    Missing discriminator key on value is treated as mismatch (can't positively identify variant).
-    """
-    if not isinstance(value, dict) or not _is_typed_dict(variant):
-        return True
-    ann = getattr(variant, "__annotations__", {})
-    for key in _UNION_DISCRIMINATOR_KEYS:
-        if key not in ann:
-            continue
-        tp = ann[key]
-        if get_origin(tp) is Literal:
-            lits = set(get_args(tp))
-            if key not in value:
-                return True
-            if value[key] not in lits:
-                return True
-    return False
-
-
-def _validate_value(path: str, tp: object, value: object, issues: list[str]) -> None:
-    origin = get_origin(tp)
-    if origin is None:
-        # Simple type or TypedDict
-        if _is_typed_dict(tp):
-            _validate_typed_dict(path, tp, value, issues)
-        else:
-            try:
-                if (tp is None and (value is not None)) or (not isinstance(value, tp)):  # type: ignore[arg-type]
-                    issues.append(
-                        f"{path}: expected {getattr(tp, '__name__', tp)}, got {type(value).__name__}"
-                    )
-            except TypeError:
-                # TypedDict or non-instantiable target; treat as non-fatal
-                pass
-    elif origin is dict:
-        if not isinstance(value, dict):
-            issues.append(f"{path}: expected dict, got {type(value).__name__}")
-    elif origin is list:
-        if not isinstance(value, list):
-            issues.append(f"{path}: expected list, got {type(value).__name__}")
-        else:
-            (elem_type,) = get_args(tp) or (Any,)
-            for i, elem in enumerate(value):
-                _validate_value(f"{path}[{i}]", elem_type, elem, issues)
-    elif origin is tuple:
-        args = get_args(tp)
-        if not isinstance(value, tuple):
-            issues.append(f"{path}: expected tuple, got {type(value).__name__}")
-        else:
-            for i, (elem, elem_type) in enumerate(zip(value, args)):
-                _validate_value(f"{path}[{i}]", elem_type, elem, issues)
-    elif origin is set:
-        if not isinstance(value, set):
-            issues.append(f"{path}: expected set, got {type(value).__name__}")
-    elif origin is types.UnionType or _is_union_type(tp):  # union (typing | PEP604)
-        variants = get_args(tp)
-        matched = False
-        for v in variants:
-            # TypedDict variant: match if value is a dict
-            if _is_typed_dict(v):
-                if isinstance(value, dict):
-                    matched = True
-                    break
-                continue
-            # Simple class type
-            if isinstance(v, type):
-                if isinstance(value, v):
-                    matched = True
-                    break
-                continue
-            # Fallback: accept (cannot precisely check at runtime)
-            matched = True
-            break
-        if not matched:
-            issues.append(
-                f"{path}: value {value!r} not compatible with union variants (count={len(variants)})"
-            )
+# getSystemState of a large installation is far beyond aiohttp's 4 MiB default
+MAX_WS_MESSAGE_SIZE = 64 * 1024 * 1024
 
 
 P = ParamSpec("P")
 R = TypeVar("R")
 
 
-def _unwrap_optional(tp: Any) -> Any:  # pyright: ignore[reportExplicitAny, reportAny]
-    """Return the inner type for Optional / PEP 604 union with None.
-
-    Supports both typing.Optional[T] / Union[T, None] and PEP 604 syntax (T | None).
-    If multiple non-None members remain (e.g. int | str | None) we keep the
-    original union because it isn't a simple Optional.
-    """
-    try:
-        if _is_union_type(tp):
-            args = get_args(tp)
-            non_none = tuple(a for a in args if a is not type(None))  # noqa: E721
-            if len(non_none) == 1:
-                return non_none[0]
-    except Exception:  # pragma: no cover - defensive
-        pass
-    return tp
+# Drift of objects without a drift_registry of their own
+_default_drift_registry = DriftRegistry(logger=logging.getLogger("type_checker"))
 
 
-def _is_any(tp: Any) -> bool:  # pyright: ignore[reportExplicitAny, reportAny]
-    try:
-        return tp is Any or getattr(tp, "__origin__", None) is Any
-    except Exception:  # pragma: no cover - defensive
-        return False
-
-
-def _validate_literal(tp: Any, value: Any) -> bool:  # pyright: ignore[reportExplicitAny, reportAny]
-    if get_origin(tp) is Literal:
-        # if value not in get_args(tp):
-        #    print(
-        #        "value",
-        #        value,
-        #        "get_origin",
-        #        get_origin(tp),
-        #        "get_args",
-        #        get_args(tp),
-        #        "tp",
-        #        tp,
-        #    )
-        return value in get_args(tp)
-    return True
-
-
-def _validate_generic(
-    origin: Any,  # pyright: ignore[reportExplicitAny, reportAny]
-    args: tuple[Any, ...],  # pyright: ignore[reportExplicitAny]
-    value: Any,  # pyright: ignore[reportExplicitAny, reportAny]
-    path: str,
+def _format_issues(
+    label: str,
     issues: list[str],
-    depth: int,
+    duration: float,
+    registry: DriftRegistry | None = None,
+    payload: object = None,
 ) -> None:
-    if origin in (list, tuple, set):
-        if not isinstance(value, origin):
-            issues.append(
-                f"{path}: expected {origin.__name__}, got {type(value).__name__}"
-            )
-            return
-        elem_types: tuple[Any, ...]
-        if not args:
-            return
-        if origin is tuple and len(args) != 2 and args and args[-1] is Ellipsis:
-            # Homogenous tuple like Tuple[T, ...]
-            elem_types = (args[0],)
-        else:
-            elem_types = args
-        for i, elem in enumerate(value):  # pyright: ignore[reportUnknownVariableType]
-            check_tp = elem_types[min(i, len(elem_types) - 1)]
-            _runtime_type_check(check_tp, elem, f"{path}[{i}]", issues, depth + 1)
-    elif origin is dict:
-        if not isinstance(value, dict):
-            issues.append(f"{path}: expected dict, got {type(value).__name__}")
-            return
-        if len(args) == 2:
-            kt, vt = args
-            for i, (k, v) in enumerate(value.items()):  # pyright: ignore[reportUnknownVariableType]
-                if i >= 50:  # limit to avoid huge cost
-                    break
-                _runtime_type_check(kt, k, f"{path}.<key>", issues, depth + 1)
-                _runtime_type_check(vt, v, f"{path}[{repr(k)}]", issues, depth + 1)
-    else:
-        # Fallback: basic instance check
-        if not isinstance(value, origin):
-            issues.append(
-                f"{path}: expected {getattr(origin, '__name__', origin)}, got {type(value).__name__}"
-            )
-
-
-def _runtime_type_check(
-    tp: Any,
-    value: Any,
-    path: str,
-    issues: list[str],
-    depth: int = 0,
-    max_depth: int = 6,
-) -> None:
-    if depth > max_depth:
-        return
-    if _is_any(tp):  # Any accepts everything
-        return
-    if tp is object:
-        return
-    # Fast-path: accept None when annotation explicitly allows it (before Optional unwrapping).
-    # Without this guard, we unwrap Optional[T] to T and then incorrectly flag None values.
-    if value is None:
-        try:
-            if tp is None or tp is type(None):  # direct None annotation
-                return
-            if _is_union_type(tp):
-                args = get_args(tp)
-                # If any variant is exactly NoneType we accept None immediately
-                if any(a is type(None) for a in args):  # noqa: E721
-                    return
-        except Exception:  # pragma: no cover - defensive
-            pass
-    # Handle optionals
-    base = _unwrap_optional(tp)
-    origin = get_origin(base)
-    # Early guard: if 'base' is not a type / TypedDict / union / literal container we skip.
-    if not (
-        isinstance(base, type)
-        or _is_typed_dict(base)
-        or _is_union_type(base)
-        or origin is not None
-        or base is None
-    ):
-        # Prevent messages like 'expected UnionType, got dict' when a runtime value
-        # (e.g. already a dict) was accidentally passed as the spec.
-        return
-    if origin is Literal:
-        if not _validate_literal(tp, value):
-            issues.append(f"{path}: value {value!r} not in {get_args(base)!r}")
-        return
-    if _is_typed_dict(base):
-        try:
-            _validate_typed_dict(path, base, value, issues)
-        except KeyError as ke:
-            issues.append(str(ke))
-        return
-    if _is_union_type(base):  # handle Union / PEP604
-        union_args = get_args(base)
-        # Fast discriminant-based selection for TypedDict unions
-        chosen = _pick_typed_dict_union_variant(union_args, value)
-        if chosen is not None:
-            _runtime_type_check(chosen, value, path, issues, depth + 1, max_depth)
-            return
-        # Fallback: sequential attempt until one yields no new issues
-        best_variant: object | None = None
-        best_variant_missing = 10**9
-        # Track whether any variant matched strictly (zero issues) for early exit
-        for variant in union_args:  # type: ignore[reportExplicitAny]
-            # Skip early if literal discriminator mismatch
-            if _is_typed_dict(variant) and isinstance(value, dict):  # type: ignore[reportExplicitAny]
-                try:
-                    if _variant_literal_mismatch(variant, value):
-                        continue
-                except Exception:
-                    # defensive: skip on unexpected errors
-                    continue
-            trial_issues: list[str] = []
-            if _is_typed_dict(variant) and isinstance(value, dict):  # type: ignore[reportExplicitAny]
-                # Probe with allow_extra to focus on missing keys first
-                try:
-                    _validate_typed_dict(
-                        path,
-                        variant,
-                        value,
-                        trial_issues,
-                        allow_extra=True,
-                        record_unexpected=False,
-                    )  # type: ignore[reportExplicitAny]
-                except KeyError:
-                    # Should not raise with allow_extra=True, but ignore if it does
-                    pass
-                missing_count = sum(
-                    1 for m in trial_issues if m.endswith("missing key")
-                )
-                if missing_count < best_variant_missing:
-                    best_variant_missing = missing_count
-                    best_variant = variant
-                if missing_count == 0:
-                    # Re-run strictly to record any unexpected keys / nested issues
-                    strict_issues: list[str] = []
-                    try:
-                        _validate_typed_dict(
-                            path,
-                            variant,
-                            value,
-                            strict_issues,
-                            allow_extra=False,
-                            record_unexpected=True,
-                        )  # type: ignore[reportExplicitAny]
-                    except KeyError as ke:
-                        strict_issues.append(str(ke))
-                    issues.extend(strict_issues)
-                    return
-            else:
-                _runtime_type_check(
-                    variant, value, path, trial_issues, depth + 1, max_depth
-                )  # type: ignore[reportExplicitAny]
-                if not trial_issues:
-                    return
-
-        # No variant matched perfectly. Produce detailed diagnostics explaining why.
-        def _variant_name(v: object) -> str:
-            return getattr(v, "__name__", repr(v))
-
-        if isinstance(value, dict):
-            diagnostics: list[str] = []
-            MAX_VARIANTS = 12
-            shown = 0
-            for variant in union_args:  # type: ignore[reportExplicitAny]
-                if shown >= MAX_VARIANTS:
-                    diagnostics.append(
-                        f"... ({len(union_args) - shown} more variants omitted)"
-                    )
-                    break
-                if not _is_typed_dict(variant):  # type: ignore[reportExplicitAny]
-                    continue
-                shown += 1
-                v_issues: list[str] = []
-                try:
-                    _validate_typed_dict(
-                        path,
-                        variant,
-                        value,
-                        v_issues,
-                        allow_extra=False,
-                        record_unexpected=True,
-                    )  # type: ignore[reportExplicitAny]
-                except KeyError as ke:
-                    v_issues.append(str(ke))
-                missing: list[str] = []
-                unexpected: list[str] = []
-                nested: list[str] = []
-                for msg in v_issues:
-                    if msg.endswith("missing key"):
-                        comp = msg.split(":", 1)[0].removeprefix(f"{path}.")
-                        missing.append(comp)
-                    elif msg.endswith("unexpected key"):
-                        comp = msg.split(":", 1)[0].removeprefix(f"{path}.")
-                        unexpected.append(comp)
-                    else:
-                        nested.append(msg)
-                literal_mismatches: list[str] = []
-                ann = getattr(variant, "__annotations__", {})  # type: ignore[reportExplicitAny]
-                for k in _UNION_DISCRIMINATOR_KEYS:
-                    if k in ann and get_origin(ann[k]) is Literal:  # type: ignore[reportExplicitAny]
-                        allowed = set(get_args(ann[k]))
-                        if k not in value:
-                            literal_mismatches.append(
-                                f"{k}=<missing> expected one of {sorted(allowed)!r}"
-                            )
-                        elif value[k] not in allowed:
-                            literal_mismatches.append(
-                                f"{k}={value[k]!r} not in {sorted(allowed)!r}"
-                            )
-                parts: list[str] = []
-                if missing:
-                    parts.append(f"missing={missing}")
-                if unexpected:
-                    parts.append(f"unexpected={unexpected}")
-                if literal_mismatches:
-                    parts.append(f"literal={literal_mismatches}")
-                if nested and len(nested) < 4:
-                    parts.append(f"nested={nested}")
-                elif nested:
-                    parts.append(f"nestedIssues={len(nested)}")
-                if not parts:
-                    parts.append("(no direct key issues – likely nested mismatch)")
-                diagnostics.append(f"{_variant_name(variant)} -> " + ", ".join(parts))  # type: ignore[reportExplicitAny]
-            if best_variant is not None:
-                best_name = _variant_name(best_variant)
-                diagnostics.sort(
-                    key=lambda d: 0 if d.startswith(best_name + " ->") else 1
-                )
-            issues.append(
-                f"{path}: dict not compatible with any of {len(union_args)} union variants. Details: "
-                + " | ".join(diagnostics)
-            )
-            return
-        else:
-            issues.append(
-                f"{path}: value {type(value).__name__} not compatible with any union variant ({len(union_args)})"
-            )
-        return
-    if origin is not None:
-        _validate_generic(origin, get_args(base), value, path, issues, depth)
-        return
-    # Primitive / class check
-    if base is None:
-        if value is not None:
-            issues.append(f"{path}: expected None, got {type(value).__name__}")
-        return
-    if not isinstance(value, base):
-        # Improve union residual case readability (should rarely happen)
-        if _is_union_type(base):
-            issues.append(f"{path}: value {value!r} not in union {get_args(base)!r}")
-        else:
-            issues.append(
-                f"{path}: expected {getattr(base, '__name__', base)}, got {type(value).__name__}"
-            )
-
-
-def _quick_match(tp: Any, value: Any) -> bool:  # pyright: ignore[reportExplicitAny, reportAny]
-    """Fast, shallow compatibility check used during Union / overload filtering."""
-    try:
-        if _is_any(tp) or tp is object:
-            return True
-        base = _unwrap_optional(tp)
-        origin = get_origin(base)
-        if origin is Literal:
-            return value in get_args(base)
-        if _is_typed_dict(base):
-            return isinstance(value, dict)
-        if _is_union_type(base):
-            return any(_quick_match(a, value) for a in get_args(base))
-        if origin in (list, tuple, set):
-            return isinstance(value, origin)
-        if origin is dict:
-            return isinstance(value, dict)
-        if base is None:
-            return value is None
-        try:
-            return isinstance(value, base)
-        except TypeError:
-            return False
-    except Exception:
-        return True  # Be permissive on unexpected forms
-
-
-def _format_issues(label: str, issues: list[str], duration: float) -> None:
-    for msg in issues:
-        warnings.warn(f"{label}: {msg}")
     if issues:
+        # Logged once per schema path and kind, repeats are only counted
+        _ = (registry or _default_drift_registry).record(label, issues, payload)
         logging.getLogger("type_checker").debug(
             "%s: %d issue(s) validated in %.4fs", label, len(issues), duration
         )
@@ -698,13 +173,22 @@ def type_checker(func: Callable[P, R]) -> Callable[P, R]:
     """Universal runtime type checker decorator with overload support.
 
     Features:
-    - Resolves which overload (if any) matches the provided runtime arguments.
+    - Resolves which overload (if any) matches the provided runtime arguments;
+      overloads keyed by a Literal[<enum member>] parameter through a
+      precomputed table, others by binding and shallow-matching each one.
     - Validates annotated argument types (except *args/**kwargs contents) for the
       selected overload (or the implementation as a fallback).
     - Validates the return type (including nested containers & TypedDicts).
     - Gracefully degrades on unsupported / complex typing constructs (skips).
     - Bounded recursion depth to avoid excessive cost.
     - Designed to work on bound methods (ignores 'self' / 'cls').
+    - Supports coroutine functions (the awaited result is validated).
+    - On methods of objects with a ``validation_policy`` (ValidationPolicy),
+      arguments and return values are only validated when the policy says so.
+      A ``return_validators`` mapping on the object replaces the compiled
+      validator for the return annotations it contains.
+    - Issues are folded into the object's ``drift_registry`` (DriftRegistry)
+      or a module-wide one, so repeated drift is counted instead of logged.
     """
     import inspect
     from typing import get_overloads
@@ -737,11 +221,85 @@ def type_checker(func: Callable[P, R]) -> Callable[P, R]:
     except Exception:  # pragma: no cover
         pass
 
+    # Overloads told apart by one parameter annotated as Literal[<enum member>]
+    # (hmip_path for _send_hmip_system_request) are dispatched through a table
+    # keyed by that member: hints plus compiled validators of the other
+    # annotated parameters.
+    param_names: list[str] = []
+    dispatch_param: str | None = None
+    dispatch_index = -1
+    dispatch_table: dict[object, tuple[dict[str, Any], tuple[tuple[str, Validator], ...]]] = {}  # pyright: ignore[reportExplicitAny]
+    if impl_sig is not None and overload_meta and all(
+        p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY)
+        for p in impl_sig.parameters.values()
+    ):
+        param_names = [
+            p.name for p in impl_sig.parameters.values() if p.kind != p.KEYWORD_ONLY
+        ]
+
+        def _enum_literals(ann: object) -> tuple[object, ...]:
+            if get_origin(ann) is not Literal:
+                return ()
+            members = get_args(ann)
+            if all(isinstance(m, enum.Enum) for m in members):
+                return members
+            return ()
+
+        candidates = [
+            name
+            for name, ann in overload_meta[0][1].items()
+            if name in param_names and _enum_literals(ann)
+        ]
+        for name in candidates:
+            if all(_enum_literals(hints.get(name)) for _, hints in overload_meta):
+                dispatch_param = name
+                dispatch_index = param_names.index(name)
+                break
+        if dispatch_param is not None:
+            owners: dict[object, list[dict[str, Any]]] = {}  # pyright: ignore[reportExplicitAny]
+            for _, hints in overload_meta:
+                for member in _enum_literals(hints[dispatch_param]):
+                    owners.setdefault(member, []).append(hints)
+            for member, found in owners.items():
+                if len(found) != 1:
+                    continue  # ambiguous: resolved by the scan below
+                hints = found[0]
+                validators = tuple(
+                    (name, compile_validator(ann))
+                    for name, ann in hints.items()
+                    if name not in ("return", "self", "cls", dispatch_param)
+                )
+                dispatch_table[member] = (hints, validators)
+
+    def _dispatch(
+        call_args: tuple[Any, ...], call_kwargs: dict[str, Any]  # pyright: ignore[reportExplicitAny]
+    ) -> tuple[dict[str, Any], dict[str, Any], tuple[tuple[str, Validator], ...]] | None:  # pyright: ignore[reportExplicitAny]
+        if dispatch_param is None:
+            return None
+        if dispatch_param in call_kwargs:
+            key = call_kwargs[dispatch_param]
+        elif dispatch_index < len(call_args):
+            key = call_args[dispatch_index]
+        else:
+            return None
+        try:
+            entry = dispatch_table.get(key)
+        except TypeError:  # unhashable argument
+            return None
+        if entry is None or len(call_args) > len(param_names):
+            return None
+        bound = dict(zip(param_names, call_args))
+        bound.update(call_kwargs)
+        return entry[0], bound, entry[1]
+
     def _select_overload(
         call_args: tuple[Any, ...], call_kwargs: dict[str, Any]
     ) -> tuple[dict[str, Any], dict[str, Any]]:  # pyright: ignore[reportExplicitAny]
         if not overload_meta or impl_sig is None:
             return impl_hints, {}
+        dispatched = _dispatch(call_args, call_kwargs)
+        if dispatched is not None:
+            return dispatched[0], dispatched[1]
         matches: list[tuple[int, dict[str, Any], dict[str, Any]]] = []
         for idx, (sig, hints) in enumerate(overload_meta):
             try:
@@ -756,7 +314,7 @@ def type_checker(func: Callable[P, R]) -> Callable[P, R]:
                 ann = hints.get(name)
                 if ann is None:
                     continue
-                if not _quick_match(ann, val):
+                if not quick_match(ann, val):
                     param_issues.append(name)
                     break
             if not param_issues:
@@ -767,176 +325,260 @@ def type_checker(func: Callable[P, R]) -> Callable[P, R]:
         _idx, hints, bargs = matches[0]
         return hints, bargs
 
-    @functools.wraps(func)
-    def wrapper(*call_args: P.args, **call_kwargs: P.kwargs) -> R:
-        if not TYPE_CHECKING_ENABLED:
-            return func(*call_args, **call_kwargs)
-        selected_hints, bound_args = _select_overload(call_args, call_kwargs)
-        # Validate arguments
+    def _check_arguments(
+        call_args: tuple[Any, ...], call_kwargs: dict[str, Any]
+    ) -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
         arg_issues: list[str] = []
         start = time.perf_counter()
-        for name, ann in selected_hints.items():
-            if name == "return":
-                continue
-            if name in ("self", "cls"):
-                continue
-            if name in bound_args:
-                _runtime_type_check(
-                    ann, bound_args[name], f"param '{name}'", arg_issues
-                )
+        dispatched = _dispatch(call_args, call_kwargs)
+        if dispatched is not None:
+            selected_hints, bound_args, validators = dispatched
+            for name, validator in validators:
+                if name in bound_args:
+                    validator(bound_args[name], f"param '{name}'", arg_issues)
+        else:
+            selected_hints, bound_args = _select_overload(call_args, call_kwargs)
+            for name, ann in selected_hints.items():
+                if name == "return":
+                    continue
+                if name in ("self", "cls"):
+                    continue
+                if name in bound_args:
+                    compile_validator(ann)(bound_args[name], f"param '{name}'", arg_issues)
         arg_duration = time.perf_counter() - start
-        _format_issues(f"{func.__name__} arguments", arg_issues, arg_duration)
-        result = func(*call_args, **call_kwargs)
-        # Validate return
+        _format_issues(
+            f"{func.__name__} arguments",
+            arg_issues,
+            arg_duration,
+            _registry_of(call_args),
+        )
+        return selected_hints
+
+    def _check_return(
+        selected_hints: dict[str, Any],  # pyright: ignore[reportExplicitAny]
+        result: object,
+        return_validators: Mapping[object, Validator] | None = None,
+        registry: DriftRegistry | None = None,
+    ) -> None:
         if "return" in selected_hints and result is not None:
             ret_ann = selected_hints["return"]
+            validator = (return_validators or {}).get(ret_ann)
+            if validator is None:
+                validator = compile_validator(ret_ann)
             ret_issues: list[str] = []
             rstart = time.perf_counter()
-            _runtime_type_check(ret_ann, result, "return", ret_issues)
+            validator(result, "return", ret_issues)
             rdur = time.perf_counter() - rstart
-            if ret_issues:
-                print(result)
-            _format_issues(f"{func.__name__} return", ret_issues, rdur)
-        return result
+            _format_issues(f"{func.__name__} return", ret_issues, rdur, registry, result)
 
     logger.debug(
         "type_checker applied to %s with %d overload(s)",
         getattr(func, "__qualname__", func),
         len(overload_meta),
     )
-    return wrapper
-
-
-def validate_annotated(
-    value: object,
-    name: str | None = None,
-    *,
-    raise_on_error: bool = False,
-    max_depth: int = 6,
-) -> list[str]:
-    """Validate a variable against its annotated type in the caller's function.
 
-    Usage inside a function or method with annotated parameters:
-        def f(data: MyTypedDict):
-            validate_annotated(data)   # picks 'data' automatically
+    arguments_label = f"{func.__qualname__} arguments"
+    return_label = f"{func.__qualname__} return"
 
-    You can also specify the parameter name explicitly:
-        validate_annotated(data, name='data')
+    def _policy_of(call_args: tuple[Any, ...]) -> ValidationPolicy | None:  # pyright: ignore[reportExplicitAny]
+        # Methods follow the validation policy of their instance, if it has one
+        if call_args:
+            policy = getattr(call_args[0], "validation_policy", None)
+            if isinstance(policy, ValidationPolicy):
+                return policy
+        return None
 
-    Returns a list of issue strings. If raise_on_error=True, raises TypeError
-    if any issues are found. Best-effort: if the function or annotation can't
-    be resolved, it returns an empty list silently.
-    """
-    try:
-        frame = inspect.currentframe()
-        if frame is None or frame.f_back is None:  # pragma: no cover - defensive
-            return []
-        caller = frame.f_back
-        code = caller.f_code
-        locs = caller.f_locals
-        globs = caller.f_globals
-
-        # Attempt to locate the callable object for better get_type_hints handling
-        func_obj: object | None = None
-
-        # Method: search on self / cls first
-        self_obj = locs.get("self") or locs.get("cls")
-        if self_obj is not None:
-            for attr_name in dir(self_obj):
-                try:
-                    attr = getattr(self_obj, attr_name)
-                except Exception:  # pragma: no cover
-                    continue
-                if callable(attr) and getattr(attr, "__code__", None) is code:
-                    func_obj = attr
-                    break
-        # Fallback: scan globals
-        if func_obj is None:
-            for gval in globs.values():
-                if callable(gval) and getattr(gval, "__code__", None) is code:
-                    func_obj = gval
-                    break
-        if func_obj is None:
-            return []  # Can't resolve function
+    def _registry_of(call_args: tuple[Any, ...]) -> DriftRegistry | None:  # pyright: ignore[reportExplicitAny]
+        if call_args:
+            registry = getattr(call_args[0], "drift_registry", None)
+            if isinstance(registry, DriftRegistry):
+                return registry
+        return None
 
+    def _before_call(
+        call_args: tuple[Any, ...], call_kwargs: dict[str, Any]  # pyright: ignore[reportExplicitAny]
+    ) -> tuple[ValidationPolicy | None, dict[str, Any] | None]:  # pyright: ignore[reportExplicitAny]
+        policy = _policy_of(call_args)
         try:
-            hints = get_type_hints(func_obj)  # type: ignore[arg-type]
+            if policy is not None and not policy.should_validate(
+                arguments_label, (call_args[1:], call_kwargs)
+            ):
+                return policy, None
+            return policy, _check_arguments(call_args, call_kwargs)
         except Exception:
-            return []
-
-        # Infer parameter name if not explicitly provided
-        target_name: str | None = name
-        if target_name is None:
-            for var_name, var_val in locs.items():
-                if id(var_val) == id(value) and var_name in hints:
-                    target_name = var_name
-                    break
-        if target_name is None:
-            return []  # No matching annotated name
-
-        expected = hints.get(target_name)
-        if expected is None:
-            return []
-        issues: list[str] = []
-        _runtime_type_check(expected, value, target_name, issues, 0, max_depth)
-        if issues:
-            for msg in issues:
-                warnings.warn(f"validate_annotated: {msg}")
-            if raise_on_error:
-                raise TypeError(
-                    f"{target_name} failed runtime validation with {len(issues)} issue(s): {issues[:3]}..."
-                )
-        return issues
-    finally:
+            # Validation must never break the call it observes
+            logger.exception("Validating %s failed", arguments_label)
+            return policy, None
+
+    def _after_call(
+        call_args: tuple[Any, ...],  # pyright: ignore[reportExplicitAny]
+        call_kwargs: dict[str, Any],  # pyright: ignore[reportExplicitAny]
+        policy: ValidationPolicy | None,
+        selected_hints: dict[str, Any] | None,  # pyright: ignore[reportExplicitAny]
+        result: object,
+    ) -> None:
+        if result is None:
+            return
         try:
-            del frame  # pyright: ignore[reportPossiblyUnboundVariable]
+            if policy is not None and not policy.should_validate(return_label, result):
+                return
+            if selected_hints is None:
+                selected_hints, _ = _select_overload(call_args, call_kwargs)
+            # Instances can validate some return types their own way (incrementally)
+            return_validators = (
+                getattr(call_args[0], "return_validators", None) if call_args else None
+            )
+            _check_return(
+                selected_hints,
+                result,
+                return_validators if isinstance(return_validators, Mapping) else None,
+                _registry_of(call_args),
+            )
         except Exception:
-            pass
+            logger.exception("Validating %s failed", return_label)
+
+    if inspect.iscoroutinefunction(func):
+        # Coroutine functions: the return annotation describes the awaited
+        # value, so validation has to happen after awaiting.
+        @functools.wraps(func)
+        async def async_wrapper(*call_args: P.args, **call_kwargs: P.kwargs) -> Any:  # pyright: ignore[reportExplicitAny]
+            if not TYPE_CHECKING_ENABLED:
+                return await func(*call_args, **call_kwargs)  # pyright: ignore[reportGeneralTypeIssues]
+            policy, selected_hints = _before_call(call_args, call_kwargs)
+            result = await func(*call_args, **call_kwargs)  # pyright: ignore[reportGeneralTypeIssues]
+            _after_call(call_args, call_kwargs, policy, selected_hints, result)
+            return result
+
+        return cast(Callable[P, R], async_wrapper)
+
+    @functools.wraps(func)
+    def wrapper(*call_args: P.args, **call_kwargs: P.kwargs) -> R:
+        if not TYPE_CHECKING_ENABLED:
+            return func(*call_args, **call_kwargs)
+        policy, selected_hints = _before_call(call_args, call_kwargs)
+        result = func(*call_args, **call_kwargs)
+        _after_call(call_args, call_kwargs, policy, selected_hints, result)
+        return result
+
+    return wrapper
 
 
 class HCUController:
-    """Home Control Unit Controller"""
+    """Home Control Unit Controller
+
+    All websocket and request handling runs on one asyncio event loop (the
+    Home Assistant loop when used from the integration). Coroutine methods are
+    prefixed with ``async_``; the blocking methods (start, stop,
+    wait_until_ready, get_system_state, set_*) are thin wrappers that submit
+    to that loop and must not be called from it.
+    """
 
     plugin_id: str = "com.homeassistant.custom"
     logger: logging.Logger = logging.getLogger("HCUController")
-    # Cached system state body returned from getSystemState
-    _system_state: SystemState | None
-    _state_lock: threading.Lock
-    _listeners: list[Callable[[], None]]
+    _listeners: list[Callable[[SystemState, StateChanges], None]]
+    _connection_listeners: list[Callable[[bool], None]]
     first_connection: bool = True
 
-    def __init__(self, ip: str, activation_key: str, auth_token: str, client_id: str):
+    def __init__(
+        self,
+        ip: str,
+        activation_key: str,
+        auth_token: str,
+        client_id: str,
+        *,
+        session: aiohttp.ClientSession | None = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+        coalesce_max_latency: float = DEFAULT_COALESCE_MAX_LATENCY,
+        ignored_fields: Iterable[str] = DEFAULT_IGNORED_FIELDS,
+        validation_policy: ValidationPolicy | None = None,
+        recorder: FrameRecorder | None = None,
+    ):
         self.logger.setLevel(logging.INFO)
         self.ip: str = ip
         self.activation_key: str = activation_key
         self.auth_token: str = auth_token
         self.client_id: str = client_id
-        # Pending requests: id -> { expected_type: str, event: threading.Event, response: dict|None }
-        self._pending_lock: threading.Lock = threading.Lock()
-        self._pending: PendingMap = {}
-        websocket_headers = {
+        # Requests awaiting a response, matched by message id
+        self._requests: RequestMultiplexer = RequestMultiplexer(
+            self._send_plugin_message,
+            max_in_flight=max_in_flight,
+            logger=self.logger,
+        )
+        self._ws_headers: dict[str, str] = {
             "authtoken": auth_token,
             "plugin-id": self.plugin_id,
             "hmip-system-events": "true",
         }
-        self.ws: WebSocketApp = WebSocketApp(
-            f"wss://{self.ip}:9001", header=websocket_headers
+        self.url: str = f"wss://{self.ip}:9001"
+        # Which messages are checked against their TypedDict schema
+        self.validation_policy: ValidationPolicy = (
+            validation_policy or ValidationPolicy()
         )
-
-        self.ws.on_message = self._ws_message_handler
-        self.ws.on_error = self._ws_error_handler
-        self.ws.on_close = self._ws_close_handler
-        self.ws.on_open = self._ws_open_handler
+        # Opt-in capture of received frames (see server.recorder)
+        self.recorder: FrameRecorder | None = recorder
+        # Schema issues by path and kind, each logged the first time it shows up
+        self.drift_registry: DriftRegistry = DriftRegistry(logger=self.logger)
+        # Validates pushed events off the receive path
+        self._validation_worker: ValidationWorker = ValidationWorker(
+            self.validation_policy, logger=self.logger
+        )
+        # getSystemState responses are validated per device/group, with the
+        # results cached between fetches. Validation runs before the response
+        # replaces the store's state, which is therefore the previous one.
+        self._system_state_validator: SystemStateValidator = SystemStateValidator(
+            SystemState,
+            previous_state=lambda: self._store.state,
+            policy=self.validation_policy,
+        )
+        self.return_validators: dict[object, Validator] = {
+            HmIPSystemGetSystemStateResponseBody: self._system_state_validator.validate_response
+        }
+        # A session passed in (e.g. Home Assistant's shared one) is never closed here
+        self._session: aiohttp.ClientSession | None = session
+        self._owns_session: bool = session is None
+        self.ws: aiohttp.ClientWebSocketResponse | None = None
         # Runtime state
-        self._ws_thread: threading.Thread | None = None
-        self._ws_open_event: threading.Event = threading.Event()
-        self._system_state = None
-        self._state_lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: threading.Thread | None = None
+        self._ws_task: asyncio.Task[None] | None = None
+        self._background_tasks: set[asyncio.Task[None]] = set()
+        self._ws_open_event: asyncio.Event = asyncio.Event()
+        # Cached system state and its indexes, merged from push events. Only
+        # the actor writes to the store.
+        self._store: StateStore = StateStore(
+            ignored_fields, on_clock_reset=self._on_clock_reset
+        )
+        self._actor: StateActor = StateActor(
+            self._store, self._publish_changes, logger=self.logger
+        )
+        # Shares one in-flight read request (e.g. getSystemState) between callers
+        self._reads: SingleFlight[HmIPSystemRequestPaths, object] = SingleFlight()
         self._listeners = []
-
-    def add_state_listener(self, callback: Callable[[], None]) -> Callable[[], None]:
+        self._connection_listeners = []
+        # Push events arriving within coalesce_window of each other are
+        # published together, but never held back longer than max latency
+        if coalesce_window < 0 or coalesce_max_latency < coalesce_window:
+            raise ValueError(
+                "coalesce_window must be >= 0 and <= coalesce_max_latency"
+            )
+        self.coalesce_window: float = coalesce_window
+        self.coalesce_max_latency: float = coalesce_max_latency
+        self._pending_changes: StateChanges | None = None
+        self._pending_since: float = 0.0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        # What the latest getSystemState changed compared to the cached state
+        self.last_fetch_changes: StateChanges = empty_changes()
+        self.resyncs: int = 0
+        # Set when the HCU clock went back, until a fetch was installed unstamped
+        self._clock_reset: bool = False
+
+    def add_state_listener(
+        self, callback: Callable[[SystemState, StateChanges], None]
+    ) -> Callable[[], None]:
         """Register a listener invoked when cached system state changes.
 
+        The callback receives the merged state and the changes that led to it.
         Returns a remover callable.
         """
         self._listeners.append(callback)
@@ -949,49 +591,230 @@ class HCUController:
 
         return _remove
 
-    def _notify_state_listeners(self) -> None:
+    def _publish_changes(self, changes: StateChanges, *, immediate: bool = False) -> None:
+        """Queue changes for the state listeners, coalescing bursts of events.
+
+        The publication is delayed until no further changes arrived for
+        coalesce_window seconds, or coalesce_max_latency seconds after the
+        first pending change, whichever comes first.
+        """
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._pending_changes is None:
+            self._pending_changes = changes
+            self._pending_since = now
+        else:
+            _ = merge_changes(self._pending_changes, changes)
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if immediate or self.coalesce_window <= 0:
+            self._flush_changes()
+            return
+        deadline = min(
+            now + self.coalesce_window, self._pending_since + self.coalesce_max_latency
+        )
+        self._flush_handle = loop.call_at(deadline, self._flush_changes)
+
+    def _flush_changes(self) -> None:
+        self._flush_handle = None
+        changes = self._pending_changes
+        self._pending_changes = None
+        if changes is not None:
+            self._notify_state_listeners(changes)
+
+    def _notify_state_listeners(self, changes: StateChanges) -> None:
+        state = self._store.state
+        if state is None:
+            return
         for cb in list(self._listeners):
             try:
-                cb()
+                cb(state, changes)
             except Exception:
                 self.logger.exception("State listener failed")
 
-    def start(self) -> None:
-        """Start websocket processing in background thread."""
-        if self._ws_thread and self._ws_thread.is_alive():
+    def add_connection_listener(
+        self, callback: Callable[[bool], None]
+    ) -> Callable[[], None]:
+        """Register a listener invoked with True/False when the websocket opens/drops.
+
+        Returns a remover callable.
+        """
+        self._connection_listeners.append(callback)
+
+        def _remove() -> None:
+            try:
+                self._connection_listeners.remove(callback)
+            except ValueError:
+                pass
+
+        return _remove
+
+    def _notify_connection_listeners(self, connected: bool) -> None:
+        for cb in list(self._connection_listeners):
+            try:
+                cb(connected)
+            except Exception:
+                self.logger.exception("Connection listener failed")
+
+    @property
+    def state_store(self) -> StateStore:
+        """Cached system state with its channel, group and device indexes."""
+        return self._store
+
+    @property
+    def connected(self) -> bool:
+        """True while the websocket to the HCU is open."""
+        return self.ws is not None and not self.ws.closed
+
+    async def async_start(self) -> None:
+        """Start websocket processing as a task on the running event loop."""
+        if self._ws_task and not self._ws_task.done():
             return
+        self._loop = asyncio.get_running_loop()
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+            self._owns_session = True
+        self._actor.start()
+        self._validation_worker.start()
+        if self.recorder is not None:
+            self.recorder.start()
+        self._ws_task = self._loop.create_task(self._async_run(), name="hcu-ws")
+
+    async def async_stop(self) -> None:
+        """Stop websocket processing and fail outstanding requests."""
+        task = self._ws_task
+        self._ws_task = None
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending_changes = None
+        tasks = [t for t in (task, *self._background_tasks) if t is not None]
+        for t in tasks:
+            _ = t.cancel()
+        if tasks:
+            _ = await asyncio.gather(*tasks, return_exceptions=True)
+        await self._actor.stop()
+        await asyncio.to_thread(self._validation_worker.stop)
+        if self.recorder is not None:
+            await asyncio.to_thread(self.recorder.stop)
+        ws = self.ws
+        if ws is not None and not ws.closed:
+            try:
+                _ = await ws.close()
+            except Exception:
+                pass
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _create_background_task(self, coro: Coroutine[Any, Any, None], name: str) -> None:  # pyright: ignore[reportExplicitAny]
+        """Run coro on the loop, keeping a reference until it finishes."""
+        assert self._loop is not None
+        task = self._loop.create_task(coro, name=name)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _async_run(self) -> None:
+        assert self._session is not None
+        backoff: float = 1.0
+        max_backoff: float = 30.0
+        while True:
+            try:
+                async with self._session.ws_connect(
+                    self.url,
+                    headers=self._ws_headers,
+                    ssl=False,
+                    heartbeat=30,
+                    max_msg_size=MAX_WS_MESSAGE_SIZE,
+                ) as ws:
+                    self.ws = ws
+                    backoff = 1.0
+                    await self._ws_open_handler(ws)
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            try:
+                                await self._ws_message_handler(ws, cast(str, msg.data))
+                            except Exception as err:
+                                self._ws_error_handler(ws, err)
+                        elif msg.type == aiohttp.WSMsgType.ERROR:
+                            self._ws_error_handler(ws, ws.exception())
+                    self._ws_close_handler(ws, ws.close_code, str(ws.exception() or ""))
+            except (aiohttp.ClientError, OSError) as err:
+                self._ws_error_handler(None, err)
+            finally:
+                was_open = self._ws_open_event.is_set()
+                self.ws = None
+                self._ws_open_event.clear()
+                if was_open:
+                    self._notify_connection_listeners(False)
+                self._requests.fail_all(ConnectionError("WebSocket connection lost"))
+            delay = min(backoff, max_backoff)
+            self.logger.warning("WebSocket will attempt reconnect in %.1fs", delay)
+            await asyncio.sleep(delay)
+            backoff = min(backoff * 2.0, max_backoff)
+
+    # ---- Blocking wrappers ------------------------------------------------------------
+    def _run_threadsafe(
+        self, coro: Coroutine[Any, Any, _TType], timeout: float | None = None  # pyright: ignore[reportExplicitAny]
+    ) -> _TType:
+        """Run coro on the controller loop from another thread and wait for it."""
+        loop = self._loop
+        if loop is None:
+            coro.close()
+            raise RuntimeError("HCUController is not running; call start() first")
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coro.close()
+            raise RuntimeError(
+                "Blocking HCUController API called from its event loop; "
+                + "use the async_ methods instead"
+            )
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
 
-        def _run() -> None:
-            backoff: float = 1.0
-            max_backoff: float = 30.0
-            while True:
-                _ok: bool = self.ws.run_forever(sslopt={"cert_reqs": ssl.CERT_NONE})  # pyright: ignore[reportUnknownMemberType]
-                if _ok is True:
-                    delay = min(backoff, max_backoff)
-                    self.logger.warning(
-                        "WebSocket will attempt reconnect in %.1fs", delay
-                    )
-                    time.sleep(delay)
-                    backoff = min(backoff * 2.0, max_backoff)
-                    continue
-                break
+    def start(self) -> None:
+        """Start websocket processing (blocking wrapper around async_start).
 
-        self._ws_thread = threading.Thread(target=_run, name="hcu-ws", daemon=True)
-        self._ws_thread.start()
+        Outside of an event loop (scripts, tests) a private loop is run in a
+        background thread.
+        """
+        if self._loop is None:
+            loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(
+                target=loop.run_forever, name="hcu-loop", daemon=True
+            )
+            self._loop_thread.start()
+            self._loop = loop
+        self._run_threadsafe(self.async_start())
 
     def stop(self) -> None:
-        """Stop websocket processing."""
+        """Stop websocket processing (blocking wrapper around async_stop)."""
+        loop = self._loop
+        if loop is None:
+            return
         try:
-            self.ws.close()  # pyright: ignore[reportUnknownMemberType]
-        except Exception:
-            pass
-
-    def _send_plugin_message(
+            self._run_threadsafe(self.async_stop())
+        finally:
+            thread = self._loop_thread
+            if thread is not None:
+                _ = loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+                self._loop_thread = None
+                self._loop = None
+
+    async def _send_plugin_message(
         self,
         msg_id: str,
         msg_type: str,
         body: dict[str, Any] | None = None,  # pyright: ignore[reportExplicitAny]
     ) -> None:
+        ws = self.ws
+        if ws is None or ws.closed:
+            raise ConnectionError(f"WebSocket not connected, cannot send {msg_type}")
         data: dict[str, str | dict[str, Any]] = {  # pyright: ignore[reportExplicitAny]
             "pluginId": self.plugin_id,
             "id": msg_id,
@@ -999,15 +822,24 @@ class HCUController:
         }
         if body:
             data["body"] = body
-        self.ws.send(json.dumps(data))
+        await ws.send_str(json.dumps(data))
 
-    def _ws_error_handler(self, ws: WebSocket, err: str) -> None:  # pyright: ignore[reportUnusedParameter]
+    def _ws_error_handler(
+        self,
+        ws: aiohttp.ClientWebSocketResponse | None,  # pyright: ignore[reportUnusedParameter]
+        err: object,
+    ) -> None:
         self.logger.error("WebSocket error: %s", err)
 
-    def _ws_close_handler(self, ws: WebSocket, code: str, msg: str) -> None:  # pyright: ignore[reportUnusedParameter]
-        self.logger.info("WebSocket closed with code: %d, message: %s", code, msg)
+    def _ws_close_handler(
+        self,
+        ws: aiohttp.ClientWebSocketResponse,  # pyright: ignore[reportUnusedParameter]
+        code: int | None,
+        msg: str,
+    ) -> None:
+        self.logger.info("WebSocket closed with code: %s, message: %s", code, msg)
 
-    def _send_plugin_state_response(self, msg_id: str | None = None) -> None:
+    async def _send_plugin_state_response(self, msg_id: str | None = None) -> None:
         if msg_id is None:
             msg_id = str(uuid.uuid4())
         body = {
@@ -1017,58 +849,35 @@ class HCUController:
                 "en": "Home Assistant Custom Plugin",
             },
         }
-        self._send_plugin_message(msg_id, "PLUGIN_STATE_RESPONSE", body)
+        await self._send_plugin_message(msg_id, "PLUGIN_STATE_RESPONSE", body)
 
-    def _handle_plugin_state_request(self, msg_id: str, body: None) -> None:  # pyright: ignore[reportUnusedParameter]
-        self._send_plugin_state_response(msg_id)
+    async def _handle_plugin_state_request(self, msg_id: str, body: None) -> None:  # pyright: ignore[reportUnusedParameter]
+        await self._send_plugin_state_response(msg_id)
 
-    def _send_discover_response(self, msg_id: str):
+    async def _send_discover_response(self, msg_id: str):
         self.logger.info("Sending discover response")
         body: dict[str, Any] = {  # pyright: ignore[reportExplicitAny]
             "devices": [],
             "success": True,
         }
-        self._send_plugin_message(msg_id, "DISCOVER_RESPONSE", body)
+        await self._send_plugin_message(msg_id, "DISCOVER_RESPONSE", body)
 
-    def _handle_discover_request(self, msg_id: str, body: None) -> None:  # pyright: ignore[reportUnusedParameter]
-        self._send_discover_response(msg_id)
+    async def _handle_discover_request(self, msg_id: str, body: None) -> None:  # pyright: ignore[reportUnusedParameter]
+        await self._send_discover_response(msg_id)
 
-    def _send_request_message(
+    async def _send_request_message(
         self,
         msg_type: str,
         body: dict[str, Any],  # pyright: ignore[reportExplicitAny]
     ) -> dict[str, Any] | None:  # pyright: ignore[reportExplicitAny]
-        msg_id = str(uuid.uuid4())
-        expected_type = self._to_response_type(msg_type)
-        evt = threading.Event()
-        with self._pending_lock:
-            self._pending[msg_id] = {
-                "expected_type": expected_type,
-                "event": evt,
-                "response": None,
-            }
-
-        self.logger.info(
-            "Sending request %s with id %s expecting %s",
-            msg_type,
-            msg_id,
-            expected_type,
-        )
-        self._send_plugin_message(msg_id, msg_type, body)
-
-        # Wait for matching response
-        if not evt.wait(timeout=10):
-            with self._pending_lock:
-                _ = self._pending.pop(msg_id, None)
-            raise TimeoutError(
-                f"Timed out waiting for response to {msg_type} with id {msg_id}"
-            )
+        """Send a request through the multiplexer and await its response body.
 
-        with self._pending_lock:
-            entry = self._pending.pop(msg_id, None)
-        if entry and "response" in entry:
-            return entry["response"]["body"]  # pyright: ignore[reportUnknownVariableType, reportOptionalSubscript]
-        return None
+        Many callers may await concurrently; the multiplexer pipelines up to
+        max_in_flight of them over the websocket and queues the rest.
+        """
+        self.logger.info("Sending request %s", msg_type)
+        response = await self._requests.submit(msg_type, body)
+        return response["body"]  # pyright: ignore[reportAny]
 
     def _handle_message_response(self, message: PluginMessage) -> None:
         msg_id = message.get("id")
@@ -1078,58 +887,47 @@ class HCUController:
             return
         if plugin_id != self.plugin_id:
             return
-        with self._pending_lock:
-            entry = self._pending.get(msg_id)
-            if entry and message["body"]:
-                expected_type = entry["expected_type"]
-                body = message["body"]
-                response = {"success": True, "body": body}
-                if "error" in body or expected_type == "ERROR_RESPONSE":
-                    response["success"] = False
-                entry["response"] = response
-                entry["event"].set()
-                self.logger.debug("Matched response %s for id %s", msg_type, msg_id)
-            else:
-                # Not a pending request or type mismatch; ignore
-                self.logger.error(
-                    "Unmatched response: id=%s type=%s (pending=%s)",
-                    msg_id,
-                    msg_type,
-                    bool(entry),
-                )
-
-    @staticmethod
-    def _to_response_type(request_type: str) -> str:
-        if request_type.endswith("_REQUEST"):
-            return request_type[:-8] + "_RESPONSE"
+        body = message["body"]
+        if body and self._requests.resolve(msg_id, cast(dict[str, Any], body)):  # pyright: ignore[reportExplicitAny]
+            self.logger.debug("Matched response %s for id %s", msg_type, msg_id)
         else:
-            raise ValueError(f"Unknown request type: {request_type}")
+            # Not a pending request or type mismatch; ignore
+            self.logger.error(
+                "Unmatched response: id=%s type=%s (body=%s)",
+                msg_id,
+                msg_type,
+                bool(body),
+            )
 
-    def _send_config_template_response(self, msg_id: str) -> None:
+    async def _send_config_template_response(self, msg_id: str) -> None:
         self.logger.info("Sending config template response")
         body: dict[str, Any] = {"properties": {}}  # pyright: ignore[reportExplicitAny]
-        self._send_plugin_message(msg_id, "CONFIG_TEMPLATE_RESPONSE", body)
+        await self._send_plugin_message(msg_id, "CONFIG_TEMPLATE_RESPONSE", body)
 
-    def _handle_config_template_request(
+    async def _handle_config_template_request(
         self,
         msg_id: str,
         body: ConfigTemplateRequestBody,  # pyright: ignore[reportUnusedParameter]
     ) -> None:
-        self._send_config_template_response(msg_id)
+        await self._send_config_template_response(msg_id)
 
-    def _send_config_update_response(self, msg_id: str) -> None:
+    async def _send_config_update_response(self, msg_id: str) -> None:
         self.logger.info("Sending config template response")
         body = {"status": "APPLIED"}
-        self._send_plugin_message(msg_id, "CONFIG_UPDATE_RESPONSE", body)
+        await self._send_plugin_message(msg_id, "CONFIG_UPDATE_RESPONSE", body)
 
-    def _handle_config_update_request(
+    async def _handle_config_update_request(
         self,
         msg_id: str,
         body: ConfigUpdateRequestBody,  # pyright: ignore[reportUnusedParameter]
     ) -> None:
-        self._send_config_update_response(msg_id)
+        await self._send_config_update_response(msg_id)
 
-    def _plugin_message_handler(self, ws: WebSocket, message: PluginMessage) -> None:  # pyright: ignore[reportUnusedParameter]
+    async def _plugin_message_handler(
+        self,
+        ws: aiohttp.ClientWebSocketResponse,  # pyright: ignore[reportUnusedParameter]
+        message: PluginMessage,
+    ) -> None:
         message_body = message["body"]
         message_str = json.dumps(message)
         if len(message_str) > 150:
@@ -1162,13 +960,13 @@ class HCUController:
             message_str,
         )
         if message["type"] == "PLUGIN_STATE_REQUEST":
-            self._handle_plugin_state_request(message["id"], message["body"])
+            await self._handle_plugin_state_request(message["id"], message["body"])
         elif message["type"] == "DISCOVER_REQUEST":
-            self._handle_discover_request(message["id"], message["body"])
+            await self._handle_discover_request(message["id"], message["body"])
         elif message["type"] == "CONFIG_TEMPLATE_REQUEST":
-            self._handle_config_template_request(message["id"], message["body"])
+            await self._handle_config_template_request(message["id"], message["body"])
         elif message["type"] == "CONFIG_UPDATE_REQUEST":
-            self._handle_config_update_request(message["id"], message["body"])
+            await self._handle_config_update_request(message["id"], message["body"])
         elif message["type"].lower().endswith("response"):
             self._handle_message_response(message)
         elif message["type"].lower().endswith("event"):
@@ -1180,28 +978,28 @@ class HCUController:
 
     # Overloads mapping each path to its corresponding request body type
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPHomeRequestPaths.getSystemState],
         body: HomeRequestBodies.Empty,
     ) -> HmIPSystemGetSystemStateResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPHomeRequestPaths.getState],
         body: HomeRequestBodies.Empty,
     ) -> HmIPSystemGetStateResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPHomeRequestPaths.getStateForClient],
         body: HomeRequestBodies.Empty,
     ) -> HmIPSystemGetStateForClientResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPHomeRequestPaths.checkAuthToken],
         body: HomeRequestBodies.Empty,
@@ -1209,7 +1007,7 @@ class HCUController:
 
     # Group Profile
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupProfileRequestPaths.setProfileMode],
         body: GroupProfileRequestBodies.SetProfileModeRequestBody,
@@ -1217,7 +1015,7 @@ class HCUController:
 
     # Role
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPRoleRequestPaths.enableSimpleRule],
         body: RoleRequestBodies.EnableSimpleRule,
@@ -1225,63 +1023,63 @@ class HCUController:
 
     # Home Heating
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPHomeHeatingRequestPaths.activateAbsencePermanent],
         body: HomeRequestBodies.Empty,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPHomeHeatingRequestPaths.activateAbsenceWithDuration],
         body: HomeHeatingRequestBodies.ActivateAbsenceWithDuration,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPHomeHeatingRequestPaths.activateAbsenceWithFuturePeriod],
         body: HomeHeatingRequestBodies.ActivateAbsenceWithFuturePeriod,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPHomeHeatingRequestPaths.activateAbsenceWithPeriod],
         body: HomeHeatingRequestBodies.ActivateAbsenceWithPeriod,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPHomeHeatingRequestPaths.activateFutureVacation],
         body: HomeHeatingRequestBodies.ActivateFutureVacation,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPHomeHeatingRequestPaths.activateVacation],
         body: HomeHeatingRequestBodies.ActivateVacation,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPHomeHeatingRequestPaths.deactivateAbsence],
         body: Mapping[str, object],
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPHomeHeatingRequestPaths.deactivateVacation],
         body: Mapping[str, object],
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPHomeHeatingRequestPaths.setCooling],
         body: HomeHeatingRequestBodies.SetCooling,
@@ -1289,56 +1087,56 @@ class HCUController:
 
     # Group Heating
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupHeatingRequestPaths.activatePartyMode],
         body: GroupHeatingRequestBodies.HmIPActivatePartyMode,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupHeatingRequestPaths.setActiveProfile],
         body: GroupHeatingRequestBodies.HmIPSetActiveProfile,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupHeatingRequestPaths.setBoost],
         body: GroupHeatingRequestBodies.HmIPSetBoost,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupHeatingRequestPaths.setControlMode],
         body: GroupHeatingRequestBodies.HmIPSetControlMode,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupHeatingRequestPaths.setHotWaterOnTime],
         body: GroupHeatingRequestBodies.HmIPSetHotWaterOnTime,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupHeatingRequestPaths.setHotWaterProfileMode],
         body: GroupHeatingRequestBodies.HmIPSetHotWaterProfileMode,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupHeatingRequestPaths.setHotWaterState],
         body: GroupHeatingRequestBodies.HmIPSetHotWaterState,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupHeatingRequestPaths.setSetPointTemperature],
         body: GroupHeatingRequestBodies.HmIPSetPointTemperature,
@@ -1346,21 +1144,21 @@ class HCUController:
 
     # Home Security
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPHomeSecurityRequestPaths.setExtendedZonesActivation],
         body: HomeSecurityRequestBodies.SetExtendedZonesActivation,
     ) -> HmIPSystemSetExtendedZonesActivationResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPHomeSecurityRequestPaths.setZonesActivation],
         body: HomeSecurityRequestBodies.SetZonesActivation,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPHomeSecurityRequestPaths.acknowledgeSafetyAlarm],
         body: Mapping[str, object],
@@ -1368,7 +1166,7 @@ class HCUController:
 
     # Group Linked Control
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[
             HmIPGroupLinkedControlRequestPaths.setOpticalSignalBehaviour
@@ -1377,21 +1175,21 @@ class HCUController:
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupLinkedControlRequestPaths.setSoundFileVolumeLevel],
         body: GroupLinkedControlRequestBodies.SetSoundFileVolumeLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupLinkedControlRequestPaths.setVentilationLevel],
         body: GroupLinkedControlRequestBodies.HmIPSetVentilationLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[
             HmIPGroupLinkedControlRequestPaths.setVentilationLevelWithTime
@@ -1400,14 +1198,14 @@ class HCUController:
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupLinkedControlRequestPaths.setVentilationState],
         body: GroupLinkedControlRequestBodies.HmIPSetVentilationState,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[
             HmIPGroupLinkedControlRequestPaths.setVentilationStateWithTime
@@ -1416,14 +1214,14 @@ class HCUController:
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupLinkedControlRequestPaths.setWateringSwitchState],
         body: GroupLinkedControlRequestBodies.HmIPSetWateringSwitchState,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[
             HmIPGroupLinkedControlRequestPaths.setWateringSwitchStateWithTime
@@ -1432,28 +1230,28 @@ class HCUController:
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupLinkedControlRequestPaths.startNotification],
         body: GroupLinkedControlRequestBodies.GroupId,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupLinkedControlRequestPaths.stopNotification],
         body: GroupLinkedControlRequestBodies.GroupId,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupLinkedControlRequestPaths.toggleVentilationState],
         body: GroupLinkedControlRequestBodies.GroupId,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupLinkedControlRequestPaths.toggleWateringState],
         body: GroupLinkedControlRequestBodies.GroupId,
@@ -1461,14 +1259,14 @@ class HCUController:
 
     # Group Switching
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupSwitchingRequestPaths.setColorTemperatureDimLevel],
         body: GroupSwitchingRequestBodies.SetColorTemperatureDimLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[
             HmIPGroupSwitchingRequestPaths.setColorTemperatureDimLevelWithTime
@@ -1477,35 +1275,35 @@ class HCUController:
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupSwitchingRequestPaths.setDimLevel],
         body: GroupSwitchingRequestBodies.SetDimLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupSwitchingRequestPaths.setDimLevelWithTime],
         body: GroupSwitchingRequestBodies.SetDimLevelWithTime,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupSwitchingRequestPaths.setFavoriteShadingPosition],
         body: GroupSwitchingRequestBodies.HmIPGroupsSwitching,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupSwitchingRequestPaths.setHueSaturationDimLevel],
         body: GroupSwitchingRequestBodies.SetHueSaturationDimLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[
             HmIPGroupSwitchingRequestPaths.setHueSaturationDimLevelWithTime
@@ -1514,56 +1312,56 @@ class HCUController:
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupSwitchingRequestPaths.setPrimaryShadingLevel],
         body: GroupSwitchingRequestBodies.SetPrimaryShadingLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupSwitchingRequestPaths.setSecondaryShadingLevel],
         body: GroupSwitchingRequestBodies.SetSecondaryShadingLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupSwitchingRequestPaths.setState],
         body: GroupSwitchingRequestBodies.SetSwitchState,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupSwitchingRequestPaths.setSwitchStateWithTime],
         body: GroupSwitchingRequestBodies.SetSwitchStateWithTime,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupSwitchingRequestPaths.startLightScene],
         body: GroupSwitchingRequestBodies.StartLightScene,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupSwitchingRequestPaths.stop],
         body: GroupSwitchingRequestBodies.HmIPGroupsSwitching,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupSwitchingRequestPaths.toggleShadingState],
         body: GroupSwitchingRequestBodies.HmIPGroupsSwitching,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPGroupSwitchingRequestPaths.toggleSwitchState],
         body: GroupSwitchingRequestBodies.HmIPGroupsSwitching,
@@ -1571,28 +1369,28 @@ class HCUController:
 
     # Device Control
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setDimLevel],
         body: DeviceControlRequestBodies.SetDimLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setDimLevelWithTime],
         body: DeviceControlRequestBodies.SetDimLevelWithTime,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setColorTemperatureDimLevel],
         body: DeviceControlRequestBodies.SetColorTemperatureDimLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[
             HmIPDeviceControlRequestPaths.setColorTemperatureDimLevelWithTime
@@ -1601,14 +1399,14 @@ class HCUController:
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setHueSaturationDimLevel],
         body: DeviceControlRequestBodies.SetHueSaturationDimLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[
             HmIPDeviceControlRequestPaths.setHueSaturationDimLevelWithTime
@@ -1617,35 +1415,35 @@ class HCUController:
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setSwitchState],
         body: DeviceControlRequestBodies.SetSwitchState,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setSwitchStateForIdentify],
         body: DeviceControlRequestBodies.SetSwitchState,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setSwitchStateWithTime],
         body: DeviceControlRequestBodies.SetSwitchStateWithTime,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setDoorLockActive],
         body: DeviceControlRequestBodies.SetDoorLockActive,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[
             HmIPDeviceControlRequestPaths.setDoorLockActiveWithAuthorization
@@ -1654,63 +1452,63 @@ class HCUController:
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setLockState],
         body: DeviceControlRequestBodies.SetLockState,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setMotionDetectionActive],
         body: DeviceControlRequestBodies.SetMotionDetectionActive,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setOpticalSignal],
         body: DeviceControlRequestBodies.SetOpticalSignalBase,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setOpticalSignalWithTime],
         body: DeviceControlRequestBodies.SetOpticalSignalWithTime,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setPrimaryShadingLevel],
         body: DeviceControlRequestBodies.SetPrimaryShadingLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setSecondaryShadingLevel],
         body: DeviceControlRequestBodies.SetSecondaryShadingLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setShutterLevel],
         body: DeviceControlRequestBodies.SetShutterLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setSimpleRGBColorDimLevel],
         body: DeviceControlRequestBodies.SetSimpleRGBColorDimLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[
             HmIPDeviceControlRequestPaths.setSimpleRGBColorDimLevelWithTime
@@ -1719,21 +1517,21 @@ class HCUController:
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setSlatsLevel],
         body: DeviceControlRequestBodies.SetSlatsLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setSoundFileVolumeLevel],
         body: DeviceControlRequestBodies.SetSoundFileVolumeLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[
             HmIPDeviceControlRequestPaths.setSoundFileVolumeLevelWithTime
@@ -1742,42 +1540,42 @@ class HCUController:
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setVentilationLevel],
         body: DeviceControlRequestBodies.SetVentilationLevel,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setVentilationLevelWithTime],
         body: DeviceControlRequestBodies.SetVentilationLevelWithTime,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setVentilationState],
         body: DeviceControlRequestBodies.SetVentilationState,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setVentilationStateWithTime],
         body: DeviceControlRequestBodies.SetVentilationStateWithTime,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setWateringSwitchState],
         body: DeviceControlRequestBodies.SetWateringSwitchState,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[
             HmIPDeviceControlRequestPaths.setWateringSwitchStateWithTime
@@ -1786,28 +1584,28 @@ class HCUController:
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.startLightScene],
         body: DeviceControlRequestBodies.StartLightScene,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.sendDoorCommand],
         body: DeviceControlRequestBodies.SendDoorCommand,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.pullLatch],
         body: DeviceControlRequestBodies.PullLatch,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[
             HmIPDeviceControlRequestPaths.acknowledgeFrostProtectionError
@@ -1816,112 +1614,112 @@ class HCUController:
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.resetBlocking],
         body: DeviceControlRequestBodies.HmIPDeviceControl,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.resetEnergyCounter],
         body: DeviceControlRequestBodies.HmIPDeviceControl,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.resetPassageCounter],
         body: DeviceControlRequestBodies.HmIPDeviceControl,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.resetWaterVolume],
         body: DeviceControlRequestBodies.HmIPDeviceControl,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setFavoriteShadingPosition],
         body: DeviceControlRequestBodies.HmIPDeviceControl,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setIdentify],
         body: DeviceControlRequestBodies.HmIPDeviceControl,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.setIdentifyOem],
         body: DeviceControlRequestBodies.HmIPDeviceControl,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.startImpulse],
         body: DeviceControlRequestBodies.HmIPDeviceControl,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.stop],
         body: DeviceControlRequestBodies.HmIPDeviceControl,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.toggleCameraNightVision],
         body: DeviceControlRequestBodies.HmIPDeviceControl,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.toggleGarageDoorState],
         body: DeviceControlRequestBodies.HmIPDeviceControl,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.toggleShadingState],
         body: DeviceControlRequestBodies.HmIPDeviceControl,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.toggleSwitchState],
         body: DeviceControlRequestBodies.HmIPDeviceControl,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.toggleVentilationState],
         body: DeviceControlRequestBodies.HmIPDeviceControl,
     ) -> HmIpSystemResponseBody: ...
 
     @overload
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self,
         hmip_path: Literal[HmIPDeviceControlRequestPaths.toggleWateringState],
         body: DeviceControlRequestBodies.HmIPDeviceControl,
     ) -> HmIpSystemResponseBody: ...
 
     @type_checker
-    def _send_hmip_system_request(
+    async def _send_hmip_system_request(
         self, hmip_path: HmIPSystemRequestPaths, body: object
     ) -> HmIpSystemResponseBody:
         request_body: dict[str, Any] = {"path": hmip_path.value, "body": body}  # pyright: ignore[reportExplicitAny]
@@ -1932,7 +1730,7 @@ class HCUController:
         )
         return cast(  # pyright: ignore[reportAny]
             Any,  # pyright: ignore[reportExplicitAny]
-            self._send_request_message("HMIP_SYSTEM_REQUEST", request_body),
+            await self._send_request_message("HMIP_SYSTEM_REQUEST", request_body),
         )
         # home, groups, devices, clients
         # print(response["body"])
@@ -1945,26 +1743,22 @@ class HCUController:
                 "Unknown system event type: %s message=%s", message["type"], message
             )
 
+    def _log_schema_issues(self, label: str, issues: list[str], body: object) -> None:
+        """Record schema issues found by the validation worker (worker thread)."""
+        _ = self.drift_registry.record(label, issues, body)
+
     def _handle_hmip_system_event(self, body: HmipSystemEventBody) -> None:
-        # 1. Validate top-level body against its annotation
+        # 1. Queue the body for validation against its annotation
         summary_types = [
             ev["pushEventType"] for ev in body["eventTransaction"]["events"].values()
         ]
         self.logger.info("HMIP system event received (types=%s)", summary_types)
-        try:
-            issues = validate_annotated(body)
-            if issues:
-                unexpected = [i for i in issues if "unexpected key" in i]
-                log_fn = self.logger.error if unexpected else self.logger.warning
-                log_fn(
-                    "HMIP system event body type issues (first %d): %s, body=%s",
-                    min(10, len(issues)),
-                    issues[:10],
-                    body,
-                )
-                self.logger.info(body)
-        except Exception:  # pragma: no cover - defensive
-            self.logger.exception("validate_annotated failed for system event body")
+        ts_obj = body["eventTransaction"].get("timestamp")
+        timestamp = ts_obj if isinstance(ts_obj, int) else None
+        # Validated on the background worker, never delaying the merge
+        _ = self._validation_worker.submit(
+            "HMIP_SYSTEM_EVENT", HmipSystemEventBody, body, self._log_schema_issues
+        )
 
         # 2. Log devices in this event that expose SINGLE_KEY_CHANNELs (warn level)
         try:
@@ -1978,118 +1772,159 @@ class HCUController:
                 "Failed to scan SINGLE_KEY_CHANNEL devices in system event"
             )
 
-        # Merge incoming events into cached state and notify listeners
-        try:
-            with self._state_lock:
-                if self._system_state is None:
-                    return
-
-                state = self._system_state
-
-                def _get_map(key: str) -> dict[str, object]:
-                    cur = state.get(key)
-                    if not isinstance(cur, dict):
-                        cur = {}
-                        state[key] = cur
-                    return cast(dict[str, object], cur)
-
-                events = body["eventTransaction"]["events"]
-                for ev_map in events.values():
-                    if ev_map["pushEventType"] == "HOME_CHANGED":
-                        state["home"] = ev_map["home"]
-                    elif ev_map["pushEventType"] in ("DEVICE_ADDED", "DEVICE_CHANGED"):
-                        dev = ev_map.get("device")
-                        if isinstance(dev, dict):
-                            did_obj = cast(dict[str, object], dev).get("id")
-                            did = did_obj if isinstance(did_obj, str) else None
-                            if did:
-                                _get_map("devices")[did] = dev
-                    elif ev_map["pushEventType"] == "DEVICE_REMOVED":
-                        did_obj = ev_map["id"]
-                        with self._state_lock:
-                            _ = self._system_state["devices"].pop(did_obj, None)
-                    elif ev_map["pushEventType"] in ("GROUP_ADDED", "GROUP_CHANGED"):
-                        grp = ev_map.get("group")
-                        if isinstance(grp, dict):
-                            gid_obj = cast(dict[str, object], grp).get("id")
-                            gid = gid_obj if isinstance(gid_obj, str) else None
-                            if gid:
-                                _get_map("groups")[gid] = grp
-                    elif ev_map["pushEventType"] == "GROUP_REMOVED":
-                        gid = ev_map.get("id")
-                        if gid:
-                            _ = _get_map("groups").pop(gid, None)
-                    elif ev_map["pushEventType"] in ("CLIENT_ADDED", "CLIENT_CHANGED"):
-                        cli = ev_map.get("client")
-                        if isinstance(cli, dict):
-                            cid_obj = cast(dict[str, object], cli).get("id")
-                            cid = cid_obj if isinstance(cid_obj, str) else None
-                            if cid:
-                                _get_map("clients")[cid] = cli
-                    elif ev_map["pushEventType"] == "CLIENT_REMOVED":
-                        cid = ev_map.get("id")
-                        if cid:
-                            _ = _get_map("clients").pop(cid, None)
-        except Exception:
-            self.logger.exception("Failed merging HMIP system event into state")
-        else:
-            self._notify_state_listeners()
+        # Merged into cached state by the state actor, which notifies listeners
+        self._actor.submit_events(
+            body["eventTransaction"]["events"].values(), timestamp
+        )
 
-    def _ws_open_handler(self, ws: WebSocket) -> None:  # pyright: ignore[reportUnusedParameter]
+    async def _ws_open_handler(self, ws: aiohttp.ClientWebSocketResponse) -> None:  # pyright: ignore[reportUnusedParameter]
         self.logger.info("WebSocket connection opened")
         self._ws_open_event.set()
-        self._send_plugin_state_response()
-        if not self.first_connection:
-            self.first_connection = False
-            threading.Thread(
-                target=self._send_initial_hmip_system_request,
-                name="hcu-request-worker",
-                args=(),
-                daemon=True,
-            ).start()
-
-    def _send_initial_hmip_system_request(self) -> None:
-        """Send an initial system state fetch after WS open."""
+        self._notify_connection_listeners(True)
+        await self._send_plugin_state_response()
+        # The HCU does not number its event transactions, so whether events
+        # were pushed while the connection was down cannot be told: resync on
+        # every connection. The fetch is diffed against the cached state, so
+        # a reconnect that missed nothing writes no entity.
+        reason = (
+            "initial fetch"
+            if self.first_connection or self._store.state is None
+            else "reconnected, events may have been missed"
+        )
+        self.first_connection = False
+        # Must not be awaited here: the response arrives via the receive loop
+        self._create_background_task(self._resync(reason), "hcu-resync")
+
+    def _on_clock_reset(self) -> None:
+        """The store dropped an event far older than the state it was merged into.
+
+        Either the HCU clock was set back or the cache is from a clock that ran
+        ahead: every later event would be dropped as stale. Fetch again and
+        leave the fetched state unstamped.
+        """
+        self._clock_reset = True
+        self._create_background_task(
+            self._resync("HCU clock went back"), "hcu-resync"
+        )
+
+    async def _resync(self, reason: str) -> None:
+        """Fetch the state and publish only what differs from the cache."""
+        self.logger.info("Resyncing system state: %s", reason)
+        self.resyncs += 1
         try:
-            response = self._send_hmip_system_request(
-                HmIPHomeRequestPaths.getSystemState, {}
-            )
-            self._system_state = response["body"]
+            _ = await self.async_fetch_system_state()
         except Exception as exc:
-            self.logger.exception("Initial HMIP request failed: %s", exc)
-        else:
-            self._notify_state_listeners()
+            self.logger.exception("System state resync failed: %s", exc)
+            return
+        changes = self.last_fetch_changes
+        if has_changes(changes):
+            # Fold in anything still pending and publish right away
+            self._publish_changes(changes, immediate=True)
+
+    async def async_wait_until_ready(self, timeout: float = 5.0) -> bool:
+        """Wait until the websocket connection is open."""
+        try:
+            _ = await asyncio.wait_for(self._ws_open_event.wait(), timeout)
+        except TimeoutError:
+            return False
+        return True
 
     def wait_until_ready(self, timeout: float = 5.0) -> bool:
         """Block until websocket on_open fired."""
-        return self._ws_open_event.wait(timeout)
+        return self._run_threadsafe(self.async_wait_until_ready(timeout))
 
-    def get_system_state(self) -> SystemState:
+    async def async_fetch_system_state(self) -> SystemState:
+        """Fetch the system state from the HCU and cache it.
+
+        Concurrent callers share a single in-flight getSystemState request and
+        its parsed, validated result.
+        """
+
+        async def _fetch() -> SystemState:
+            # Events pushed while the request is in flight are replayed onto
+            # the response unless they are older than it
+            self._actor.begin_fetch()
+            clock_reset = self._clock_reset
+            replaced = False
+            try:
+                resp = await self._send_hmip_system_request(
+                    HmIPHomeRequestPaths.getSystemState, {}
+                )
+                body = resp["body"]
+                self.last_fetch_changes = await self._actor.replace(
+                    body, clock_reset=clock_reset
+                )
+                replaced = True
+            finally:
+                # Any failure (error response, failed replace, cancellation)
+                # must end the fetch, or the store keeps recording pushed
+                # events for a replay that never comes
+                if not replaced:
+                    self._actor.cancel_fetch()
+            if clock_reset:
+                self._clock_reset = False
+            return body
+
+        return cast(
+            SystemState,
+            await self._reads.run(HmIPHomeRequestPaths.getSystemState, _fetch),
+        )
+
+    async def async_restore_state(self, state: SystemState) -> None:
+        """Install a previously persisted state until a fetch replaces it.
+
+        Nothing is published to the state listeners. May be called before
+        async_start; the state actor is started here so the replacement runs.
+        """
+        self._actor.start()
+        _ = await self._actor.replace(state)
+
+    async def async_get_system_state(self) -> SystemState:
         """Return cached system state if present; try to fetch if missing."""
-        if self._system_state is None:
-            resp = self._send_hmip_system_request(
-                HmIPHomeRequestPaths.getSystemState, {}
-            )
-            self._system_state = resp["body"]
-        return self._system_state
+        state = self._store.state
+        if state is None:
+            return await self.async_fetch_system_state()
+        return state
 
-    def _ws_message_handler(self, ws: WebSocket, message: str) -> None:
+    def get_system_state(self) -> SystemState:
+        """Blocking wrapper around async_get_system_state."""
+        return self._run_threadsafe(self.async_get_system_state())
+
+    async def async_request(
+        self, hmip_path: HmIPSystemRequestPaths, body: Mapping[str, object]
+    ) -> HmIpSystemResponseBody:
+        """Send an HMIP system request and await the HCU response body."""
+        return await self._send_hmip_system_request(hmip_path, body)  # pyright: ignore[reportCallIssue, reportArgumentType]
+
+    def request(
+        self, hmip_path: HmIPSystemRequestPaths, body: Mapping[str, object]
+    ) -> HmIpSystemResponseBody:
+        """Blocking wrapper around async_request."""
+        return self._run_threadsafe(self.async_request(hmip_path, body))
+
+    async def _ws_message_handler(
+        self, ws: aiohttp.ClientWebSocketResponse, message: str
+    ) -> None:
+        if self.recorder is not None:
+            _ = self.recorder.record(message)
         json_message = cast(PluginMessage, json.loads(message))
         if json_message["pluginId"] == self.plugin_id:
-            self._plugin_message_handler(ws, json_message)
+            await self._plugin_message_handler(ws, json_message)
         else:
             self.logger.warning(
                 "Unknown plugin message received: %s", json.dumps(json_message)
             )
 
     # ---- Public convenience API wrappers -------------------------------------------------
-    def set_heating_group_setpoint(self, group_id: str, temperature: float) -> None:
+    async def async_set_heating_group_setpoint(
+        self, group_id: str, temperature: float
+    ) -> None:
         """Set target temperature on a heating group.
 
         This is a thin wrapper around the GroupHeating setSetPointTemperature request.
         """
         try:
-            _ = self._send_hmip_system_request(
+            _ = await self._send_hmip_system_request(
                 HmIPGroupHeatingRequestPaths.setSetPointTemperature,
                 {"groupId": group_id, "setPointTemperature": float(temperature)},
             )
@@ -2098,7 +1933,13 @@ class HCUController:
                 "Failed to send setSetPointTemperature for group %s", group_id
             )
 
-    def set_notification_light(
+    def set_heating_group_setpoint(self, group_id: str, temperature: float) -> None:
+        """Blocking wrapper around async_set_heating_group_setpoint."""
+        self._run_threadsafe(
+            self.async_set_heating_group_setpoint(group_id, temperature)
+        )
+
+    async def async_set_notification_light(
         self,
         device_id: str,
         channel_index: int,
@@ -2124,7 +1965,7 @@ class HCUController:
                 "opticalSignalBehaviour": str(optical_signal_behaviour),
                 "dimLevel": float(dim_level),
             }
-            _ = self._send_hmip_system_request(
+            _ = await self._send_hmip_system_request(
                 HmIPDeviceControlRequestPaths.setOpticalSignal,
                 body,
             )
@@ -2135,7 +1976,27 @@ class HCUController:
                 channel_index,
             )
 
-    def set_dimmer_level(
+    def set_notification_light(
+        self,
+        device_id: str,
+        channel_index: int,
+        *,
+        simple_rgb_color_state: str = "WHITE",
+        optical_signal_behaviour: str = "ON",
+        dim_level: float = 1.0,
+    ) -> None:
+        """Blocking wrapper around async_set_notification_light."""
+        self._run_threadsafe(
+            self.async_set_notification_light(
+                device_id,
+                channel_index,
+                simple_rgb_color_state=simple_rgb_color_state,
+                optical_signal_behaviour=optical_signal_behaviour,
+                dim_level=dim_level,
+            )
+        )
+
+    async def async_set_dimmer_level(
         self, device_id: str, channel_index: int, *, dim_level: float
     ) -> None:
         """Set dim level (0.0..1.0) on a DIMMER_CHANNEL.
@@ -2151,7 +2012,7 @@ class HCUController:
                 "channelIndex": int(channel_index),
                 "dimLevel": dim_level,
             }
-            _ = self._send_hmip_system_request(
+            _ = await self._send_hmip_system_request(
                 HmIPDeviceControlRequestPaths.setDimLevel,
                 body,
             )
@@ -2170,7 +2031,17 @@ class HCUController:
                 dim_level,
             )
 
-    def set_switch_state(self, device_id: str, channel_index: int, *, on: bool) -> None:
+    def set_dimmer_level(
+        self, device_id: str, channel_index: int, *, dim_level: float
+    ) -> None:
+        """Blocking wrapper around async_set_dimmer_level."""
+        self._run_threadsafe(
+            self.async_set_dimmer_level(device_id, channel_index, dim_level=dim_level)
+        )
+
+    async def async_set_switch_state(
+        self, device_id: str, channel_index: int, *, on: bool
+    ) -> None:
         """Set switch state on a SWITCH_CHANNEL via setSwitchState."""
         try:
             body: DeviceControlRequestBodies.SetSwitchState = {
@@ -2178,7 +2049,7 @@ class HCUController:
                 "channelIndex": int(channel_index),
                 "on": bool(on),
             }
-            _ = self._send_hmip_system_request(
+            _ = await self._send_hmip_system_request(
                 HmIPDeviceControlRequestPaths.setSwitchState,
                 body,
             )
@@ -2190,7 +2061,13 @@ class HCUController:
                 on,
             )
 
-    def set_hue_saturation_dim_level(
+    def set_switch_state(self, device_id: str, channel_index: int, *, on: bool) -> None:
+        """Blocking wrapper around async_set_switch_state."""
+        self._run_threadsafe(
+            self.async_set_switch_state(device_id, channel_index, on=on)
+        )
+
+    async def async_set_hue_saturation_dim_level(
         self,
         device_id: str,
         channel_index: int,
@@ -2217,7 +2094,7 @@ class HCUController:
                 ),  # type: ignore[arg-type]
                 "dimLevel": cast(int, float(max(0.0, min(1.0, dim_level)))),  # type: ignore[arg-type]
             }
-            _ = self._send_hmip_system_request(
+            _ = await self._send_hmip_system_request(
                 HmIPDeviceControlRequestPaths.setHueSaturationDimLevel,
                 body,
             )
@@ -2231,7 +2108,27 @@ class HCUController:
                 dim_level,
             )
 
-    def set_color_temperature_dim_level(
+    def set_hue_saturation_dim_level(
+        self,
+        device_id: str,
+        channel_index: int,
+        *,
+        hue: int,
+        saturation_level: float,
+        dim_level: float,
+    ) -> None:
+        """Blocking wrapper around async_set_hue_saturation_dim_level."""
+        self._run_threadsafe(
+            self.async_set_hue_saturation_dim_level(
+                device_id,
+                channel_index,
+                hue=hue,
+                saturation_level=saturation_level,
+                dim_level=dim_level,
+            )
+        )
+
+    async def async_set_color_temperature_dim_level(
         self,
         device_id: str,
         channel_index: int,
@@ -2247,7 +2144,7 @@ class HCUController:
                 "colorTemperature": int(color_temperature),
                 "dimLevel": cast(int, float(max(0.0, min(1.0, dim_level)))),  # type: ignore[arg-type]
             }
-            _ = self._send_hmip_system_request(
+            _ = await self._send_hmip_system_request(
                 HmIPDeviceControlRequestPaths.setColorTemperatureDimLevel,
                 body,
             )
@@ -2260,6 +2157,24 @@ class HCUController:
                 dim_level,
             )
 
+    def set_color_temperature_dim_level(
+        self,
+        device_id: str,
+        channel_index: int,
+        *,
+        color_temperature: int,
+        dim_level: float,
+    ) -> None:
+        """Blocking wrapper around async_set_color_temperature_dim_level."""
+        self._run_threadsafe(
+            self.async_set_color_temperature_dim_level(
+                device_id,
+                channel_index,
+                color_temperature=color_temperature,
+                dim_level=dim_level,
+            )
+        )
+
 
 # activation_key = "198345"
 ## init_data = init_hcu_plugin("192.168.178.165", activation_key)
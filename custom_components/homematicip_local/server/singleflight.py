@@ -0,0 +1,36 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+
+class SingleFlight(Generic[_K, _V]):
+    """Collapse concurrent calls for the same key into one in-flight call.
+
+    The first caller for a key starts the call; callers arriving while it is
+    running await the same result (or exception). A caller being cancelled
+    does not cancel the shared call. Must be used from one event loop.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[_K, asyncio.Future[_V]] = {}
+
+    def in_flight(self, key: _K) -> bool:
+        return key in self._calls
+
+    async def run(self, key: _K, fn: Callable[[], Awaitable[_V]]) -> _V:
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            call.add_done_callback(lambda f: self._done(key, f))
+        return await asyncio.shield(call)
+
+    def _done(self, key: _K, call: asyncio.Future[_V]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark the exception retrieved even if every caller went away
+        if not call.cancelled():
+            _ = call.exception()
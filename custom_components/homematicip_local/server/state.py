@@ -0,0 +1,651 @@
+from collections.abc import Callable, Iterable, Mapping, Set
+from typing import TypeAlias, TypedDict, cast
+
+from .types.hmip_system import Event, SystemState
+
+# Seconds of quiet before a burst of push events is published
+DEFAULT_COALESCE_WINDOW = 0.1
+# Upper bound on how long the first event of a burst may be held back
+DEFAULT_COALESCE_MAX_LATENCY = 0.5
+# Fields that change on nearly every push without being shown by any entity
+DEFAULT_IGNORED_FIELDS: frozenset[str] = frozenset({"lastStatusUpdate"})
+# A pushed device state more than this much (ms) older than the applied one
+# is not out of order but means the HCU clock was set back
+MAX_EVENT_REORDER_MS = 60_000
+
+_MISSING = object()
+
+# (device id, functional channel key)
+ChannelKey: TypeAlias = tuple[str, str]
+
+
+class StateChanges(TypedDict):
+    """What a state publication touched, handed to state listeners.
+
+    Keys:
+    - full: a state was installed with nothing to compare it to (first fetch);
+      treat everything as changed
+    - home: the home object changed
+    - devices: ids of added, changed or removed devices
+    - channels: (device id, functional channel key) pairs whose data changed
+    - device_fields: device id -> names of changed device level fields
+    - channel_fields: (device id, channel key) -> names of changed channel fields
+    - groups: ids of added, changed or removed groups
+    - clients: ids of added, changed or removed clients
+    """
+
+    full: bool
+    home: bool
+    devices: set[str]
+    channels: set[tuple[str, str]]
+    device_fields: dict[str, set[str]]
+    channel_fields: dict[tuple[str, str], set[str]]
+    groups: set[str]
+    clients: set[str]
+
+
+def empty_changes() -> StateChanges:
+    return {
+        "full": False,
+        "home": False,
+        "devices": set(),
+        "channels": set(),
+        "device_fields": {},
+        "channel_fields": {},
+        "groups": set(),
+        "clients": set(),
+    }
+
+
+def full_changes() -> StateChanges:
+    changes = empty_changes()
+    changes["full"] = True
+    return changes
+
+
+def has_changes(changes: StateChanges) -> bool:
+    return (
+        changes["full"]
+        or changes["home"]
+        or bool(changes["devices"])
+        or bool(changes["channels"])
+        or bool(changes["groups"])
+        or bool(changes["clients"])
+    )
+
+
+def merge_changes(into: StateChanges, other: StateChanges) -> StateChanges:
+    """Fold other into into (in place) and return it."""
+    into["full"] = into["full"] or other["full"]
+    into["home"] = into["home"] or other["home"]
+    into["devices"] |= other["devices"]
+    into["channels"] |= other["channels"]
+    for did, fields in other["device_fields"].items():
+        into["device_fields"].setdefault(did, set()).update(fields)
+    for key, fields in other["channel_fields"].items():
+        into["channel_fields"].setdefault(key, set()).update(fields)
+    into["groups"] |= other["groups"]
+    into["clients"] |= other["clients"]
+    return into
+
+
+def changed_fields(
+    old: Mapping[str, object], new: Mapping[str, object], ignored: Set[str]
+) -> set[str]:
+    """Names of top level fields that differ between old and new."""
+    return {
+        key
+        for key in old.keys() | new.keys()
+        if key not in ignored and old.get(key, _MISSING) != new.get(key, _MISSING)
+    }
+
+
+def _channels_of(
+    device: Mapping[str, object] | None,
+) -> dict[str, Mapping[str, object]]:
+    if device is None:
+        return {}
+    channels = device.get("functionalChannels")
+    if not isinstance(channels, dict):
+        return {}
+    return cast(dict[str, Mapping[str, object]], channels)
+
+
+def diff_device(
+    changes: StateChanges,
+    device_id: str,
+    old: Mapping[str, object] | None,
+    new: Mapping[str, object] | None,
+    ignored: Set[str],
+) -> None:
+    """Record what differs between the cached (old) and incoming (new) device.
+
+    Either side may be None for an added or removed device. A change of a
+    device level field marks every channel of the device, since entities show
+    device data (label, connection type) next to their channel data.
+    """
+    old_channels = _channels_of(old)
+    new_channels = _channels_of(new)
+    device_changed = changed_fields(
+        old or {}, new or {}, ignored | {"functionalChannels"}
+    )
+    channel_changed: dict[str, set[str]] = {}
+    for ch_key in old_channels.keys() | new_channels.keys():
+        fields = changed_fields(
+            old_channels.get(ch_key, {}), new_channels.get(ch_key, {}), ignored
+        )
+        if fields:
+            channel_changed[ch_key] = fields
+    if old is None or new is None:
+        # Added or removed; empty dicts on both sides still count
+        device_changed.add("id")
+    if not device_changed and not channel_changed:
+        return
+    changes["devices"].add(device_id)
+    if device_changed:
+        changes["device_fields"].setdefault(device_id, set()).update(device_changed)
+        for ch_key in old_channels.keys() | new_channels.keys():
+            changes["channels"].add((device_id, ch_key))
+    for ch_key, fields in channel_changed.items():
+        key = (device_id, ch_key)
+        changes["channels"].add(key)
+        changes["channel_fields"].setdefault(key, set()).update(fields)
+
+
+def changed_ids(
+    old: Mapping[str, object], new: Mapping[str, object], ignored: Set[str]
+) -> set[str]:
+    """Ids of added, removed or changed entries of an id -> object map."""
+    changed = old.keys() ^ new.keys()
+    for oid in old.keys() & new.keys():
+        before, after = old[oid], new[oid]
+        if before == after:
+            continue
+        if not isinstance(before, dict) or not isinstance(after, dict):
+            changed.add(oid)
+        elif changed_fields(
+            cast(Mapping[str, object], before),
+            cast(Mapping[str, object], after),
+            ignored,
+        ):
+            changed.add(oid)
+    return changed
+
+
+def state_stamp(state: SystemState) -> int | None:
+    """HCU time (ms) a fetched state is at least as new as.
+
+    The response carries no time of its own; the newest lastStatusUpdate of
+    its devices and groups is a lower bound, on the clock of the event
+    transaction timestamps. Any transaction older than it is already
+    reflected in the state.
+    """
+    newest: int | None = None
+    for section in ("devices", "groups"):
+        for entry in cast(Mapping[str, Mapping[str, object]], state[section]).values():
+            stamp = entry.get("lastStatusUpdate")
+            if isinstance(stamp, int) and (newest is None or stamp > newest):
+                newest = stamp
+    return newest
+
+
+def diff_states(old: SystemState, new: SystemState, ignored: Set[str]) -> StateChanges:
+    """What differs between two full states, as pushed events would report it."""
+    changes = empty_changes()
+    old_home = cast(Mapping[str, object], old.get("home") or {})
+    new_home = cast(Mapping[str, object], new.get("home") or {})
+    changes["home"] = old_home != new_home and bool(
+        changed_fields(old_home, new_home, ignored)
+    )
+    old_devices = cast(Mapping[str, object], old.get("devices") or {})
+    new_devices = cast(Mapping[str, object], new.get("devices") or {})
+    for did in old_devices.keys() | new_devices.keys():
+        before, after = old_devices.get(did), new_devices.get(did)
+        # Equal devices (almost all of them) cost one C level comparison
+        if before == after:
+            continue
+        diff_device(
+            changes,
+            did,
+            cast(Mapping[str, object], before) if isinstance(before, dict) else None,
+            cast(Mapping[str, object], after) if isinstance(after, dict) else None,
+            ignored,
+        )
+    changes["groups"] = changed_ids(
+        cast(Mapping[str, object], old.get("groups") or {}),
+        cast(Mapping[str, object], new.get("groups") or {}),
+        ignored,
+    )
+    changes["clients"] = changed_ids(
+        cast(Mapping[str, object], old.get("clients") or {}),
+        cast(Mapping[str, object], new.get("clients") or {}),
+        ignored,
+    )
+    return changes
+
+
+class StateSnapshot(TypedDict):
+    """An immutable, versioned view of the system state.
+
+    Keys:
+    - version: increases by one with every published snapshot
+    - state: the system state; never mutated once published
+
+    A merge copies only the top level maps it touches, so consecutive snapshots
+    share every device, group and client that did not change.
+    """
+
+    version: int
+    state: SystemState
+
+
+class StateStore:
+    """Cached SystemState plus secondary indexes kept in step with every merge.
+
+    Readers get the current snapshot by a single attribute read and never lock
+    or copy; the writer builds the next snapshot next to it and swaps it in.
+
+    Indexes:
+    - functionalChannelType -> {(device id, channel key)}
+    - group type -> {group id}
+    - device id -> {channel key: functionalChannelType}, the keys entities bind to
+    - rooms: META group labels, the META group of every other group and the
+      META groups listing each device, for O(1) area resolution
+
+    All methods must be called from the controller's event loop.
+    """
+
+    def __init__(
+        self,
+        ignored_fields: Iterable[str] = DEFAULT_IGNORED_FIELDS,
+        on_clock_reset: Callable[[], None] | None = None,
+    ) -> None:
+        self._snapshot: StateSnapshot | None = None
+        # Fields whose changes alone never count as a state change
+        self.ignored_fields: frozenset[str] = frozenset(ignored_fields)
+        self._channels_by_type: dict[str, set[ChannelKey]] = {}
+        self._groups_by_type: dict[str, set[str]] = {}
+        self._device_channels: dict[str, dict[str, str]] = {}
+        self._group_types: dict[str, str] = {}
+        # META group id -> room name (only non-empty labels)
+        self._meta_labels: dict[str, str] = {}
+        # Non-META group id -> its metaGroupId
+        self._parent_meta: dict[str, str] = {}
+        # Device id -> META group ids whose channels include the device
+        self._device_rooms: dict[str, dict[str, None]] = {}
+        # META group id -> device ids it lists, to undo _device_rooms entries
+        self._meta_devices: dict[str, set[str]] = {}
+        # HCU time (ms) of the installed state (state_stamp), and per device
+        # the transaction time of the newest pushed state applied since
+        self._state_stamp: int | None = None
+        self._device_stamps: dict[str, int] = {}
+        # DEVICE_CHANGED events dropped for being older than the applied state
+        self.stale_events: int = 0
+        # Called (once per installed state) when the HCU clock went back
+        self.on_clock_reset: Callable[[], None] | None = on_clock_reset
+        self._clock_reset_reported: bool = False
+        # Event batches applied while a fetch is in flight, replayed onto the
+        # fetched state by replace(); None when no fetch is in flight
+        self._fetch_log: list[tuple[list[Event], int | None]] | None = None
+
+    @property
+    def snapshot(self) -> StateSnapshot | None:
+        return self._snapshot
+
+    @property
+    def state(self) -> SystemState | None:
+        snapshot = self._snapshot
+        return snapshot["state"] if snapshot is not None else None
+
+    @property
+    def version(self) -> int:
+        snapshot = self._snapshot
+        return snapshot["version"] if snapshot is not None else 0
+
+    def _publish(self, state: SystemState) -> None:
+        # One reference assignment; readers see the old or the new snapshot
+        self._snapshot = {"version": self.version + 1, "state": state}
+
+    # ---- Index queries ---------------------------------------------------------------
+    def channels_of_type(self, *channel_types: str) -> set[ChannelKey]:
+        result: set[ChannelKey] = set()
+        for channel_type in channel_types:
+            result |= self._channels_by_type.get(channel_type, set())
+        return result
+
+    def devices_with_channel_type(self, *channel_types: str) -> set[str]:
+        return {did for did, _ in self.channels_of_type(*channel_types)}
+
+    def groups_of_type(self, *group_types: str) -> set[str]:
+        result: set[str] = set()
+        for group_type in group_types:
+            result |= self._groups_by_type.get(group_type, set())
+        return result
+
+    def device_channels(self, device_id: str) -> Mapping[str, str]:
+        """Channel key -> functionalChannelType for one device."""
+        return self._device_channels.get(device_id, {})
+
+    def channel_type(self, key: ChannelKey) -> str | None:
+        return self._device_channels.get(key[0], {}).get(key[1])
+
+    def group_type(self, group_id: str) -> str | None:
+        return self._group_types.get(group_id)
+
+    def room_of_group(self, group_id: str) -> str | None:
+        """Room of a META group, or of the META group a group belongs to."""
+        room = self._meta_labels.get(group_id)
+        if room is not None:
+            return room
+        parent = self._parent_meta.get(group_id)
+        return self._meta_labels.get(parent) if parent is not None else None
+
+    def room_of_device(self, device_id: str) -> str | None:
+        """Room of the first META group listing one of the device's channels."""
+        labels = self._meta_labels
+        rooms = [gid for gid in self._device_rooms.get(device_id, {}) if gid in labels]
+        if len(rooms) > 1 and self.state is not None:
+            # Rare: a device spread over rooms. "First" follows the groups order.
+            candidates = set(rooms)
+            rooms = [gid for gid in self.state["groups"] if gid in candidates]
+        return labels[rooms[0]] if rooms else None
+
+    def room_of_channel(
+        self, device_id: str, channel_key: str, *, device_fallback: bool = False
+    ) -> str | None:
+        """Room of a channel, resolved through the groups the channel is in.
+
+        With device_fallback, a channel without a room of its own gets the
+        room of its device.
+        """
+        state = self.state
+        device = state["devices"].get(device_id) if state is not None else None
+        if device is not None:
+            channel = device["functionalChannels"].get(channel_key)
+            for gid in (channel or {}).get("groups") or []:
+                room = self.room_of_group(gid)
+                if room is not None:
+                    return room
+        if device_fallback:
+            return self.room_of_device(device_id)
+        return None
+
+    # ---- Index maintenance -----------------------------------------------------------
+    def _index_device(
+        self, device_id: str, device: Mapping[str, object] | None
+    ) -> None:
+        for ch_key, ch_type in self._device_channels.pop(device_id, {}).items():
+            keys = self._channels_by_type.get(ch_type)
+            if keys is not None:
+                keys.discard((device_id, ch_key))
+                if not keys:
+                    del self._channels_by_type[ch_type]
+        if device is None:
+            return
+        channel_types: dict[str, str] = {}
+        for ch_key, channel in _channels_of(device).items():
+            ch_type = channel.get("functionalChannelType")
+            if isinstance(ch_type, str):
+                channel_types[ch_key] = ch_type
+                self._channels_by_type.setdefault(ch_type, set()).add(
+                    (device_id, ch_key)
+                )
+        self._device_channels[device_id] = channel_types
+
+    def _index_group(self, group_id: str, group: Mapping[str, object] | None) -> None:
+        old_type = self._group_types.pop(group_id, None)
+        if old_type is not None:
+            ids = self._groups_by_type.get(old_type)
+            if ids is not None:
+                ids.discard(group_id)
+                if not ids:
+                    del self._groups_by_type[old_type]
+        _ = self._meta_labels.pop(group_id, None)
+        _ = self._parent_meta.pop(group_id, None)
+        for did in self._meta_devices.pop(group_id, set()):
+            rooms = self._device_rooms.get(did)
+            if rooms is not None:
+                _ = rooms.pop(group_id, None)
+                if not rooms:
+                    del self._device_rooms[did]
+        if group is None:
+            return
+        group_type = group.get("type")
+        if isinstance(group_type, str):
+            self._group_types[group_id] = group_type
+            self._groups_by_type.setdefault(group_type, set()).add(group_id)
+        if group_type != "META":
+            parent = group.get("metaGroupId")
+            if isinstance(parent, str):
+                self._parent_meta[group_id] = parent
+            return
+        label = group.get("label")
+        if isinstance(label, str) and label.strip():
+            self._meta_labels[group_id] = label.strip()
+        members: set[str] = set()
+        channels = group.get("channels")
+        if not isinstance(channels, list):
+            channels = []
+        for member in cast(list[object], channels):
+            if isinstance(member, dict):
+                did = cast(dict[str, object], member).get("deviceId")
+                if isinstance(did, str):
+                    members.add(did)
+                    self._device_rooms.setdefault(did, {})[group_id] = None
+        self._meta_devices[group_id] = members
+
+    # ---- Writes ----------------------------------------------------------------------
+    def begin_fetch(self) -> StateChanges:
+        """Record the events applied from now on until replace().
+
+        Called before a getSystemState request is sent. Events pushed while
+        it is in flight are merged into the old state first and would be
+        overwritten by the fetched one although they may be newer.
+        """
+        if self._fetch_log is None:
+            self._fetch_log = []
+        return empty_changes()
+
+    def cancel_fetch(self) -> StateChanges:
+        """Stop recording events after a failed fetch."""
+        self._fetch_log = None
+        return empty_changes()
+
+    def replace(self, state: SystemState, *, clock_reset: bool = False) -> StateChanges:
+        """Install a freshly fetched state and rebuild every index.
+
+        Events recorded since begin_fetch() are applied again on top of it;
+        those older than the state (state_stamp) are dropped as stale. With
+        clock_reset (the HCU clock went back) timestamps from before the
+        fetch are meaningless and the state is not stamped.
+
+        Returns what differs from the previous state, so a resync only touches
+        what actually changed; full_changes() when there was none.
+        """
+        previous = self.state
+        self._channels_by_type.clear()
+        self._groups_by_type.clear()
+        self._device_channels.clear()
+        self._group_types.clear()
+        self._meta_labels.clear()
+        self._parent_meta.clear()
+        self._device_rooms.clear()
+        self._meta_devices.clear()
+        self._device_stamps.clear()
+        self._state_stamp = None if clock_reset else state_stamp(state)
+        self._clock_reset_reported = False
+        for did, device in state["devices"].items():
+            self._index_device(did, cast(Mapping[str, object], device))
+        for gid, group in state["groups"].items():
+            self._index_group(gid, cast(Mapping[str, object], group))
+        self._publish(state)
+        fetch_log, self._fetch_log = self._fetch_log, None
+        for batch, timestamp in fetch_log or ():
+            _ = self.apply_events(batch, timestamp)
+        if previous is None:
+            return full_changes()
+        return diff_states(previous, cast(SystemState, self.state), self.ignored_fields)
+
+    def _is_stale(self, did: str, device: Mapping[str, object], ts: int | None) -> bool:
+        """Whether a pushed device state is older than the one already applied.
+
+        Pushed states are stamped with their transaction timestamp (the
+        device's lastStatusUpdate without one) and compared with the newest
+        pushed state applied to the device or, before any, with the stamp of
+        the installed state. A state that is not stale advances the stamp.
+        Far older states are dropped as well but mean the HCU clock went
+        back, which is reported through on_clock_reset.
+        """
+        stamp = ts if ts is not None else device.get("lastStatusUpdate")
+        if not isinstance(stamp, int):
+            return False
+        applied = self._device_stamps.get(did, self._state_stamp)
+        if applied is None or stamp >= applied:
+            self._device_stamps[did] = stamp
+            return False
+        if applied - stamp > MAX_EVENT_REORDER_MS and not self._clock_reset_reported:
+            self._clock_reset_reported = True
+            if self.on_clock_reset is not None:
+                self.on_clock_reset()
+        return True
+
+    def apply_events(
+        self, events: Iterable[Event], timestamp: int | None = None
+    ) -> StateChanges:
+        """Merge pushed events into the cached state; return what changed.
+
+        timestamp is the eventTransaction's; device states older than the
+        ones already applied (events racing a fetch or each other around a
+        reconnect) are dropped and counted in stale_events. A batch that
+        writes nothing (only stale or repeated entries) publishes no new
+        snapshot.
+        """
+        batch = events if isinstance(events, list) else list(events)
+        if self._fetch_log is not None:
+            self._fetch_log.append((batch, timestamp))
+        events = batch
+        changes = empty_changes()
+        base = self.state
+        if base is None:
+            return changes
+        ignored = self.ignored_fields
+        # Copy-on-write: the published state is left alone, maps are copied
+        # (shallowly, sharing unchanged entries) the first time they are written
+        state = cast(SystemState, dict(base))
+        copied: set[str] = set()
+        # Whether any entry was written; if not, nothing is published
+        written = False
+
+        def _get_map(key: str) -> dict[str, object]:
+            if key not in copied:
+                cur = state.get(key)
+                if isinstance(cur, dict):
+                    state[key] = dict(cast(dict[str, object], cur))
+                else:
+                    state[key] = {}
+                copied.add(key)
+            return cast(dict[str, object], state[key])
+
+        def _current(key: str) -> dict[str, object]:
+            """The map as it is now, without copying it."""
+            cur = state.get(key)
+            return cast(dict[str, object], cur) if isinstance(cur, dict) else {}
+
+        def _put(key: str, oid: str, obj: dict[str, object]) -> bool:
+            """Store obj, returning whether it differs from the cached one."""
+            nonlocal written
+            old = _current(key).get(oid)
+            if old == obj:
+                return False
+            _get_map(key)[oid] = obj
+            written = True
+            if not isinstance(old, dict):
+                return True
+            return bool(changed_fields(cast(dict[str, object], old), obj, ignored))
+
+        def _pop(key: str, oid: str) -> object | None:
+            """Remove an entry, returning it (None if there was none)."""
+            nonlocal written
+            if oid not in _current(key):
+                return None
+            written = True
+            return _get_map(key).pop(oid)
+
+        for ev_map in events:
+            if ev_map["pushEventType"] == "HOME_CHANGED":
+                old_home = cast(dict[str, object], state.get("home") or {})
+                if old_home == ev_map["home"]:
+                    continue
+                state["home"] = ev_map["home"]
+                written = True
+                if changed_fields(
+                    old_home, cast(dict[str, object], ev_map["home"]), ignored
+                ):
+                    changes["home"] = True
+            elif ev_map["pushEventType"] in ("DEVICE_ADDED", "DEVICE_CHANGED"):
+                dev = ev_map.get("device")
+                if isinstance(dev, dict):
+                    dev_d = cast(dict[str, object], dev)
+                    did_obj = dev_d.get("id")
+                    did = did_obj if isinstance(did_obj, str) else None
+                    if did and self._is_stale(did, dev_d, timestamp):
+                        self.stale_events += 1
+                    elif did and _current("devices").get(did) != dev_d:
+                        old = _current("devices").get(did)
+                        _get_map("devices")[did] = dev
+                        written = True
+                        self._index_device(did, dev_d)
+                        diff_device(
+                            changes,
+                            did,
+                            (
+                                cast(dict[str, object], old)
+                                if isinstance(old, dict)
+                                else None
+                            ),
+                            dev_d,
+                            ignored,
+                        )
+            elif ev_map["pushEventType"] == "DEVICE_REMOVED":
+                did_obj = ev_map["id"]
+                old = _pop("devices", did_obj)
+                self._index_device(did_obj, None)
+                # Older states of the removed device must not bring it back
+                if timestamp is not None:
+                    self._device_stamps[did_obj] = timestamp
+                else:
+                    _ = self._device_stamps.pop(did_obj, None)
+                if isinstance(old, dict):
+                    diff_device(
+                        changes, did_obj, cast(dict[str, object], old), None, ignored
+                    )
+            elif ev_map["pushEventType"] in ("GROUP_ADDED", "GROUP_CHANGED"):
+                grp = ev_map.get("group")
+                if isinstance(grp, dict):
+                    grp_d = cast(dict[str, object], grp)
+                    gid_obj = grp_d.get("id")
+                    gid = gid_obj if isinstance(gid_obj, str) else None
+                    if gid:
+                        self._index_group(gid, grp_d)
+                        if _put("groups", gid, grp_d):
+                            changes["groups"].add(gid)
+            elif ev_map["pushEventType"] == "GROUP_REMOVED":
+                gid = ev_map.get("id")
+                if gid:
+                    self._index_group(gid, None)
+                    if _pop("groups", gid) is not None:
+                        changes["groups"].add(gid)
+            elif ev_map["pushEventType"] in ("CLIENT_ADDED", "CLIENT_CHANGED"):
+                cli = ev_map.get("client")
+                if isinstance(cli, dict):
+                    cid_obj = cast(dict[str, object], cli).get("id")
+                    cid = cid_obj if isinstance(cid_obj, str) else None
+                    if cid and _put("clients", cid, cast(dict[str, object], cli)):
+                        changes["clients"].add(cid)
+            elif ev_map["pushEventType"] == "CLIENT_REMOVED":
+                cid = ev_map.get("id")
+                if cid and _pop("clients", cid) is not None:
+                    changes["clients"].add(cid)
+        if written:
+            self._publish(state)
+        return changes
@@ -0,0 +1,108 @@
+from collections.abc import Callable
+import logging
+import queue
+import threading
+from typing import TypeAlias
+
+from .validator import ValidationPolicy, compile_validator
+
+DEFAULT_VALIDATION_QUEUE_SIZE = 256
+
+# Called on the worker thread with the label and the issues found
+IssueHandler: TypeAlias = Callable[[str, list[str], object], None]
+# label, annotation, message, issue handler; None stops the worker
+_Job: TypeAlias = tuple[str, object, object, IssueHandler] | None
+
+
+class ValidationWorker:
+    """Validates already parsed messages on a background thread.
+
+    The receive path only hands over a reference; schema validation, and the
+    policy decision whether a message is validated at all, happen on the
+    worker so merging and notifying never wait for them. The queue is
+    bounded: when validation cannot keep up, new messages are dropped instead
+    of piling up. Messages must not be mutated after submitting (state
+    updates are copy-on-write, so parsed messages never are).
+    """
+
+    def __init__(
+        self,
+        policy: ValidationPolicy,
+        *,
+        maxsize: int = DEFAULT_VALIDATION_QUEUE_SIZE,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.policy: ValidationPolicy = policy
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self._queue: queue.Queue[_Job] = queue.Queue(maxsize)
+        self._thread: threading.Thread | None = None
+        self.submitted: int = 0
+        self.dropped: int = 0
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="hcu-validation", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the worker; messages still queued are not validated."""
+        thread = self._thread
+        self._thread = None
+        if thread is None:
+            return
+        while True:
+            try:
+                _ = self._queue.get_nowait()
+            except queue.Empty:
+                break
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:  # pragma: no cover - refilled concurrently
+            pass
+        thread.join(timeout)
+
+    def submit(
+        self, label: str, spec: object, message: object, on_issues: IssueHandler
+    ) -> bool:
+        """Queue message for validation against spec; False if dropped."""
+        if self._thread is None:
+            return False
+        try:
+            self._queue.put_nowait((label, spec, message, on_issues))
+        except queue.Full:
+            self.dropped += 1
+            # Powers of two: visible under sustained load without flooding
+            if self.dropped & (self.dropped - 1) == 0:
+                log_fn = self.logger.warning if self.dropped == 1 else self.logger.debug
+                log_fn(
+                    "Validation queue full, %d message(s) not validated so far",
+                    self.dropped,
+                )
+            return False
+        self.submitted += 1
+        return True
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            label, spec, message, on_issues = job
+            try:
+                if not self.policy.should_validate(label, message):
+                    continue
+                issues: list[str] = []
+                compile_validator(spec)(message, "body", issues)
+                if issues:
+                    on_issues(label, issues, message)
+            except Exception:
+                self.logger.exception("Validating %s failed", label)
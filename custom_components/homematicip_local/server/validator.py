@@ -0,0 +1,889 @@
+"""Compiled runtime validators for the HCU TypedDict schemas.
+
+compile_validator turns an annotation (a TypedDict such as Device, a union,
+list[...], dict[...], Literal[...], a plain class) into a specialised closure
+once and caches it by type. Validating a value afterwards only does dict
+lookups and isinstance checks; the typing introspection (__annotations__,
+get_origin/get_args, Optional unwrapping, discriminator literals) happens at
+compile time.
+
+ValidationPolicy decides which messages are worth validating at all.
+"""
+
+from collections.abc import Callable, Mapping
+import enum
+import threading
+import types
+from typing import Any, Literal, TypeAlias, Union, cast, get_args, get_origin
+
+from .state import changed_ids
+
+# A compiled validator: (value, path, issues) -> None, appending issue strings
+Validator: TypeAlias = Callable[[object, str, list[str]], None]
+
+# Keys whose Literal annotation identifies a TypedDict variant inside a union
+DISCRIMINATOR_KEYS: tuple[str, ...] = (
+    "type",
+    "pushEventType",
+    "functionalChannelType",
+    "channelRole",
+)
+# dict[...] values are sampled: only the first entries are validated
+MAX_DICT_ITEMS = 50
+# Variants described when a dict matches none of a union's TypedDicts
+_MAX_DIAGNOSTIC_VARIANTS = 12
+
+_NONE_TYPE = type(None)
+# Finished validators, read without locking
+_compiled: dict[object, Validator] = {}
+# Compilation happens under this lock (reentrant: compiling recurses). The
+# validators of one compile_validator call, forwarders of self-referencing
+# TypedDicts included, stay in _pending until all of them are complete, so
+# other threads never get a half-built one.
+_compile_lock = threading.RLock()
+_pending: dict[object, Validator] = {}
+_compile_depth = 0
+
+
+def _is_typed_dict(tp: object) -> bool:
+    if not isinstance(tp, type):
+        return False
+    if not hasattr(tp, "__annotations__"):
+        return False
+    return hasattr(tp, "__total__") or hasattr(tp, "__required_keys__")
+
+
+def _is_union(tp: object) -> bool:
+    origin = get_origin(tp)
+    return origin is Union or origin is types.UnionType
+
+
+def _unwrap_optional(tp: object) -> object:
+    if _is_union(tp):
+        non_none = tuple(a for a in get_args(tp) if a is not _NONE_TYPE)
+        if len(non_none) == 1:
+            return non_none[0]
+    return tp
+
+
+def _is_any(tp: object) -> bool:
+    return tp is Any or getattr(tp, "__origin__", None) is Any
+
+
+def _allows_none(tp: object) -> bool:
+    if tp is None or tp is _NONE_TYPE:
+        return True
+    return _is_union(tp) and any(a is _NONE_TYPE for a in get_args(tp))
+
+
+def _type_name(tp: object) -> str:
+    return getattr(tp, "__name__", repr(tp))
+
+
+def quick_match(tp: object, value: object) -> bool:
+    """Fast, shallow compatibility check used during Union / overload filtering.
+
+    Only the top level is looked at: a TypedDict matches any dict, a list[X]
+    any list. Unexpected annotation forms match.
+    """
+    try:
+        if _is_any(tp) or tp is object:
+            return True
+        base = _unwrap_optional(tp)
+        origin = get_origin(base)
+        if origin is Literal:
+            return value in get_args(base)
+        if _is_typed_dict(base):
+            return isinstance(value, dict)
+        if _is_union(base):
+            return any(quick_match(a, value) for a in get_args(base))
+        if origin in (list, tuple, set):
+            return isinstance(value, origin)
+        if origin is dict:
+            return isinstance(value, dict)
+        if base is None:
+            return value is None
+        try:
+            return isinstance(value, cast(type, base))
+        except TypeError:
+            return False
+    except Exception:
+        return True  # Be permissive on unexpected forms
+
+
+def compile_validator(tp: object) -> Validator:
+    """Return the (cached) validator for annotation tp."""
+    try:
+        cached = _compiled.get(tp)
+    except TypeError:  # unhashable annotation; compile without caching
+        with _compile_lock:
+            return _compile(tp)
+    if cached is not None:
+        return cached
+    with _compile_lock:
+        return _compile_locked(tp)
+
+
+def _compile_locked(tp: object) -> Validator:
+    global _compile_depth
+    validator = _compiled.get(tp) or _pending.get(tp)
+    if validator is not None:
+        return validator
+    _compile_depth += 1
+    published = False
+    try:
+        validator = _pending[tp] = _compile(tp)
+        published = True
+    finally:
+        _compile_depth -= 1
+        if _compile_depth == 0:
+            if published:
+                _compiled.update(_pending)
+            _pending.clear()
+    return validator
+
+
+def validate(tp: object, value: object, path: str, issues: list[str]) -> None:
+    """Validate value against annotation tp, appending issues."""
+    compile_validator(tp)(value, path, issues)
+
+
+def _accept(value: object, path: str, issues: list[str]) -> None:
+    return
+
+
+def _compile(tp: object) -> Validator:
+    if _is_any(tp) or tp is object:
+        return _accept
+    none_ok = _allows_none(tp)
+    base = _unwrap_optional(tp)
+    if base is not tp and get_origin(base) is Literal:
+        # Optional[Literal[...]] is not enforced
+        return _accept
+    inner = _compile_base(base)
+    if not none_ok or inner is _accept:
+        return inner
+
+    def check_optional(value: object, path: str, issues: list[str]) -> None:
+        if value is not None:
+            inner(value, path, issues)
+
+    return check_optional
+
+
+def _compile_base(base: object) -> Validator:
+    origin = get_origin(base)
+    if not (
+        isinstance(base, type)
+        or _is_typed_dict(base)
+        or _is_union(base)
+        or origin is not None
+        or base is None
+    ):
+        # Forward references, TypeVars, ...: cannot be checked at runtime
+        return _accept
+    if origin is Literal:
+        return _compile_literal(base)
+    if _is_typed_dict(base):
+        return _compile_typed_dict(base)
+    if _is_union(base):
+        return _compile_union(base)
+    if origin is not None:
+        return _compile_generic(origin, get_args(base))
+    if base is None:
+        return _check_none
+    assert isinstance(base, type)
+    return _compile_class(base)
+
+
+def _check_none(value: object, path: str, issues: list[str]) -> None:
+    if value is not None:
+        issues.append(f"{path}: expected None, got {type(value).__name__}")
+
+
+def _compile_class(cls: type) -> Validator:
+    name = cls.__name__
+
+    def check_class(value: object, path: str, issues: list[str]) -> None:
+        if not isinstance(value, cls):
+            issues.append(f"{path}: expected {name}, got {type(value).__name__}")
+
+    return check_class
+
+
+def _compile_literal(tp: object) -> Validator:
+    args = get_args(tp)
+    try:
+        allowed: frozenset[object] | tuple[object, ...] = frozenset(args)
+    except TypeError:
+        allowed = args
+
+    def check_literal(value: object, path: str, issues: list[str]) -> None:
+        try:
+            ok = value in allowed
+        except TypeError:  # unhashable value
+            ok = False
+        if not ok:
+            issues.append(f"{path}: value {value!r} not in {args!r}")
+
+    return check_literal
+
+
+def _compile_generic(
+    origin: Any, args: tuple[object, ...]
+) -> Validator:  # pyright: ignore[reportExplicitAny, reportAny]
+    if origin in (list, tuple, set):
+        container: type = origin
+        name = container.__name__
+        if not args:
+            elem_validators: tuple[Validator, ...] = ()
+        elif container is tuple and len(args) != 2 and args[-1] is Ellipsis:
+            elem_validators = (compile_validator(args[0]),)
+        else:
+            elem_validators = tuple(compile_validator(a) for a in args)
+        if all(v is _accept for v in elem_validators):
+            elem_validators = ()
+        last = len(elem_validators) - 1
+
+        def check_sequence(value: object, path: str, issues: list[str]) -> None:
+            if not isinstance(value, container):
+                issues.append(f"{path}: expected {name}, got {type(value).__name__}")
+                return
+            if not elem_validators:
+                return
+            for i, elem in enumerate(
+                value
+            ):  # pyright: ignore[reportUnknownVariableType, reportUnknownArgumentType]
+                elem_validators[min(i, last)](elem, f"{path}[{i}]", issues)
+
+        return check_sequence
+    if origin is dict:
+        key_check: Validator | None = None
+        value_check: Validator | None = None
+        if len(args) == 2:
+            key_check = compile_validator(args[0])
+            value_check = compile_validator(args[1])
+
+        def check_dict(value: object, path: str, issues: list[str]) -> None:
+            if not isinstance(value, dict):
+                issues.append(f"{path}: expected dict, got {type(value).__name__}")
+                return
+            if key_check is None or value_check is None:
+                return
+            for i, (k, v) in enumerate(
+                value.items()
+            ):  # pyright: ignore[reportUnknownVariableType, reportUnknownArgumentType]
+                if i >= MAX_DICT_ITEMS:
+                    break
+                if key_check is not _accept:
+                    key_check(k, f"{path}.<key>", issues)
+                value_check(v, f"{path}[{k!r}]", issues)
+
+        return check_dict
+
+    def check_origin(value: object, path: str, issues: list[str]) -> None:
+        if not isinstance(value, origin):
+            issues.append(
+                f"{path}: expected {_type_name(origin)}, got {type(value).__name__}"
+            )
+
+    return check_origin
+
+
+# Per field: key, inline class check (or None), whether None is allowed for the
+# inline check, nested validator (when not inlined), whether it may be missing
+_Field: TypeAlias = tuple[str, type | None, bool, Validator | None, bool]
+
+
+def _compile_typed_dict(spec: type) -> Validator:
+    # Register a forwarder first so self-referencing schemas terminate
+    resolved: list[Validator] = []
+
+    def forward(value: object, path: str, issues: list[str]) -> None:
+        resolved[0](value, path, issues)
+
+    _pending[spec] = forward
+
+    name = spec.__name__
+    annotations: dict[str, object] = getattr(spec, "__annotations__", {})
+    keys = frozenset(annotations)
+    fields: list[_Field] = []
+    for key, tp in annotations.items():
+        optional = _allows_none(tp)
+        base = _unwrap_optional(tp)
+        if (
+            isinstance(base, type)
+            and get_origin(base) is None
+            and not _is_typed_dict(base)
+            and base is not object
+        ):
+            # Plain class: checked inline without a call
+            fields.append((key, base, optional, None, optional))
+        else:
+            sub = compile_validator(tp)
+            fields.append((key, None, False, None if sub is _accept else sub, optional))
+
+    def check_typed_dict(value: object, path: str, issues: list[str]) -> None:
+        if not isinstance(value, dict):
+            issues.append(
+                f"{path}: expected dict (TypedDict {name}), got {type(value).__name__}"
+            )
+            return
+        for key, cls, none_ok, sub, may_be_missing in fields:
+            if key not in value:
+                if not may_be_missing:
+                    issues.append(f"{path}.{key}: missing key")
+                continue
+            if cls is not None:
+                item = value[key]
+                if not isinstance(item, cls) and not (none_ok and item is None):
+                    issues.append(
+                        f"{path}.{key}: expected {cls.__name__}, got {type(item).__name__}"
+                    )
+            elif sub is not None:
+                sub(value[key], f"{path}.{key}", issues)
+        if len(value) > len(keys) or not keys.issuperset(
+            value
+        ):  # pyright: ignore[reportUnknownArgumentType]
+            extras = [
+                str(k) for k in value if k not in keys
+            ]  # pyright: ignore[reportUnknownVariableType]
+            if extras:
+                for extra in extras:
+                    issues.append(f"{path}.{extra}: unexpected key")
+                # Plus one summary per record listing all of them
+                issues.append(repr(f"{path}: unexpected key(s) {extras}"))
+
+    resolved.append(check_typed_dict)
+    return check_typed_dict
+
+
+class _Variant:
+    """Precomputed facts about one TypedDict member of a union."""
+
+    __slots__ = ("spec", "name", "keys", "literals", "soft", "validator")
+
+    def __init__(self, spec: type) -> None:
+        self.spec: type = spec
+        self.name: str = spec.__name__
+        annotations: dict[str, object] = getattr(spec, "__annotations__", {})
+        self.keys: frozenset[str] = frozenset(annotations)
+        # Discriminator key -> allowed literal values
+        self.literals: dict[str, frozenset[object]] = {}
+        # Discriminator key -> class of a non-literal discriminator (None: any)
+        self.soft: dict[str, type | None] = {}
+        for key in DISCRIMINATOR_KEYS:
+            if key not in annotations:
+                continue
+            tp = annotations[key]
+            if get_origin(tp) is Literal:
+                self.literals[key] = frozenset(get_args(tp))
+            else:
+                base = _unwrap_optional(tp)
+                self.soft[key] = base if isinstance(base, type) else None
+        self.validator: Validator = compile_validator(spec)
+
+    def literal_mismatch(self, value: dict[str, object]) -> bool:
+        for key, allowed in self.literals.items():
+            if key not in value:
+                return True
+            try:
+                if value[key] not in allowed:
+                    return True
+            except TypeError:
+                return True
+        return False
+
+    def literal_mismatch_present(self, value: dict[str, object]) -> bool:
+        """Whether a discriminator present in value contradicts a literal."""
+        for key, allowed in self.literals.items():
+            if key not in value:
+                continue
+            try:
+                if value[key] not in allowed:
+                    return True
+            except TypeError:
+                return True
+        return False
+
+    def score(self, value: dict[str, object]) -> float | None:
+        """Discriminator score of value for this variant; None when ruled out."""
+        score = 0.0
+        matched = False
+        for key in DISCRIMINATOR_KEYS:
+            if key not in value or key not in self.keys:
+                continue
+            allowed = self.literals.get(key)
+            if allowed is not None:
+                try:
+                    hit = value[key] in allowed
+                except TypeError:
+                    hit = False
+                if not hit:
+                    return None
+                score += 50
+                matched = True
+            else:
+                cls = self.soft[key]
+                if cls is not None and isinstance(value[key], cls):
+                    score += 5
+                    matched = True
+                else:
+                    score += 1
+        if not matched:
+            return None
+        present = len(self.keys.intersection(value))
+        missing = len(self.keys) - present
+        return score + present * 0.05 - missing * 0.02
+
+
+class _UnionVariants:
+    """The TypedDict members of one union plus their discriminator index."""
+
+    __slots__ = ("variants", "dispatch")
+
+    def __init__(self, tp: object) -> None:
+        self.variants: list[_Variant] = [
+            _Variant(a) for a in get_args(tp) if _is_typed_dict(a)
+        ]
+        # (discriminator key, literal value) -> the one variant declaring it.
+        # Literals shared by several variants are left out; values carrying
+        # them go through score().
+        owners: dict[tuple[str, object], list[_Variant]] = {}
+        for variant in self.variants:
+            for key, allowed in variant.literals.items():
+                for literal in allowed:
+                    owners.setdefault((key, literal), []).append(variant)
+        self.dispatch: dict[tuple[str, object], _Variant] = {
+            entry: found[0] for entry, found in owners.items() if len(found) == 1
+        }
+
+    def lookup(self, value: dict[str, object]) -> _Variant | None:
+        """Variant selected by a unique discriminator literal, if any."""
+        for key in DISCRIMINATOR_KEYS:
+            if key not in value:
+                continue
+            try:
+                variant = self.dispatch.get((key, value[key]))
+            except TypeError:  # unhashable discriminator value
+                continue
+            if variant is not None and not variant.literal_mismatch_present(value):
+                return variant
+        return None
+
+    def score(self, value: dict[str, object]) -> _Variant | None:
+        """Best variant by discriminator scoring (the pre-index selection)."""
+        best: _Variant | None = None
+        best_score = -10.0
+        for variant in self.variants:
+            score = variant.score(value)
+            if score is not None and score > best_score:
+                best_score = score
+                best = variant
+        return best
+
+    def pick(self, value: dict[str, object]) -> _Variant | None:
+        return self.lookup(value) or self.score(value)
+
+
+_unions: dict[object, _UnionVariants] = {}
+
+
+def _union_variants(tp: object) -> _UnionVariants:
+    union = _unions.get(tp)
+    if union is None:
+        with _compile_lock:
+            union = _unions.get(tp)
+            if union is None:
+                union = _unions[tp] = _UnionVariants(tp)
+    return union
+
+
+def select_variant(tp: object, value: dict[str, object]) -> type | None:
+    """The TypedDict of union tp that value would be validated against."""
+    variant = _union_variants(tp).pick(value)
+    return variant.spec if variant is not None else None
+
+
+def _compile_union(tp: object) -> Validator:
+    args = get_args(tp)
+    none_ok = any(a is _NONE_TYPE for a in args)
+    union = _union_variants(tp)
+    variants = union.variants
+    pick = union.pick
+    others = [(a, compile_validator(a)) for a in args if not _is_typed_dict(a)]
+    count = len(args)
+
+    def check_union(value: object, path: str, issues: list[str]) -> None:
+        if value is None and none_ok:
+            return
+        mapping = cast(dict[str, object], value) if isinstance(value, dict) else None
+        if mapping is not None and variants:
+            chosen = pick(mapping)
+            if chosen is not None:
+                chosen.validator(value, path, issues)
+                return
+        best: _Variant | None = None
+        best_missing = 10**9
+        if mapping is not None:
+            for variant in variants:
+                if variant.literal_mismatch(mapping):
+                    continue
+                trial: list[str] = []
+                variant.validator(value, path, trial)
+                missing = sum(1 for m in trial if m.endswith("missing key"))
+                if missing < best_missing:
+                    best_missing = missing
+                    best = variant
+                if missing == 0:
+                    issues.extend(trial)
+                    return
+        for _, validator in others:
+            other_issues: list[str] = []
+            validator(value, path, other_issues)
+            if not other_issues:
+                return
+        if mapping is not None:
+            issues.append(_describe_mismatch(path, count, variants, best, mapping))
+        else:
+            issues.append(
+                f"{path}: value {type(value).__name__} not compatible with any union variant ({count})"
+            )
+
+    return check_union
+
+
+def _describe_mismatch(
+    path: str,
+    count: int,
+    variants: list[_Variant],
+    best: _Variant | None,
+    value: dict[str, object],
+) -> str:
+    """Explain per variant why a dict matched none of a union's TypedDicts."""
+    diagnostics: list[str] = []
+    for shown, variant in enumerate(variants):
+        if shown >= _MAX_DIAGNOSTIC_VARIANTS:
+            diagnostics.append(f"... ({count - shown} more variants omitted)")
+            break
+        v_issues: list[str] = []
+        variant.validator(value, path, v_issues)
+        missing: list[str] = []
+        unexpected: list[str] = []
+        nested: list[str] = []
+        for msg in v_issues:
+            if msg.endswith("missing key"):
+                missing.append(msg.split(":", 1)[0].removeprefix(f"{path}."))
+            elif msg.endswith("unexpected key"):
+                unexpected.append(msg.split(":", 1)[0].removeprefix(f"{path}."))
+            else:
+                nested.append(msg)
+        literal_mismatches: list[str] = []
+        for key, allowed in variant.literals.items():
+            if key not in value:
+                literal_mismatches.append(
+                    f"{key}=<missing> expected one of {sorted(allowed, key=repr)!r}"
+                )
+            elif value[key] not in allowed:
+                literal_mismatches.append(
+                    f"{key}={value[key]!r} not in {sorted(allowed, key=repr)!r}"
+                )
+        parts: list[str] = []
+        if missing:
+            parts.append(f"missing={missing}")
+        if unexpected:
+            parts.append(f"unexpected={unexpected}")
+        if literal_mismatches:
+            parts.append(f"literal={literal_mismatches}")
+        if nested and len(nested) < 4:
+            parts.append(f"nested={nested}")
+        elif nested:
+            parts.append(f"nestedIssues={len(nested)}")
+        if not parts:
+            parts.append("(no direct key issues – likely nested mismatch)")
+        diagnostics.append(f"{variant.name} -> " + ", ".join(parts))
+    if best is not None:
+        best_prefix = best.name + " ->"
+        diagnostics.sort(key=lambda d: 0 if d.startswith(best_prefix) else 1)
+    return (
+        f"{path}: dict not compatible with any of {count} union variants. Details: "
+        + " | ".join(diagnostics)
+    )
+
+
+# Validation policy modes
+VALIDATION_OFF = "off"
+VALIDATION_SAMPLED = "sampled"
+VALIDATION_FIRST_SHAPE = "first_shape"
+VALIDATION_STRICT = "strict"
+ValidationMode: TypeAlias = Literal["off", "sampled", "first_shape", "strict"]
+VALIDATION_MODES: tuple[ValidationMode, ...] = (
+    VALIDATION_OFF,
+    VALIDATION_SAMPLED,
+    VALIDATION_FIRST_SHAPE,
+    VALIDATION_STRICT,
+)
+DEFAULT_VALIDATION_MODE: ValidationMode = VALIDATION_FIRST_SHAPE
+DEFAULT_SAMPLE_RATE = 100
+# Remembered shapes per policy; the set is reset when it grows beyond this
+MAX_SEEN_SHAPES = 4096
+
+
+_CONTAINERS = (dict, list, tuple)
+
+
+def shape_fingerprint(value: object) -> int:
+    """Cheap structural fingerprint built from key sets.
+
+    Records contribute their key set and discriminator values, maps whose
+    values are all dicts (devices by id, channels by index, events) the set
+    of all their children's shapes, so the ids themselves do not matter but
+    drift in any entry changes the fingerprint. Scalar values are ignored
+    apart from enum members.
+    """
+    kind = type(value)
+    if kind is dict:
+        mapping = cast(dict[object, object], value)
+        nested = [(k, v) for k, v in mapping.items() if type(v) in _CONTAINERS]
+        if nested and len(nested) == len(mapping):
+            if all(type(v) is dict for _, v in nested):
+                return hash(frozenset([shape_fingerprint(v) for _, v in nested]))
+        discriminators = [mapping[k] for k in DISCRIMINATOR_KEYS if k in mapping]
+        shape = (
+            frozenset(mapping),
+            tuple([(k, shape_fingerprint(v)) for k, v in nested]),
+        )
+        try:
+            return hash((shape, tuple(discriminators)))
+        except TypeError:  # unhashable discriminator value
+            return hash(shape)
+    if kind is list or kind is tuple:
+        return hash(
+            frozenset(
+                [
+                    shape_fingerprint(v)
+                    for v in cast(list[object], value)
+                    if type(v) in _CONTAINERS or isinstance(v, enum.Enum)
+                ]
+            )
+        )
+    if isinstance(value, enum.Enum):
+        return hash(value)
+    return 0
+
+
+class ValidationPolicy:
+    """Decides which messages get validated against their schema.
+
+    off: never. sampled: one in sample_rate messages per label. first_shape:
+    the first message of each structural shape per label (see
+    shape_fingerprint), so schema drift is still reported once while repeated
+    messages of a known shape cost a fingerprint only. strict: every message.
+    """
+
+    def __init__(
+        self,
+        mode: ValidationMode = DEFAULT_VALIDATION_MODE,
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+    ) -> None:
+        if mode not in VALIDATION_MODES:
+            raise ValueError(f"Unknown validation mode: {mode!r}")
+        if sample_rate < 1:
+            raise ValueError("sample_rate must be at least 1")
+        self.mode: ValidationMode = mode
+        self.sample_rate: int = sample_rate
+        self._counters: dict[str, int] = {}
+        self._seen_shapes: set[tuple[str, int]] = set()
+        self.validated: int = 0
+        self.skipped: int = 0
+        # Used from the validation worker and from the event loop
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def strict(self) -> bool:
+        return self.mode == VALIDATION_STRICT
+
+    def should_validate(self, label: str, value: object) -> bool:
+        """Whether value, a message of kind label, should be validated now."""
+        mode = self.mode
+        # Fingerprinting walks the message; only the bookkeeping is locked
+        fingerprint = shape_fingerprint(value) if mode == VALIDATION_FIRST_SHAPE else 0
+        with self._lock:
+            if mode == VALIDATION_STRICT:
+                decision = True
+            elif mode == VALIDATION_OFF:
+                decision = False
+            elif mode == VALIDATION_SAMPLED:
+                count = self._counters.get(label, 0)
+                self._counters[label] = count + 1
+                decision = count % self.sample_rate == 0
+            else:
+                key = (label, fingerprint)
+                decision = key not in self._seen_shapes
+                if decision:
+                    if len(self._seen_shapes) >= MAX_SEEN_SHAPES:
+                        self._seen_shapes.clear()
+                    self._seen_shapes.add(key)
+            if decision:
+                self.validated += 1
+            else:
+                self.skipped += 1
+        return decision
+
+    def forget_shapes(self) -> None:
+        """Validate every shape again, e.g. after a firmware update."""
+        with self._lock:
+            self._seen_shapes.clear()
+            self._counters.clear()
+
+
+class SystemStateValidator:
+    """Validates getSystemState bodies piece by piece.
+
+    home and clients are validated on every call; devices and groups one by
+    one, with the result cached per id together with the entry's firmware
+    version and shape fingerprint. On a re-fetch, entries equal to the
+    previous state's (previous_state(), the controller's cached state; found
+    with the StateStore's changed_ids) reuse their result. Changed ones are
+    validated when their structure is new, when they had issues last time or
+    when the policy is strict; otherwise a shape that validated cleanly under
+    a firmware version is not validated again, even for other ids.
+
+    Issues use the same paths as validating the whole SystemState, but every
+    device and group is covered instead of the first MAX_DICT_ITEMS.
+    """
+
+    # SystemState fields validated entry by entry
+    SECTIONS: tuple[str, ...] = ("devices", "groups")
+
+    def __init__(
+        self,
+        spec: type,
+        *,
+        previous_state: Callable[[], Mapping[str, object] | None] | None = None,
+        policy: ValidationPolicy | None = None,
+    ) -> None:
+        self.spec: type = spec
+        self.previous_state: Callable[[], Mapping[str, object] | None] | None = (
+            previous_state
+        )
+        self.policy: ValidationPolicy | None = policy
+        annotations: dict[str, object] = getattr(spec, "__annotations__", {})
+        self._entry_validators: dict[str, Validator] = {}
+        for section in self.SECTIONS:
+            args = get_args(annotations[section])
+            self._entry_validators[section] = compile_validator(args[1])
+        self._shell_validator: Validator = compile_validator(spec)
+        # (section, id) -> (firmware, shape, issues) of the last validated entry
+        self._entries: dict[tuple[str, str], tuple[object, int, list[str]]] = {}
+        # (section, firmware, shape) that validated without issues
+        self._clean_shapes: set[tuple[str, object, int]] = set()
+        self.validated: int = 0
+        self.reused: int = 0
+
+    def __call__(self, value: object, path: str, issues: list[str]) -> None:
+        if not isinstance(value, dict):
+            self._shell_validator(value, path, issues)
+            return
+        state = cast(dict[str, object], value)
+        # Everything but the per-entry sections, with the same messages
+        shell = {
+            k: ({} if k in self.SECTIONS and isinstance(v, dict) else v)
+            for k, v in state.items()
+        }
+        self._shell_validator(shell, path, issues)
+        previous = self.previous_state() if self.previous_state is not None else None
+        strict = self.policy is not None and self.policy.strict
+        for section in self.SECTIONS:
+            entries = state.get(section)
+            if isinstance(entries, dict):
+                before = previous.get(section) if previous is not None else None
+                # Without a previous state every entry counts as changed
+                changed = (
+                    changed_ids(
+                        cast(Mapping[str, object], before),
+                        cast(Mapping[str, object], entries),
+                        frozenset(),
+                    )
+                    if isinstance(before, dict)
+                    else None
+                )
+                self._validate_section(
+                    section,
+                    cast(dict[str, object], entries),
+                    changed,
+                    strict,
+                    f"{path}.{section}",
+                    issues,
+                )
+
+    def validate_response(self, value: object, path: str, issues: list[str]) -> None:
+        """Validator for a {code, body: SystemState} response."""
+        if not isinstance(value, dict) or "body" not in value:
+            issues.append(f"{path}: expected response with body")
+            return
+        response = cast(dict[str, object], value)
+        if "code" not in response:
+            issues.append(f"{path}.code: missing key")
+        elif not isinstance(response["code"], int):
+            issues.append(
+                f"{path}.code: expected int, got {type(response['code']).__name__}"
+            )
+        self(response["body"], f"{path}.body", issues)
+
+    def _validate_section(
+        self,
+        section: str,
+        entries: dict[str, object],
+        changed: set[str] | None,
+        strict: bool,
+        path: str,
+        issues: list[str],
+    ) -> None:
+        validator = self._entry_validators[section]
+        seen: set[tuple[str, str]] = set()
+        for entry_id, entry in entries.items():
+            key = (section, entry_id)
+            seen.add(key)
+            cached = self._entries.get(key)
+            if cached is not None and changed is not None and entry_id not in changed:
+                # Same content as the previous state: same result
+                issues.extend(cached[2])
+                self.reused += 1
+                continue
+            firmware = (
+                cast(dict[str, object], entry).get("firmwareVersion")
+                if isinstance(entry, dict)
+                else None
+            )
+            shape = shape_fingerprint(entry)
+            if not strict and (
+                (
+                    cached is not None
+                    and not cached[2]
+                    and cached[0] == firmware
+                    and cached[1] == shape
+                )
+                or (section, firmware, shape) in self._clean_shapes
+            ):
+                # Only values changed within an already clean shape
+                self._entries[key] = (firmware, shape, [])
+                self.reused += 1
+                continue
+            entry_issues: list[str] = []
+            validator(entry, f"{path}[{entry_id!r}]", entry_issues)
+            self.validated += 1
+            self._entries[key] = (firmware, shape, entry_issues)
+            if entry_issues:
+                issues.extend(entry_issues)
+            else:
+                if len(self._clean_shapes) >= MAX_SEEN_SHAPES:
+                    self._clean_shapes.clear()
+                self._clean_shapes.add((section, firmware, shape))
+        # Forget entries that are gone (removed devices, deleted groups)
+        for key in [k for k in self._entries if k[0] == section and k not in seen]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._clean_shapes.clear()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from functools import cached_property, partial
+from functools import cached_property
 from typing import TYPE_CHECKING, cast
 
 from homeassistant.components.switch import SwitchEntity
@@ -44,47 +44,21 @@ class _BaseHCUSwitch(SwitchEntity):
         """Public accessor for the underlying device id."""
         return self._device_id
 
+    @property
+    def hcu_channel_key(self) -> str:
+        """Public accessor for the functional channel key."""
+        return self._channel_key
+
     @property
     def hcu_suggested_area(self) -> str | None:
         """Public accessor for the suggested area name derived from META groups."""
         return self._suggested_area_name()
 
     def _suggested_area_name(self) -> str | None:
-        body = self._coordinator.data
-        device = body["devices"][self._device_id]
-        channels = device["functionalChannels"]
-        ch = channels[self._channel_key]
-        groups_list = ch["groups"]
-        groups_map = body["groups"]
-        # First pass: resolve room from channel-linked groups; follow metaGroupId when needed
-        if groups_list:
-            for gid in groups_list:
-                g = groups_map[gid]
-                if g["type"] == "META":
-                    label = g["label"]
-                    if label.strip():
-                        return label.strip()
-                else:
-                    mgi = g["metaGroupId"]
-                    if isinstance(mgi, str):
-                        mg = groups_map[mgi]
-                        if mg["type"] == "META":
-                            mlbl = mg["label"]
-                            if mlbl.strip():
-                                return mlbl.strip()
-
-        for gmeta in groups_map.values():
-            if gmeta["type"] != "META":
-                continue
-            chans2 = gmeta["channels"]
-            for chd in chans2:
-                did2 = chd["deviceId"]
-                if did2 == self._device_id:
-                    glbl2 = gmeta["label"]
-                    if glbl2.strip():
-                        return glbl2.strip()
-                    break
-        return None
+        store = self._coordinator.controller.state_store
+        return store.room_of_channel(
+            self._device_id, self._channel_key, device_fallback=True
+        )
 
     @override
     async def async_added_to_hass(self) -> None:
@@ -140,18 +114,16 @@ class HCUSwitchChannel(_BaseHCUSwitch):
     @override
     async def async_turn_on(self, **kwargs: object) -> None:
         ctrl = self._coordinator.controller
-        fn = partial(
-            ctrl.set_switch_state, self._device_id, int(self._channel_key), on=True
+        await ctrl.async_set_switch_state(
+            self._device_id, int(self._channel_key), on=True
         )
-        await self.hass.async_add_executor_job(fn)
 
     @override
     async def async_turn_off(self, **kwargs: object) -> None:
         ctrl = self._coordinator.controller
-        fn = partial(
-            ctrl.set_switch_state, self._device_id, int(self._channel_key), on=False
+        await ctrl.async_set_switch_state(
+            self._device_id, int(self._channel_key), on=False
         )
-        await self.hass.async_add_executor_job(fn)
 
 
 class HCUSwitchMeasuringChannel(_BaseHCUSwitch):
@@ -165,18 +137,16 @@ class HCUSwitchMeasuringChannel(_BaseHCUSwitch):
     @override
     async def async_turn_on(self, **kwargs: object) -> None:
         ctrl = self._coordinator.controller
-        fn = partial(
-            ctrl.set_switch_state, self._device_id, int(self._channel_key), on=True
+        await ctrl.async_set_switch_state(
+            self._device_id, int(self._channel_key), on=True
         )
-        await self.hass.async_add_executor_job(fn)
 
     @override
     async def async_turn_off(self, **kwargs: object) -> None:
         ctrl = self._coordinator.controller
-        fn = partial(
-            ctrl.set_switch_state, self._device_id, int(self._channel_key), on=False
+        await ctrl.async_set_switch_state(
+            self._device_id, int(self._channel_key), on=False
         )
-        await self.hass.async_add_executor_job(fn)
 
 
 async def async_setup_entry(
@@ -188,12 +158,22 @@ async def async_setup_entry(
 
     known: set[str] = set()
     all_entities: list[_BaseHCUSwitch] = []
+    by_channel: dict[tuple[str, str], list[_BaseHCUSwitch]] = {}
+
+    def _track(entities: list[_BaseHCUSwitch]) -> None:
+        all_entities.extend(entities)
+        for ent in entities:
+            key = (ent.hcu_device_id, ent.hcu_channel_key)
+            by_channel.setdefault(key, []).append(ent)
 
-    def _discover() -> list[SwitchEntity]:
-        body = coordinator.data
-        devices = body["devices"]
+    def _discover(full: bool = False) -> list[SwitchEntity]:
         new_entities: list[SwitchEntity] = []
-        for dev in devices.values():
+        for dev in coordinator.discovery_devices(
+            "SWITCH_CHANNEL",
+            "MULTI_MODE_INPUT_SWITCH_CHANNEL",
+            "SWITCH_MEASURING_CHANNEL",
+            full=full,
+        ):
             dev_id = dev["id"]
             label = dev["label"]
             channels = dev["functionalChannels"]
@@ -246,20 +226,24 @@ async def async_setup_entry(
 
         return new_entities
 
-    initial = _discover()
+    initial = _discover(full=True)
     if initial:
         async_add_entities(initial, True)
-        all_entities.extend(cast(list[_BaseHCUSwitch], initial))
+        _track(cast(list[_BaseHCUSwitch], initial))
 
     def _on_update() -> None:
         new = _discover()
         if new:
             async_add_entities(new)
-            all_entities.extend(cast(list[_BaseHCUSwitch], new))
+            _track(cast(list[_BaseHCUSwitch], new))
+        dirty = coordinator.dirty_channel_entities(by_channel, all_entities)
+        # Room membership lives in groups; only then can any entity's area move
+        changes = coordinator.last_changes
+        area_candidates = all_entities if changes["groups"] else dirty
         try:
             area_reg = ar.async_get(hass)
             dev_reg = dr.async_get(hass)
-            for ent in all_entities:
+            for ent in area_candidates:
                 if getattr(ent, "hass", None) is None:
                     continue
                 area_name = ent.hcu_suggested_area
@@ -275,7 +259,7 @@ async def async_setup_entry(
                     _ = dev_reg.async_update_device(device.id, area_id=area.id)
         except Exception:
             pass
-        for ent in all_entities:
+        for ent in dirty:
             if getattr(ent, "hass", None) is None:
                 continue
             for attr in ("is_on", "extra_state_attributes"):
@@ -0,0 +1,13 @@
+"""Make the integration's server package importable as `server`, like tools/.
+
+The repository root is on the path too, for tests importing the integration
+as `custom_components.homematicip_local` (they need Home Assistant).
+"""
+
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "custom_components" / "homematicip_local"))
+sys.path.insert(0, str(ROOT / "tools"))
+sys.path.append(str(ROOT))
@@ -0,0 +1,55 @@
+"""Event pipeline benchmark, checked against tools/bench_event_pipeline.json.
+
+Each size runs in its own process (tools/bench_event_pipeline.py --child), so
+peak RSS belongs to that size. With pytest-benchmark installed the run is
+recorded as a benchmark, with the pipeline's metrics in extra_info. A missing
+baseline fails the test: record one with --save-baseline.
+"""
+
+from typing import cast
+
+import pytest
+
+_ = pytest.importorskip("homeassistant")
+
+from bench_event_pipeline import (  # noqa: E402
+    DEFAULT_EVENTS,
+    DEFAULT_SIZES,
+    compare,
+    load_baseline,
+    run_isolated,
+)
+
+SEED = 1
+
+
+def measure(
+    request: pytest.FixtureRequest, devices: int, events: int
+) -> dict[str, float]:
+    if not request.config.pluginmanager.hasplugin("benchmark"):
+        return run_isolated(devices, events, SEED)
+    benchmark = request.getfixturevalue("benchmark")
+    result = benchmark.pedantic(
+        run_isolated, args=(devices, events, SEED), rounds=1, iterations=1
+    )
+    benchmark.extra_info.update(result)
+    return cast(dict[str, float], result)
+
+
+@pytest.mark.parametrize("devices", DEFAULT_SIZES)
+def test_event_pipeline(request: pytest.FixtureRequest, devices: int) -> None:
+    stored = load_baseline()
+    baseline = stored["results"].get(str(devices))
+    assert baseline is not None, f"the baseline has no results for {devices} devices"
+    events = int(baseline.get("events", DEFAULT_EVENTS))
+    result = measure(request, devices, events)
+
+    # Every DEVICE_CHANGED transaction reaches the coordinator's listeners and
+    # the platforms write only entities of the channels it touched
+    assert result["entities"] > 0
+    assert 0 < result["coordinator_updates_per_event"] <= 1
+    assert 0 < result["entity_writes_per_event"] < result["entities"]
+
+    regressions = "; ".join(compare(result, baseline))
+    machine = stored.get("platform")
+    assert not regressions, f"against the baseline measured on {machine}: {regressions}"
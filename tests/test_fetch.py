@@ -0,0 +1,46 @@
+"""A failed getSystemState ends the fetch: pushed events stop being recorded."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from server.server import HCUController
+from server.state import empty_changes
+
+
+def fetch_with_response(response: dict[str, Any]) -> HCUController:
+    async def run() -> HCUController:
+        controller = HCUController("127.0.0.1", "", "", "")
+        actor = controller._actor  # pyright: ignore[reportPrivateUsage]
+
+        async def send(*_args: object, **_kwargs: object) -> dict[str, Any]:
+            return response
+
+        setattr(controller, "_send_hmip_system_request", send)
+        actor.start()
+        try:
+            with pytest.raises(Exception):
+                _ = await controller.async_fetch_system_state()
+            # A no-op queued last completes once everything before it ran
+            barrier = actor.submit(lambda _store: empty_changes(), wait=True)
+            assert barrier is not None
+            _ = await barrier
+        finally:
+            await controller.async_stop()
+        return controller
+
+    return asyncio.run(run())
+
+
+def is_recording(controller: HCUController) -> bool:
+    store = controller.state_store
+    return store._fetch_log is not None  # pyright: ignore[reportPrivateUsage]
+
+
+def test_error_response_without_body_cancels_the_fetch() -> None:
+    assert not is_recording(fetch_with_response({"code": 500}))
+
+
+def test_failing_replace_cancels_the_fetch() -> None:
+    assert not is_recording(fetch_with_response({"code": 200, "body": {"devices": 1}}))
@@ -0,0 +1,114 @@
+"""Entry setup with a persisted SystemState: restored before connecting."""
+
+import asyncio
+import copy
+import importlib
+from types import SimpleNamespace
+from typing import Any, cast
+
+import pytest
+
+from server.server import HCUController
+from server.types.hmip_system import SystemState
+
+DEVICE = "3014F711A000000000000001"
+# Generous for a restore that only replaces the store; a hang fails the test
+TIMEOUT = 5.0
+
+
+def cached_state() -> SystemState:
+    return cast(
+        SystemState,
+        {
+            "home": {"id": "home"},
+            "groups": {},
+            "devices": {
+                DEVICE: {
+                    "id": DEVICE,
+                    "label": "Switch",
+                    "lastStatusUpdate": 1_000,
+                    "functionalChannels": {
+                        "1": {
+                            "functionalChannelType": "SWITCH_CHANNEL",
+                            "groups": [],
+                            "on": True,
+                        }
+                    },
+                }
+            },
+            "clients": {},
+        },
+    )
+
+
+def test_restore_state_before_start() -> None:
+    async def run() -> None:
+        controller = HCUController("127.0.0.1", "", "", "")
+        try:
+            await asyncio.wait_for(
+                controller.async_restore_state(cached_state()), TIMEOUT
+            )
+            assert controller.state_store.state == cached_state()
+        finally:
+            await controller.async_stop()
+
+    asyncio.run(run())
+
+
+class StubStore:
+    """homeassistant.helpers.storage.Store holding one cached state."""
+
+    def __init__(self, data: SystemState) -> None:
+        self.data: SystemState = data
+
+    async def async_load(self) -> SystemState:
+        return copy.deepcopy(self.data)
+
+    def async_delay_save(self, _data_func: Any, _delay: float) -> None:  # noqa: ANN401
+        pass
+
+
+def test_setup_entry_with_cached_state(monkeypatch: pytest.MonkeyPatch) -> None:
+    _ = pytest.importorskip("homeassistant")
+    integration = importlib.import_module("custom_components.homematicip_local")
+    monkeypatch.setattr(
+        integration, "_state_cache", lambda _hass, _entry: StubStore(cached_state())
+    )
+    # Let the controller own its session; nothing answers on the HCU address
+    monkeypatch.setattr(
+        integration, "async_get_clientsession", lambda _hass, verify_ssl: None
+    )
+
+    async def run() -> None:
+        forwarded: list[object] = []
+
+        async def forward_entry_setups(entry: object, platforms: object) -> None:
+            forwarded.append((entry, platforms))
+
+        hass = SimpleNamespace(
+            loop=asyncio.get_running_loop(),
+            data={},
+            config_entries=SimpleNamespace(
+                async_forward_entry_setups=forward_entry_setups
+            ),
+        )
+        entry = SimpleNamespace(
+            entry_id="cached",
+            data={"host": "127.0.0.1", "activation_key": "", "auth_token": ""},
+            options={},
+            async_on_unload=lambda _unsub: None,
+            add_update_listener=lambda _listener: lambda: None,
+        )
+        assert await asyncio.wait_for(
+            integration.async_setup_entry(hass, entry), TIMEOUT
+        )
+        stored = hass.data[integration.DOMAIN][entry.entry_id]
+        try:
+            assert forwarded
+            assert stored["coordinator"].data == cached_state()
+            assert stored["controller"].state_store.state == cached_state()
+        finally:
+            stored["coordinator"].close()
+            await stored["controller"].async_stop()
+
+    asyncio.run(run())
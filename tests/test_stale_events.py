@@ -0,0 +1,160 @@
+"""Stale pushed device states are dropped; events racing a fetch are not lost."""
+
+from typing import Any, cast
+
+from server.state import MAX_EVENT_REORDER_MS, StateStore
+from server.types.hmip_system import Event, SystemState
+
+DEVICE = "3014F711A000000000000001"
+OTHER = "3014F711A000000000000002"
+
+
+def device(did: str, on: bool, updated: int) -> dict[str, Any]:
+    return {
+        "id": did,
+        "label": did[-4:],
+        "lastStatusUpdate": updated,
+        "functionalChannels": {
+            "1": {"functionalChannelType": "SWITCH_CHANNEL", "groups": [], "on": on}
+        },
+    }
+
+
+def system_state(*devices: dict[str, Any]) -> SystemState:
+    return cast(
+        SystemState,
+        {
+            "home": {"id": "home"},
+            "groups": {},
+            "devices": {d["id"]: d for d in devices},
+            "clients": {},
+        },
+    )
+
+
+def changed(did: str, on: bool, updated: int) -> list[Event]:
+    return [
+        cast(
+            Event,
+            {"pushEventType": "DEVICE_CHANGED", "device": device(did, on, updated)},
+        )
+    ]
+
+
+def is_on(store: StateStore, did: str = DEVICE) -> bool:
+    state = store.state
+    assert state is not None
+    return cast(bool, state["devices"][did]["functionalChannels"]["1"]["on"])
+
+
+def test_out_of_order_push_is_dropped() -> None:
+    store = StateStore()
+    _ = store.replace(system_state(device(DEVICE, False, 1_000)))
+    _ = store.apply_events(changed(DEVICE, True, 3_000), 3_000)
+    changes = store.apply_events(changed(DEVICE, False, 2_000), 2_000)
+    assert is_on(store)
+    assert not changes["devices"]
+    assert store.stale_events == 1
+
+
+def test_push_older_than_fetched_state_is_dropped() -> None:
+    store = StateStore()
+    # The fetch reflects everything up to the newest lastStatusUpdate in it,
+    # also for devices that were last updated long before
+    _ = store.replace(
+        system_state(device(DEVICE, True, 1_000), device(OTHER, False, 5_000))
+    )
+    changes = store.apply_events(changed(DEVICE, False, 4_000), 4_000)
+    assert is_on(store)
+    assert not changes["devices"]
+    assert store.stale_events == 1
+    _ = store.apply_events(changed(DEVICE, False, 6_000), 6_000)
+    assert not is_on(store)
+
+
+def test_newer_event_racing_a_fetch_survives_the_response() -> None:
+    store = StateStore()
+    _ = store.replace(system_state(device(DEVICE, False, 1_000)))
+    store.begin_fetch()
+    # Pushed while getSystemState is in flight, after the HCU took its snapshot
+    _ = store.apply_events(changed(DEVICE, True, 6_000), 6_000)
+    changes = store.replace(
+        system_state(device(DEVICE, False, 1_000), device(OTHER, False, 5_000))
+    )
+    assert is_on(store)
+    assert store.stale_events == 0
+    # Compared with the state before the fetch: only the new device
+    assert changes["devices"] == {OTHER}
+
+
+def test_older_event_racing_a_fetch_loses_to_the_response() -> None:
+    store = StateStore()
+    _ = store.replace(system_state(device(DEVICE, False, 1_000)))
+    store.begin_fetch()
+    _ = store.apply_events(changed(DEVICE, True, 4_000), 4_000)
+    assert is_on(store)
+    changes = store.replace(
+        system_state(device(DEVICE, False, 1_000), device(OTHER, False, 5_000))
+    )
+    assert not is_on(store)
+    assert store.stale_events == 1
+    # The event had been published already; its entities go back
+    assert changes["devices"] == {DEVICE, OTHER}
+
+
+def test_cancelled_fetch_stops_recording() -> None:
+    store = StateStore()
+    _ = store.replace(system_state(device(DEVICE, False, 1_000)))
+    store.begin_fetch()
+    store.cancel_fetch()
+    _ = store.apply_events(changed(DEVICE, True, 2_000), 2_000)
+    _ = store.replace(system_state(device(DEVICE, False, 3_000)))
+    assert not is_on(store)
+    assert store.stale_events == 0
+
+
+def test_removed_device_is_not_revived_by_an_older_push() -> None:
+    store = StateStore()
+    _ = store.replace(system_state(device(DEVICE, False, 1_000)))
+    removed = cast(Event, {"pushEventType": "DEVICE_REMOVED", "id": DEVICE})
+    _ = store.apply_events([removed], 3_000)
+    _ = store.apply_events(changed(DEVICE, True, 2_000), 2_000)
+    state = store.state
+    assert state is not None and DEVICE not in state["devices"]
+
+
+def test_clock_reset_is_reported_and_cleared_by_an_unstamped_fetch() -> None:
+    resets: list[None] = []
+    store = StateStore(on_clock_reset=lambda: resets.append(None))
+    _ = store.replace(system_state(device(DEVICE, False, 10 * MAX_EVENT_REORDER_MS)))
+    old = MAX_EVENT_REORDER_MS
+    _ = store.apply_events(changed(DEVICE, True, old), old)
+    _ = store.apply_events(changed(DEVICE, True, old + 1), old + 1)
+    # Dropped rather than applied, and reported once
+    assert not is_on(store)
+    assert store.stale_events == 2
+    assert len(resets) == 1
+    _ = store.replace(
+        system_state(device(DEVICE, False, 10 * MAX_EVENT_REORDER_MS)),
+        clock_reset=True,
+    )
+    _ = store.apply_events(changed(DEVICE, True, old + 2), old + 2)
+    assert is_on(store)
+    assert len(resets) == 1
+
+
+def test_batch_writing_nothing_publishes_no_snapshot() -> None:
+    store = StateStore()
+    _ = store.replace(system_state(device(DEVICE, False, 1_000)))
+    _ = store.apply_events(changed(DEVICE, True, 3_000), 3_000)
+    snapshot = store.snapshot
+    # A stale state, the same state again and a removal of an unknown device
+    removed = cast(Event, {"pushEventType": "DEVICE_REMOVED", "id": OTHER})
+    for events, timestamp in (
+        (changed(DEVICE, False, 2_000), 2_000),
+        (changed(DEVICE, True, 3_000), 3_000),
+        ([removed], 4_000),
+    ):
+        changes = store.apply_events(events, timestamp)
+        assert not changes["devices"]
+        assert store.snapshot is snapshot
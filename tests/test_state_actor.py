@@ -0,0 +1,302 @@
+"""Concurrent merges through StateActor against a plain-dict reference model.
+
+Producer tasks, a producer thread (through call_soon_threadsafe) and a
+fetcher submit timestamped DEVICE/GROUP add, change and remove events, some
+out of order, mixed with getSystemState-like replacements that race them
+(begin_fetch ... replace), while readers walk the published snapshots. The
+result must equal ReferenceModel, a deliberately naive re-implementation of
+the merge rules applied to the same operations in order; the incremental
+indexes must equal those of a store rebuilt from the result.
+"""
+
+import asyncio
+import copy
+import random
+import threading
+from typing import Any, cast
+
+from server.actor import StateActor
+from server.state import StateChanges, StateStore, empty_changes
+from server.types.hmip_system import Event, SystemState
+
+CHANNEL_TYPES = ["SWITCH_CHANNEL", "DIMMER_CHANNEL", "SHUTTER_CONTACT_CHANNEL"]
+# Out-of-order pushes arrive at most this much (ms) late
+MAX_LATENESS = 200
+
+
+def make_device(did: str, rnd: random.Random, updated: int) -> dict[str, Any]:
+    channels: dict[str, Any] = {
+        "0": {"functionalChannelType": "DEVICE_BASE", "groups": [], "lowBat": False}
+    }
+    for idx in range(1, rnd.randint(1, 3) + 1):
+        channels[str(idx)] = {
+            "functionalChannelType": rnd.choice(CHANNEL_TYPES),
+            "groups": [],
+            "on": rnd.random() < 0.5,
+        }
+    return {
+        "id": did,
+        "label": did,
+        "lastStatusUpdate": updated,
+        "functionalChannels": channels,
+    }
+
+
+def make_group(gid: str, device_ids: list[str], rnd: random.Random) -> dict[str, Any]:
+    members = rnd.sample(device_ids, min(3, len(device_ids))) if device_ids else []
+    return {
+        "id": gid,
+        "type": rnd.choice(["META", "HEATING", "SWITCHING"]),
+        "label": f"Room {gid}",
+        "metaGroupId": None,
+        "channels": [{"deviceId": d, "channelIndex": 0} for d in members],
+    }
+
+
+def make_state(devices: int, rnd: random.Random, now: int) -> SystemState:
+    device_map = {
+        f"d{i}": make_device(f"d{i}", rnd, now - rnd.randrange(5_000))
+        for i in range(devices)
+    }
+    ids = list(device_map)
+    group_map = {
+        f"g{i}": make_group(f"g{i}", ids, rnd) for i in range(devices // 10 + 1)
+    }
+    return cast(
+        SystemState,
+        {
+            "home": {"id": "home"},
+            "devices": device_map,
+            "groups": group_map,
+            "clients": {},
+        },
+    )
+
+
+def random_event(rnd: random.Random, devices: int, now: int) -> Event:
+    roll = rnd.random()
+    did = f"d{rnd.randrange(devices * 2)}"
+    gid = f"g{rnd.randrange(devices // 5 + 2)}"
+    if roll < 0.55:
+        device = make_device(did, rnd, now)
+        return cast(Event, {"pushEventType": "DEVICE_CHANGED", "device": device})
+    if roll < 0.65:
+        device = make_device(did, rnd, now)
+        return cast(Event, {"pushEventType": "DEVICE_ADDED", "device": device})
+    if roll < 0.75:
+        return cast(Event, {"pushEventType": "DEVICE_REMOVED", "id": did})
+    if roll < 0.9:
+        group = make_group(gid, [f"d{rnd.randrange(devices)}"], rnd)
+        return cast(Event, {"pushEventType": "GROUP_CHANGED", "group": group})
+    return cast(Event, {"pushEventType": "GROUP_REMOVED", "id": gid})
+
+
+class ReferenceModel:
+    """The merge rules on plain dicts, without copy-on-write or indexes."""
+
+    def __init__(self) -> None:
+        self.state: dict[str, Any] | None = None
+        self.fetch_stamp: int | None = None
+        self.stamps: dict[str, int] = {}
+        self.fetch_log: list[tuple[list[Event], int | None]] | None = None
+
+    def begin_fetch(self) -> None:
+        if self.fetch_log is None:
+            self.fetch_log = []
+
+    def replace(self, state: SystemState) -> None:
+        self.state = copy.deepcopy(cast(dict[str, Any], state))
+        updates = [
+            entry["lastStatusUpdate"]
+            for section in ("devices", "groups")
+            for entry in self.state[section].values()
+            if isinstance(entry.get("lastStatusUpdate"), int)
+        ]
+        self.fetch_stamp = max(updates) if updates else None
+        self.stamps = {}
+        log, self.fetch_log = self.fetch_log, None
+        for batch, timestamp in log or []:
+            self.apply(batch, timestamp)
+
+    def apply(self, batch: list[Event], timestamp: int | None) -> None:
+        if self.fetch_log is not None:
+            self.fetch_log.append((batch, timestamp))
+        assert self.state is not None
+        for event in cast(list[dict[str, Any]], batch):
+            kind = event["pushEventType"]
+            if kind in ("DEVICE_ADDED", "DEVICE_CHANGED"):
+                device = event["device"]
+                did = device["id"]
+                stamp = (
+                    timestamp if timestamp is not None else device["lastStatusUpdate"]
+                )
+                applied = self.stamps.get(did, self.fetch_stamp)
+                if applied is not None and stamp < applied:
+                    continue
+                self.stamps[did] = stamp
+                self.state["devices"][did] = copy.deepcopy(device)
+            elif kind == "DEVICE_REMOVED":
+                self.state["devices"].pop(event["id"], None)
+                if timestamp is not None:
+                    self.stamps[event["id"]] = timestamp
+                else:
+                    self.stamps.pop(event["id"], None)
+            elif kind in ("GROUP_ADDED", "GROUP_CHANGED"):
+                self.state["groups"][event["group"]["id"]] = copy.deepcopy(
+                    event["group"]
+                )
+            elif kind == "GROUP_REMOVED":
+                self.state["groups"].pop(event["id"], None)
+
+
+def index_view(store: StateStore) -> tuple[object, ...]:
+    state = store.state
+    assert state is not None
+    types = {
+        ch["functionalChannelType"]
+        for dev in state["devices"].values()
+        for ch in dev["functionalChannels"].values()
+    }
+    return (
+        {t: store.channels_of_type(t) for t in sorted(types)},
+        {t: store.groups_of_type(t) for t in ("META", "HEATING", "SWITCHING")},
+        {did: dict(store.device_channels(did)) for did in state["devices"]},
+        {did: store.room_of_device(did) for did in state["devices"]},
+    )
+
+
+async def run_concurrently(
+    devices: int, events: int, producers: int, readers: int, seed: int
+) -> tuple[StateStore, list[tuple[str, object]], list[BaseException]]:
+    rnd = random.Random(seed)
+    loop = asyncio.get_running_loop()
+    store = StateStore()
+    published: list[StateChanges] = []
+    actor = StateActor(store, published.append)
+    actor.start()
+    # HCU clock (ms); every transaction advances it
+    clock = [1_000_000]
+
+    # Every operation in the order the actor consumes it (submission order)
+    applied: list[tuple[str, object]] = []
+
+    def submit_events(batch: list[Event], timestamp: int | None) -> None:
+        applied.append(("events", (copy.deepcopy(batch), timestamp)))
+        actor.submit_events(batch, timestamp)
+
+    def next_timestamp(prnd: random.Random) -> int | None:
+        clock[0] += prnd.randint(1, 20)
+        if prnd.random() < 0.05:
+            return None  # falls back to the devices' lastStatusUpdate
+        # Some transactions are delivered late, behind newer ones
+        late = prnd.randrange(MAX_LATENESS) if prnd.random() < 0.2 else 0
+        return clock[0] - late
+
+    def make_batch(prnd: random.Random) -> tuple[list[Event], int | None]:
+        timestamp = next_timestamp(prnd)
+        now = timestamp if timestamp is not None else clock[0]
+        batch = [random_event(prnd, devices, now) for _ in range(prnd.randint(1, 8))]
+        return batch, timestamp
+
+    initial = make_state(devices, rnd, clock[0])
+    applied.append(("replace", copy.deepcopy(initial)))
+    _ = await actor.replace(initial)
+
+    per_producer = events // (producers + 1)
+    producing = [producers + 1]
+    stop_readers = asyncio.Event()
+    errors: list[BaseException] = []
+
+    async def producer(pid: int) -> None:
+        prnd = random.Random(seed * 1000 + pid)
+        sent = 0
+        while sent < per_producer:
+            batch, timestamp = make_batch(prnd)
+            sent += len(batch)
+            submit_events(batch, timestamp)
+            if prnd.random() < 0.3:
+                await asyncio.sleep(0)
+        producing[0] -= 1
+
+    def thread_producer() -> None:
+        trnd = random.Random(seed * 1000 + producers)
+        sent = 0
+        while sent < per_producer:
+            batch, timestamp = make_batch(trnd)
+            sent += len(batch)
+            _ = loop.call_soon_threadsafe(submit_events, batch, timestamp)
+
+    async def fetcher() -> None:
+        # getSystemState round trips racing the pushes: the snapshot is taken
+        # somewhere in between, so in-flight events are older or newer
+        frnd = random.Random(seed * 1000 + producers + 1)
+        while producing[0] > 0:
+            applied.append(("begin_fetch", None))
+            actor.begin_fetch()
+            await asyncio.sleep(0)
+            snapshot = make_state(devices, frnd, clock[0])
+            for _ in range(frnd.randint(0, 3)):
+                await asyncio.sleep(0)
+            applied.append(("replace", copy.deepcopy(snapshot)))
+            _ = await actor.replace(snapshot)
+            await asyncio.sleep(0.001)
+
+    async def reader() -> None:
+        last = 0
+        try:
+            while not stop_readers.is_set():
+                snapshot = store.snapshot
+                assert snapshot is not None
+                assert snapshot["version"] >= last, "version went back"
+                last = snapshot["version"]
+                # Walk the whole snapshot; it must never change underneath us
+                before = copy.deepcopy(snapshot["state"]["devices"])
+                await asyncio.sleep(0)
+                assert snapshot["state"]["devices"] == before, "snapshot mutated"
+        except BaseException as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    reader_tasks = [asyncio.create_task(reader()) for _ in range(readers)]
+    fetch_task = asyncio.create_task(fetcher())
+    thread = threading.Thread(target=thread_producer)
+    thread.start()
+    await asyncio.gather(*(producer(i) for i in range(producers)))
+    await asyncio.to_thread(thread.join)
+    # Pushes from the thread are submitted once their callbacks ran
+    await asyncio.sleep(0)
+    producing[0] -= 1
+    await fetch_task
+    # A no-op queued last completes once everything before it was applied
+    barrier = actor.submit(lambda _store: empty_changes(), wait=True)
+    assert barrier is not None
+    _ = await barrier
+    stop_readers.set()
+    await asyncio.gather(*reader_tasks)
+    await actor.stop()
+    return store, applied, errors
+
+
+def test_concurrent_merges_match_reference_model() -> None:
+    store, applied, errors = asyncio.run(
+        run_concurrently(devices=150, events=6_000, producers=3, readers=3, seed=1)
+    )
+    assert not errors, errors[0]
+
+    reference = ReferenceModel()
+    for kind, payload in applied:
+        if kind == "replace":
+            reference.replace(cast(SystemState, payload))
+        elif kind == "begin_fetch":
+            reference.begin_fetch()
+        else:
+            batch, timestamp = cast(tuple[list[Event], int | None], payload)
+            reference.apply(batch, timestamp)
+
+    assert sum(1 for kind, _ in applied if kind == "replace") > 2
+    assert store.stale_events > 0
+    assert store.state == reference.state
+
+    rebuilt = StateStore()
+    assert store.state is not None
+    _ = rebuilt.replace(copy.deepcopy(store.state))
+    assert index_view(store) == index_view(rebuilt)
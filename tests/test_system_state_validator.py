@@ -0,0 +1,61 @@
+"""Per-entry getSystemState validation reuses results of unchanged entries."""
+
+import copy
+from typing import Any, cast
+
+from synthetic_state import make_system_state
+
+from server.types.hmip_system import SystemState
+from server.validator import SystemStateValidator, ValidationPolicy
+
+
+def fetch_twice(mode: str) -> tuple[SystemStateValidator, list[str]]:
+    """Validate a state, then a re-fetch where one device's int became a str."""
+    first = cast(dict[str, Any], make_system_state(20, 1))
+    previous: list[dict[str, Any] | None] = [None]
+    validator = SystemStateValidator(
+        SystemState,
+        previous_state=lambda: previous[0],
+        policy=ValidationPolicy(mode),  # pyright: ignore[reportArgumentType]
+    )
+    issues: list[str] = []
+    validator(first, "state", issues)
+    assert issues == []
+    previous[0] = first
+
+    second = copy.deepcopy(first)
+    device = next(iter(second["devices"].values()))
+    device["lastStatusUpdate"] = str(device["lastStatusUpdate"])
+    validator.validated = validator.reused = 0
+    validator(second, "state", issues)
+    return validator, issues
+
+
+def test_strict_validates_changed_entries_of_known_shapes() -> None:
+    validator, issues = fetch_twice("strict")
+    assert validator.validated == 1
+    assert len(issues) == 1 and "lastStatusUpdate" in issues[0]
+
+
+def test_first_shape_skips_changed_entries_of_known_shapes() -> None:
+    validator, issues = fetch_twice("first_shape")
+    assert validator.validated == 0
+    assert issues == []
+
+
+def test_unchanged_entries_reuse_their_issues() -> None:
+    state = cast(dict[str, Any], make_system_state(10, 2))
+    device = next(iter(state["devices"].values()))
+    device["newFirmwareField"] = 1
+    validator = SystemStateValidator(
+        SystemState, previous_state=lambda: state, policy=ValidationPolicy("strict")
+    )
+    first: list[str] = []
+    validator(state, "state", first)
+    assert first
+    validator.validated = validator.reused = 0
+    again: list[str] = []
+    validator(copy.deepcopy(state), "state", again)
+    assert again == first
+    assert validator.validated == 0
+    assert validator.reused == len(state["devices"]) + len(state["groups"])
@@ -0,0 +1,38 @@
+"""Compiled validators report exactly what the reflective checker reports."""
+
+import copy
+from typing import Any, cast
+
+from reflective_validator import runtime_type_check
+from synthetic_state import make_system_state
+
+from server.types.hmip_system import SystemState
+from server.validator import compile_validator
+
+
+def compiled(value: object) -> list[str]:
+    issues: list[str] = []
+    compile_validator(SystemState)(value, "state", issues)
+    return issues
+
+
+def test_clean_state_has_no_issues() -> None:
+    state = make_system_state(60, 1)
+    assert runtime_type_check(SystemState, state, "state") == []
+    assert compiled(state) == []
+
+
+def test_drifted_state_issue_parity() -> None:
+    drifted = cast(dict[str, Any], copy.deepcopy(make_system_state(60, 2)))
+    for i, device in enumerate(drifted["devices"].values()):
+        if i % 3 == 0:
+            device["newFirmwareField"] = 1
+        if i % 4 == 0:
+            _ = device.pop("label", None)
+        if i % 5 == 0:
+            device["lastStatusUpdate"] = str(device["lastStatusUpdate"])
+        if i % 7 == 0:
+            device["type"] = "NOT_A_DEVICE_TYPE"
+    issues = compiled(drifted)
+    assert issues
+    assert issues == runtime_type_check(SystemState, drifted, "state")
@@ -0,0 +1,369 @@
+"""Benchmark: pushed event merge and entity fan-out.
+
+Feeds synthetic DEVICE_CHANGED transactions (from HCUSimulator) through
+HCUController._handle_hmip_system_event for homes of 100, 1,000 and 5,000
+devices. The real HCUCoordinator publishes the merged state and every
+platform in PLATFORMS is set up on it against a stub hass, so the platforms'
+_on_update listeners pick their dirty entities through
+dirty_channel_entities / dirty_group_entities as they do in Home Assistant.
+Entity.async_write_ha_state is replaced by a counter.
+
+Per size it reports
+  - events/s for a burst of events submitted back to back,
+  - p50/p99 latency from the handler call until the coordinator's listeners
+    are done, and of the store merge alone, for events submitted one at a time,
+  - coordinator updates and async_write_ha_state calls per event,
+  - peak RSS of the process running that size.
+
+Results are compared with the stored baseline (bench_event_pipeline.json
+next to this script, with the Python version and machine it was measured
+on); --save-baseline replaces it. A missing baseline or size fails the run.
+Timings depend on the machine, so refresh the baseline when moving to
+another one. tests/test_bench_event_pipeline.py runs the same comparison,
+under pytest-benchmark when it is installed.
+
+Usage:
+    python tools/bench_event_pipeline.py [--sizes 100,1000,5000] [--events 5000]
+    python tools/bench_event_pipeline.py --save-baseline
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+from pathlib import Path
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, cast
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(ROOT))
+
+from hcu_simulator import HCUSimulator  # noqa: E402
+from homeassistant.helpers.entity import Entity  # noqa: E402
+
+from custom_components.homematicip_local import HCUCoordinator  # noqa: E402
+from custom_components.homematicip_local.const import DOMAIN, PLATFORMS  # noqa: E402
+from custom_components.homematicip_local.server.server import (  # noqa: E402
+    HCUController,
+)
+from custom_components.homematicip_local.server.state import (  # noqa: E402
+    StateChanges,
+    has_changes,
+)
+from custom_components.homematicip_local.server.types.hmip_system import (  # noqa: E402
+    SystemState,
+)
+from custom_components.homematicip_local.server.types.messages import (  # noqa: E402
+    HmipSystemEventBody,
+)
+from custom_components.homematicip_local.server.validator import (  # noqa: E402
+    ValidationPolicy,
+)
+
+BASELINE = Path(__file__).resolve().with_name("bench_event_pipeline.json")
+DEFAULT_SIZES = (100, 1000, 5000)
+DEFAULT_EVENTS = 5000
+# Allowed relative change against the baseline, and the absolute change a
+# metric must also exceed (sub-millisecond tail latencies are noisy)
+TOLERANCE: dict[str, tuple[float, float]] = {
+    "events_per_s": (-0.25, 500.0),
+    "p50_ms": (0.5, 0.05),
+    "p99_ms": (1.0, 0.5),
+    "merge_p50_ms": (0.5, 0.02),
+    "merge_p99_ms": (1.0, 0.2),
+    "coordinator_updates_per_event": (0.05, 0.0),
+    "entity_writes_per_event": (0.05, 0.0),
+    "peak_rss_mb": (0.25, 10.0),
+}
+
+
+class StubHass:
+    """The parts of HomeAssistant the coordinator and the platforms touch.
+
+    There are no registries: the switch platform's area sync fails and is
+    skipped, as it already tolerates.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop: asyncio.AbstractEventLoop = loop
+        self.data: dict[str, Any] = {}
+
+
+class StubEntry:
+    entry_id: str = "bench"
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_size(devices: int, events: int, seed: int) -> dict[str, float]:
+    simulator = HCUSimulator(devices, seed=seed)
+    state = simulator.state
+    # The simulator replaces entries of its devices map; keep the store's apart
+    initial = cast(SystemState, {**state, "devices": dict(state["devices"])})
+    bodies = [
+        cast(HmipSystemEventBody, simulator.make_transaction())
+        for _ in range(events * 2)
+    ]
+
+    controller = HCUController(
+        "127.0.0.1",
+        "",
+        "",
+        "",
+        coalesce_window=0.0,
+        validation_policy=ValidationPolicy("first_shape"),
+    )
+    controller.logger.setLevel("WARNING")
+    store = controller.state_store
+    actor = controller._actor  # pyright: ignore[reportPrivateUsage]
+    worker = controller._validation_worker  # pyright: ignore[reportPrivateUsage]
+    actor.start()
+    worker.start()
+
+    hass = StubHass(asyncio.get_running_loop())
+    coordinator = HCUCoordinator(
+        hass, controller
+    )  # pyright: ignore[reportArgumentType]
+    # Pushes only: no fallback polling timer while the bench runs
+    coordinator.update_interval = None
+    hass.data[DOMAIN] = {StubEntry.entry_id: {"coordinator": coordinator}}
+
+    _ = await actor.replace(initial)
+    while coordinator.data is None:
+        await asyncio.sleep(0)
+
+    # Count the entity state writes the platforms' listeners make
+    writes = 0
+
+    def counting_write(_entity: Entity) -> None:
+        nonlocal writes
+        writes += 1
+
+    Entity.async_write_ha_state = (
+        counting_write  # pyright: ignore[reportAttributeAccessIssue]
+    )
+
+    entities = 0
+
+    def add_entities(
+        new: Any, _update_before_add: bool = False
+    ) -> None:  # noqa: ANN401
+        nonlocal entities
+        for entity in new:
+            entity.hass = hass
+            entities += 1
+
+    for domain in PLATFORMS:
+        module = importlib.import_module(
+            f"custom_components.homematicip_local.{domain.value}"
+        )
+        await module.async_setup_entry(hass, StubEntry(), add_entities)
+
+    # Registered after the platforms, so it runs once their _on_update is done
+    notified = 0
+    updates = 0
+    done = asyncio.Event()
+
+    def on_notified(_state: SystemState, _changes: StateChanges) -> None:
+        nonlocal notified
+        notified += 1
+
+    def on_updated() -> None:
+        nonlocal updates
+        updates += 1
+        done.set()
+
+    _ = controller.add_state_listener(on_notified)
+    _ = coordinator.async_add_listener(on_updated)
+
+    # Time the merges
+    merge_times: list[float] = []
+    apply_events = store.apply_events
+
+    def timed_apply(
+        batch: Any, timestamp: int | None = None  # noqa: ANN401
+    ) -> StateChanges:
+        start = time.perf_counter()
+        changes = apply_events(batch, timestamp)
+        merge_times.append(time.perf_counter() - start)
+        if not has_changes(changes):
+            # Nothing is published, so no listener will finish the event
+            done.set()
+        return changes
+
+    store.apply_events = timed_apply
+
+    handle = controller._handle_hmip_system_event  # pyright: ignore[reportPrivateUsage]
+
+    # Burst: submit everything, then wait until the coordinator delivered it all
+    writes = 0
+    start = time.perf_counter()
+    for body in bodies[:events]:
+        handle(body)
+    while actor.pending or len(merge_times) < events or updates < notified:
+        await asyncio.sleep(0)
+    burst = time.perf_counter() - start
+    burst_updates, burst_writes = updates, writes
+
+    # Paced: one event at a time, latency until the listeners returned
+    merge_times.clear()
+    latencies: list[float] = []
+    for body in bodies[events:]:
+        done.clear()
+        start = time.perf_counter()
+        handle(body)
+        _ = await done.wait()
+        latencies.append(time.perf_counter() - start)
+
+    coordinator.close()
+    await actor.stop()
+    await asyncio.to_thread(worker.stop)
+    return {
+        "devices": devices,
+        "events": events,
+        "entities": entities,
+        "events_per_s": events / burst,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "merge_p50_ms": statistics.median(merge_times) * 1000,
+        "merge_p99_ms": percentile(merge_times, 0.99) * 1000,
+        "coordinator_updates_per_event": burst_updates / events,
+        "entity_writes_per_event": burst_writes / events,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def run_isolated(devices: int, events: int, seed: int) -> dict[str, float]:
+    """Run one size in a fresh process so peak RSS belongs to that size."""
+    out = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--child",
+            str(devices),
+            "--events",
+            str(events),
+            "--seed",
+            str(seed),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return cast(dict[str, float], json.loads(out.strip().splitlines()[-1]))
+
+
+def machine() -> dict[str, object]:
+    """Where results were measured; stored with the baseline."""
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def load_baseline() -> dict[str, Any]:
+    """The stored baseline: machine() fields plus "results" per size.
+
+    Raises FileNotFoundError without one: a run that cannot compare is not
+    a passing run.
+    """
+    if not BASELINE.exists():
+        raise FileNotFoundError(
+            f"no baseline at {BASELINE}; record one on this machine with "
+            "python tools/bench_event_pipeline.py --save-baseline"
+        )
+    return cast(dict[str, Any], json.loads(BASELINE.read_text()))
+
+
+def compare(result: dict[str, float], baseline: dict[str, float]) -> list[str]:
+    regressions: list[str] = []
+    for metric, (tolerance, minimum) in TOLERANCE.items():
+        old, new = baseline.get(metric), result[metric]
+        if not old or abs(new - old) <= minimum:
+            continue
+        change = (new - old) / old
+        if (tolerance < 0 and change < tolerance) or (
+            tolerance > 0 and change > tolerance
+        ):
+            regressions.append(f"{metric} {old:.3g} -> {new:.3g} ({change:+.0%})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _ = parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    _ = parser.add_argument("--events", type=int, default=DEFAULT_EVENTS)
+    _ = parser.add_argument("--seed", type=int, default=1)
+    _ = parser.add_argument("--save-baseline", action="store_true")
+    _ = parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(run_size(args.child, args.events, args.seed))))
+        return
+
+    baseline: dict[str, dict[str, float]] = {}
+    if not args.save_baseline:
+        try:
+            stored = load_baseline()
+        except FileNotFoundError as err:
+            sys.exit(str(err))
+        baseline = stored["results"]
+        print(f"baseline measured on {stored.get('platform', 'an unknown machine')}")
+    results: dict[str, dict[str, float]] = {}
+    failed = False
+    print(
+        f"{'devices':>8} {'events/s':>10} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'merge p50':>10} {'merge p99':>10} {'updates/ev':>10} "
+        f"{'writes/ev':>10} {'RSS MB':>8}"
+    )
+    for size in (int(s) for s in args.sizes.split(",")):
+        result = run_isolated(size, args.events, args.seed)
+        results[str(size)] = result
+        print(
+            f"{size:>8} {result['events_per_s']:>10.0f} {result['p50_ms']:>8.3f} "
+            f"{result['p99_ms']:>8.3f} {result['merge_p50_ms']:>10.3f} "
+            f"{result['merge_p99_ms']:>10.3f} "
+            f"{result['coordinator_updates_per_event']:>10.2f} "
+            f"{result['entity_writes_per_event']:>10.2f} "
+            f"{result['peak_rss_mb']:>8.1f}"
+        )
+        if args.save_baseline:
+            continue
+        if str(size) not in baseline:
+            failed = True
+            print(f"  NO BASELINE for {size} devices")
+            continue
+        for line in compare(result, baseline[str(size)]):
+            failed = True
+            print(f"  REGRESSION {line}")
+
+    if args.save_baseline:
+        _ = BASELINE.write_text(
+            json.dumps(
+                {**machine(), "results": results},
+                indent=2,
+                sort_keys=True,
+            )
+            + "\n"
+        )
+        print(f"baseline written to {BASELINE.name}")
+    else:
+        print("FAILED" if failed else "OK (within baseline tolerance)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Benchmark: reflective vs compiled SystemState validation.
+
+Validates the same synthetic SystemState, clean and with drift, with the
+original reflective checker (reflective_validator.py) and with the compiled
+validator from server/validator.py, checks both report identical issues and
+prints timings; checks that the discriminator lookup selects the same union
+variants as scoring does.
+
+Usage:
+    python tools/bench_validators.py [--devices 500] [--rounds 20]
+"""
+
+import argparse
+import copy
+from pathlib import Path
+import statistics
+import sys
+import time
+from typing import Any, Callable, cast
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from reflective_validator import runtime_type_check  # noqa: E402
+from synthetic_state import make_system_state  # noqa: E402
+
+from server.types.hmip_system import (  # noqa: E402
+    Device,
+    FunctionalChannel,
+    SystemState,
+)
+from server.validator import (  # noqa: E402
+    _compiled,
+    _union_variants,
+    compile_validator,
+)
+
+
+def timed(fn: Callable[[], Any], rounds: int) -> tuple[list[float], Any]:
+    samples: list[float] = []
+    result: Any = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return samples, result
+
+
+def describe(name: str, samples: list[float]) -> str:
+    return (
+        f"{name:<10} median {statistics.median(samples) * 1000:8.2f} ms  "
+        f"min {min(samples) * 1000:8.2f} ms"
+    )
+
+
+def bench_union_selection(state: dict[str, Any], rounds: int) -> tuple[list[str], bool]:
+    """Time discriminator lookup against scoring on every device and channel."""
+    devices = list(state["devices"].values())
+    channels = [ch for d in devices for ch in d["functionalChannels"].values()]
+    lines: list[str] = []
+    ok = True
+    for name, tp, values in (
+        ("Device", Device, devices),
+        ("FunctionalChannel", FunctionalChannel, channels),
+    ):
+        union = _union_variants(tp)
+        scored = [union.score(v) for v in values]
+        picked = [union.pick(v) for v in values]
+        hits = sum(1 for v in values if union.lookup(v) is not None)
+        old_samples, _ = timed(
+            lambda u=union, vs=values: [u.score(v) for v in vs], rounds
+        )
+        new_samples, _ = timed(
+            lambda u=union, vs=values: [u.pick(v) for v in vs], rounds
+        )
+        lines.append(
+            f"{name} union, {len(union.variants)} variants, {len(values)} values, "
+            f"{hits} dispatched by literal:"
+        )
+        lines.append("  " + describe("scoring", old_samples))
+        lines.append("  " + describe("lookup", new_samples))
+        if scored != picked:
+            ok = False
+            lines.append("  MISMATCH between scoring and lookup selection")
+    return lines, ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _ = parser.add_argument("--devices", type=int, default=500)
+    _ = parser.add_argument("--rounds", type=int, default=20)
+    _ = parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    state = make_system_state(args.devices, args.seed)
+    # A copy with some drift so the issue paths are compared as well
+    drifted = cast(dict[str, Any], copy.deepcopy(state))
+    for i, device in enumerate(drifted["devices"].values()):
+        if i % 7 == 0:
+            device["newFirmwareField"] = 1
+        if i % 11 == 0:
+            device.pop("label", None)
+
+    def compiled(value: object) -> list[str]:
+        issues: list[str] = []
+        compile_validator(SystemState)(value, "state", issues)
+        return issues
+
+    _compiled.clear()
+    start = time.perf_counter()
+    _ = compile_validator(SystemState)
+    compile_time = time.perf_counter() - start
+
+    ok = True
+    for label, value in (("clean", state), ("drifted", drifted)):
+        old_samples, old_issues = timed(
+            lambda v=value: runtime_type_check(SystemState, v, "state"), args.rounds
+        )
+        new_samples, new_issues = timed(lambda v=value: compiled(v), args.rounds)
+        print(f"{label} state, {args.devices} devices, {len(old_issues)} issue(s):")
+        print("  " + describe("reflective", old_samples))
+        print("  " + describe("compiled", new_samples))
+        speedup = statistics.median(old_samples) / statistics.median(new_samples)
+        print(f"  speedup x{speedup:.1f}")
+        if old_issues != new_issues:
+            ok = False
+            print("  MISMATCH between reflective and compiled issues")
+            for line in sorted(set(old_issues) ^ set(new_issues))[:10]:
+                print("    " + line)
+    if not compiled(drifted):
+        ok = False
+        print("drift was not reported")
+    lines, selection_ok = bench_union_selection(
+        cast(dict[str, Any], state), args.rounds
+    )
+    print("\n".join(lines))
+    ok = ok and selection_ok
+    print(f"compiling {len(_compiled)} validators took {compile_time * 1000:.1f} ms")
+    print("OK" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
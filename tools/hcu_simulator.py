@@ -0,0 +1,468 @@
+"""Synthetic HCU websocket simulator.
+
+A local stand-in for the Home Control Unit's plugin websocket on port 9001:
+it speaks the plugin message protocol (PLUGIN_STATE_REQUEST/RESPONSE,
+HMIP_SYSTEM_REQUEST/RESPONSE, HMIP_SYSTEM_EVENT), serves a synthetic
+SystemState with a configurable number of devices and pushes DEVICE_CHANGED
+(and optionally DEVICE_CHANNEL_EVENT) transactions at a configurable rate.
+Changes pushed as events are applied to the served state, so a later
+getSystemState agrees with the event stream.
+
+HCUController always connects to wss://<host>:9001. Either run the simulator
+with --tls on port 9001, or, in process, point the controller at the
+simulator: ``controller.url = simulator.url``.
+
+Usage:
+    python tools/hcu_simulator.py [--devices 500] [--rate 50] [--port 9001]
+    python tools/hcu_simulator.py --check [--devices 1000] [--rate 200]
+        [--record capture.jsonl.gz]
+"""
+
+import argparse
+import asyncio
+from collections.abc import Iterator
+import contextlib
+import json
+import logging
+import math
+from pathlib import Path
+import random
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, cast
+import uuid
+
+from aiohttp import WSMsgType, web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_state import make_system_state  # noqa: E402
+
+from server.types.hmip_system import SystemState  # noqa: E402
+from server.types.hmip_system_requests import HmIPHomeRequestPaths  # noqa: E402
+
+_LOGGER = logging.getLogger("hcu_simulator")
+
+ACCESS_POINT_ID = "3014F711A0000000000SIMHCU"
+# Device fields that are never changed by synthetic events
+_FIXED_FIELDS = frozenset({"functionalChannelType", "index", "groupIndex", "deviceId"})
+
+
+def _mutable_fields(device: dict[str, Any]) -> list[tuple[str, str]]:
+    """(channel key, field) pairs an event may change: bools and numbers."""
+    fields: list[tuple[str, str]] = []
+    channels = device.get("functionalChannels")
+    if not isinstance(channels, dict):
+        return fields
+    for ch_key, channel in cast(dict[str, dict[str, Any]], channels).items():
+        for field, value in channel.items():
+            if field in _FIXED_FIELDS:
+                continue
+            if isinstance(value, (bool, int, float)):
+                fields.append((ch_key, field))
+    return fields
+
+
+class HCUSimulator:
+    """Serves a synthetic system state and pushes events to connected plugins."""
+
+    def __init__(
+        self,
+        devices: int = 500,
+        *,
+        seed: int = 1,
+        event_rate: float = 0.0,
+        events_per_transaction: int = 1,
+        channel_event_ratio: float = 0.0,
+        response_latency: float = 0.0,
+        auth_token: str | None = None,
+        state: SystemState | None = None,
+    ) -> None:
+        if state is None and not 1 <= devices <= 100_000:
+            raise ValueError("devices must be between 1 and 100000")
+        if events_per_transaction < 1:
+            raise ValueError("events_per_transaction must be at least 1")
+        self.rnd: random.Random = random.Random(seed)
+        # A given state (e.g. from a capture) is served instead of a synthetic one
+        self.state: SystemState = (
+            state if state is not None else make_system_state(devices, seed)
+        )
+        self.event_rate: float = event_rate
+        self.events_per_transaction: int = events_per_transaction
+        self.channel_event_ratio: float = channel_event_ratio
+        self.response_latency: float = response_latency
+        self.auth_token: str | None = auth_token
+        self.url: str = ""
+        self._device_ids: list[str] = list(self.state["devices"])
+        self._fields: dict[str, list[tuple[str, str]]] = {
+            did: _mutable_fields(cast(dict[str, Any], device))
+            for did, device in self.state["devices"].items()
+        }
+        self._clients: dict[web.WebSocketResponse, str] = {}
+        self._connected: asyncio.Event = asyncio.Event()
+        self._runner: web.AppRunner | None = None
+        self._emitter: asyncio.Task[None] | None = None
+        self.sent_events: int = 0
+        self.sent_transactions: int = 0
+        self.requests: int = 0
+
+    # ---- server ----------------------------------------------------------------------
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        ssl_context: ssl.SSLContext | None = None,
+    ) -> str:
+        """Start serving; returns the websocket URL (port 0 picks a free one)."""
+        app = web.Application()
+        _ = app.router.add_get("/", self._handle_ws)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port, ssl_context=ssl_context)
+        await site.start()
+        server = site._server  # pyright: ignore[reportPrivateUsage]
+        sockets = getattr(server, "sockets", None) or ()
+        bound_port = sockets[0].getsockname()[1] if sockets else port
+        scheme = "wss" if ssl_context is not None else "ws"
+        self.url = f"{scheme}://{host}:{bound_port}"
+        return self.url
+
+    async def stop(self) -> None:
+        await self.stop_events()
+        await self.disconnect_clients()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def wait_connected(self, timeout: float = 10.0) -> bool:
+        try:
+            _ = await asyncio.wait_for(self._connected.wait(), timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    async def disconnect_clients(self) -> None:
+        """Drop every plugin connection, as an HCU restart would."""
+        for ws in list(self._clients):
+            _ = await ws.close()
+
+    async def _handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        if (
+            self.auth_token is not None
+            and request.headers.get("authtoken") != self.auth_token
+        ):
+            raise web.HTTPUnauthorized()
+        plugin_id = request.headers.get("plugin-id", "")
+        ws = web.WebSocketResponse(max_msg_size=0)
+        _ = await ws.prepare(request)
+        self._clients[ws] = plugin_id
+        self._connected.set()
+        _LOGGER.info("Plugin %s connected", plugin_id or "<unknown>")
+        try:
+            await self._send(ws, plugin_id, "PLUGIN_STATE_REQUEST", None)
+            async for msg in ws:
+                if msg.type == WSMsgType.TEXT:
+                    await self._handle_message(ws, plugin_id, cast(str, msg.data))
+        finally:
+            _ = self._clients.pop(ws, None)
+            if not self._clients:
+                self._connected.clear()
+            _LOGGER.info("Plugin %s disconnected", plugin_id or "<unknown>")
+        return ws
+
+    async def _send(
+        self,
+        ws: web.WebSocketResponse,
+        plugin_id: str,
+        msg_type: str,
+        body: object,
+        msg_id: str | None = None,
+    ) -> None:
+        message = {
+            "id": msg_id or str(uuid.uuid4()),
+            "pluginId": plugin_id,
+            "type": msg_type,
+            "body": body,
+        }
+        await ws.send_str(json.dumps(message))
+
+    async def _handle_message(
+        self, ws: web.WebSocketResponse, plugin_id: str, data: str
+    ) -> None:
+        message = cast(dict[str, Any], json.loads(data))
+        msg_type = message.get("type")
+        if msg_type == "HMIP_SYSTEM_REQUEST":
+            self.requests += 1
+            body = cast(dict[str, Any], message.get("body") or {})
+            if self.response_latency > 0:
+                await asyncio.sleep(self.response_latency)
+            await self._send(
+                ws,
+                message.get("pluginId", plugin_id),
+                "HMIP_SYSTEM_RESPONSE",
+                self._system_response(str(body.get("path", ""))),
+                message.get("id"),
+            )
+        elif msg_type == "PLUGIN_STATE_RESPONSE":
+            _LOGGER.debug("Plugin state: %s", message.get("body"))
+        else:
+            _LOGGER.debug("Ignoring %s", msg_type)
+
+    def _system_response(self, path: str) -> dict[str, Any]:
+        if path == HmIPHomeRequestPaths.getSystemState.value:
+            return {"code": 200, "body": self.state}
+        # Control requests are acknowledged without changing the state
+        return {"code": 200, "body": {}}
+
+    # ---- events ----------------------------------------------------------------------
+    def start_events(self) -> None:
+        if self._emitter is None or self._emitter.done():
+            self._emitter = asyncio.get_running_loop().create_task(
+                self._emit_events(), name="hcu-simulator-events"
+            )
+
+    async def stop_events(self) -> None:
+        emitter = self._emitter
+        self._emitter = None
+        if emitter is not None:
+            _ = emitter.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await emitter
+
+    def make_transaction(self) -> dict[str, Any]:
+        """Next event transaction; device changes are applied to the state."""
+        now_ms = int(time.time() * 1000)
+        events: dict[str, Any] = {}
+        for i in range(self.events_per_transaction):
+            did = self.rnd.choice(self._device_ids)
+            if self.rnd.random() < self.channel_event_ratio:
+                events[str(i)] = {
+                    "pushEventType": "DEVICE_CHANNEL_EVENT",
+                    "deviceId": did,
+                    "channelIndex": 1,
+                    "channelEventType": "KEY_PRESS_SHORT",
+                    "functionalChannelIndex": 1,
+                }
+            else:
+                events[str(i)] = {
+                    "pushEventType": "DEVICE_CHANGED",
+                    "device": self._change_device(did, now_ms),
+                }
+        return {
+            "eventTransaction": {
+                "events": events,
+                "origin": {"originType": "DEVICE", "id": self._device_ids[0]},
+                "accessPointId": ACCESS_POINT_ID,
+                "timestamp": now_ms,
+            }
+        }
+
+    def _change_device(self, did: str, now_ms: int) -> dict[str, Any]:
+        devices = cast(dict[str, dict[str, Any]], self.state["devices"])
+        device = dict(devices[did])
+        device["lastStatusUpdate"] = now_ms
+        fields = self._fields[did]
+        if fields:
+            ch_key, field = self.rnd.choice(fields)
+            channels = dict(
+                cast(dict[str, dict[str, Any]], device["functionalChannels"])
+            )
+            channel = dict(channels[ch_key])
+            value = channel[field]
+            if isinstance(value, bool):
+                channel[field] = not value
+            elif isinstance(value, int):
+                channel[field] = value + self.rnd.choice((-1, 1))
+            else:
+                channel[field] = round(cast(float, value) + self.rnd.uniform(-1, 1), 2)
+            channels[ch_key] = channel
+            device["functionalChannels"] = channels
+        # Copy-on-write: previously sent payloads and snapshots stay unchanged
+        devices[did] = device
+        return device
+
+    async def broadcast(self, body: dict[str, Any]) -> None:
+        for ws, plugin_id in list(self._clients.items()):
+            if not ws.closed:
+                await self._send(ws, plugin_id, "HMIP_SYSTEM_EVENT", body)
+        self.sent_transactions += 1
+        self.sent_events += len(body["eventTransaction"]["events"])
+
+    async def broadcast_frame(self, frame: str, events: int = 1) -> None:
+        """Send a recorded frame verbatim to every connected plugin."""
+        for ws in list(self._clients):
+            if not ws.closed:
+                await ws.send_str(frame)
+        self.sent_transactions += 1
+        self.sent_events += events
+
+    async def _emit_events(self) -> None:
+        """Push transactions at event_rate events/s (inf: as fast as possible)."""
+        loop = asyncio.get_running_loop()
+        period = (
+            0.0
+            if math.isinf(self.event_rate)
+            else self.events_per_transaction / self.event_rate
+        )
+        deadline = loop.time()
+        while True:
+            if not self._clients:
+                _ = await self._connected.wait()
+                deadline = loop.time()
+            await self.broadcast(self.make_transaction())
+            if period == 0.0:
+                await asyncio.sleep(0)
+                continue
+            deadline += period
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif delay < -1.0:
+                # More than a second behind: give up catching up
+                deadline = loop.time()
+
+
+@contextlib.contextmanager
+def self_signed_context() -> Iterator[ssl.SSLContext]:
+    """Server TLS context with a throwaway self-signed certificate (openssl)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cert, key = Path(tmp) / "cert.pem", Path(tmp) / "key.pem"
+        _ = subprocess.run(
+            [
+                "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+                "-keyout", str(key), "-out", str(cert), "-days", "1",
+                "-subj", "/CN=hcu-simulator",
+            ],
+            check=True,
+            capture_output=True,
+        )  # fmt: skip
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(cert, key)
+        yield context
+
+
+async def run_check(
+    simulator: HCUSimulator, duration: float, record: str | None = None
+) -> bool:
+    """Run an HCUController against the simulator and report what it saw."""
+    import aiohttp
+
+    from server.recorder import FrameRecorder
+    from server.server import HCUController
+    from server.state import StateChanges
+
+    url = await simulator.start()
+    changed: set[str] = set()
+    notifications = 0
+
+    def on_state(_state: SystemState, changes: StateChanges) -> None:
+        nonlocal notifications
+        notifications += 1
+        changed.update(changes["devices"])
+
+    async with aiohttp.ClientSession() as session:
+        controller = HCUController(
+            "127.0.0.1",
+            "",
+            "",
+            "",
+            session=session,
+            recorder=FrameRecorder(record) if record else None,
+        )
+        controller.url = url
+        controller.logger.setLevel(logging.WARNING)  # per-message INFO logs
+        _ = controller.add_state_listener(on_state)
+        await controller.async_start()
+        ok = await controller.async_wait_until_ready(5.0)
+        state = await controller.async_fetch_system_state() if ok else None
+        start = time.perf_counter()
+        simulator.start_events()
+        await asyncio.sleep(duration)
+        await simulator.stop_events()
+        elapsed = time.perf_counter() - start
+        await asyncio.sleep(1.0)  # let coalesced notifications flush
+        merged = controller.state_store.state
+        await controller.async_stop()
+    await simulator.stop()
+
+    devices = len(state["devices"]) if state is not None else 0
+    consistent = merged is not None and merged["devices"] == simulator.state["devices"]
+    print(
+        f"fetched {devices} devices; pushed {simulator.sent_events} events in "
+        f"{simulator.sent_transactions} transactions "
+        f"({simulator.sent_events / elapsed:.0f}/s); "
+        f"{notifications} notifications for {len(changed)} devices; "
+        f"merged state {'matches' if consistent else 'DIFFERS from'} simulator"
+    )
+    return ok and devices == len(simulator.state["devices"]) and consistent
+
+
+async def serve(simulator: HCUSimulator, args: argparse.Namespace) -> None:
+    with contextlib.ExitStack() as stack:
+        context = stack.enter_context(self_signed_context()) if args.tls else None
+        url = await simulator.start(args.host, args.port, context)
+        print(f"HCU simulator with {len(simulator.state['devices'])} devices at {url}")
+        if simulator.event_rate > 0:
+            simulator.start_events()
+        try:
+            while True:
+                await asyncio.sleep(10)
+                _LOGGER.info(
+                    "%d events in %d transactions, %d requests, %d client(s)",
+                    simulator.sent_events,
+                    simulator.sent_transactions,
+                    simulator.requests,
+                    len(simulator._clients),  # pyright: ignore[reportPrivateUsage]
+                )
+        finally:
+            await simulator.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _ = parser.add_argument("--devices", type=int, default=500)
+    _ = parser.add_argument("--seed", type=int, default=1)
+    _ = parser.add_argument(
+        "--rate", type=float, default=10.0, help="events/s, inf: unthrottled"
+    )
+    _ = parser.add_argument("--events-per-transaction", type=int, default=1)
+    _ = parser.add_argument("--channel-event-ratio", type=float, default=0.0)
+    _ = parser.add_argument(
+        "--latency", type=float, default=0.0, help="response delay in ms"
+    )
+    _ = parser.add_argument("--auth-token", default=None)
+    _ = parser.add_argument("--host", default="127.0.0.1")
+    _ = parser.add_argument("--port", type=int, default=9001)
+    _ = parser.add_argument("--tls", action="store_true", help="serve wss://")
+    _ = parser.add_argument(
+        "--check", action="store_true", help="run a controller against it and exit"
+    )
+    _ = parser.add_argument("--duration", type=float, default=5.0)
+    _ = parser.add_argument(
+        "--record", metavar="PATH", help="capture the check's traffic (server.recorder)"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING if args.check else logging.INFO)
+
+    simulator = HCUSimulator(
+        args.devices,
+        seed=args.seed,
+        event_rate=args.rate,
+        events_per_transaction=args.events_per_transaction,
+        channel_event_ratio=args.channel_event_ratio,
+        response_latency=args.latency / 1000,
+        auth_token=args.auth_token,
+    )
+    if args.check:
+        ok = asyncio.run(run_check(simulator, args.duration, args.record))
+        print("OK" if ok else "FAILED")
+        sys.exit(0 if ok else 1)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(simulator, args))
+
+
+if __name__ == "__main__":
+    main()
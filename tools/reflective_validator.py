@@ -0,0 +1,444 @@
+"""The reflective SystemState type checker the compiled validators replaced.
+
+server/validator.py compiles a validator per annotation. This is the
+original implementation, which walks the annotations on every call. It is
+kept as the reference that tools/bench_validators.py times against and
+checks issue parity with. Nothing in the integration uses it.
+"""
+
+from pathlib import Path
+import sys
+from typing import Any, Literal, get_args, get_origin
+
+INTEGRATION_DIR = (
+    Path(__file__).resolve().parents[1] / "custom_components" / "homematicip_local"
+)
+if str(INTEGRATION_DIR) not in sys.path:
+    sys.path.insert(0, str(INTEGRATION_DIR))
+
+# The type introspection helpers are shared with the compiled validators
+from server.validator import (  # noqa: E402
+    DISCRIMINATOR_KEYS,
+    _is_any,
+    _is_typed_dict,
+    _unwrap_optional,
+)
+from server.validator import _is_union as _is_union_type  # noqa: E402
+
+_UNION_DISCRIMINATOR_KEYS: tuple[str, ...] = DISCRIMINATOR_KEYS
+
+
+def _validate_typed_dict(
+    name: str,
+    spec: type,
+    value: object,
+    issues: list[str],
+    *,
+    allow_extra: bool = False,
+    record_unexpected: bool = True,
+) -> None:
+    """Validate a TypedDict-like object.
+
+    allow_extra controls whether unexpected keys raise (False) or are just
+    collected as issues (True). Used with union probing to avoid premature
+    failure before picking the best variant.
+    """
+    if not isinstance(value, dict):
+        issues.append(
+            f"{name}: expected dict (TypedDict {spec.__name__}), got {type(value).__name__}"
+        )
+        return
+    annotations: dict[str, object] = getattr(spec, "__annotations__", {})  # type: ignore[reportExplicitAny]
+    for k, tp in annotations.items():
+        if k not in value:  # type: ignore[reportUnknownArgumentType]
+            # Suppress missing-key report when the field is Optional (i.e. Union[..., None])
+            is_optional = False
+            try:
+                if _is_union_type(tp):
+                    args = get_args(tp)
+                    # Optional if a NoneType member exists
+                    if any(a is type(None) for a in args):  # noqa: E721
+                        is_optional = True
+                elif tp is None or tp is type(None):  # direct None annotation
+                    is_optional = True
+            except Exception:  # pragma: no cover - defensive
+                pass
+            if not is_optional:
+                issues.append(f"{name}.{k}: missing key")
+            continue
+        # Use full runtime checker (handles unions & nested TypedDicts)
+        _runtime_type_check(tp, value[k], f"{name}.{k}", issues)
+    if record_unexpected:
+        extras = [str(k) for k in value.keys() if k not in annotations]
+        if extras:
+            for ex in extras:
+                issues.append(f"{name}.{ex}: unexpected key")
+            if not allow_extra:
+                raise KeyError(f"{name}: unexpected key(s) {extras}")
+
+
+def _literal_values(tp: object) -> set[object]:
+    if get_origin(tp) is Literal:
+        return set(get_args(tp))
+    return set()
+
+
+def _pick_typed_dict_union_variant(
+    variants: tuple[object, ...], value: object
+) -> object | None:
+    if not isinstance(value, dict):
+        return None
+    best: object | None = None
+    best_score = -10
+    for variant in variants:
+        if not _is_typed_dict(variant):
+            continue
+        ann = getattr(variant, "__annotations__", {})
+        score = 0
+        matched = False
+        for key in _UNION_DISCRIMINATOR_KEYS:
+            if key in value and key in ann:
+                tp = ann[key]
+                lits = _literal_values(tp)
+                # Literal discriminator = strongest signal
+                if lits:
+                    if value[key] in lits:
+                        score += 50
+                        matched = True
+                    else:
+                        # Hard mismatch -> invalidate this variant completely
+                        score = -100
+                        matched = False
+                        break
+                else:
+                    # Non-literal discriminator: soft signal if runtime value type matches annotation base
+                    base = _unwrap_optional(tp)
+                    try:
+                        if isinstance(base, type) and isinstance(value[key], base):
+                            score += 5
+                            matched = True
+                        else:
+                            score += 1  # weak hint due to key presence
+                    except TypeError:
+                        score += 1
+        if score < 0:
+            continue
+        required_keys = set(getattr(variant, "__annotations__", {}).keys())
+        present = required_keys.intersection(value.keys())
+        missing = required_keys - value.keys()
+        score += len(present) * 0.05
+        score -= len(missing) * 0.02
+        if matched and score > best_score:
+            best_score = score
+            best = variant
+    return best
+
+
+def _variant_literal_mismatch(variant: object, value: object) -> bool:
+    """Return True if any literal discriminator key on variant mismatches value.
+
+    Only considers keys in _UNION_DISCRIMINATOR_KEYS that are annotated as Literal[...] on the variant.
+    Missing discriminator key on value is treated as mismatch (can't positively identify variant).
+    """
+    if not isinstance(value, dict) or not _is_typed_dict(variant):
+        return True
+    ann = getattr(variant, "__annotations__", {})
+    for key in _UNION_DISCRIMINATOR_KEYS:
+        if key not in ann:
+            continue
+        tp = ann[key]
+        if get_origin(tp) is Literal:
+            lits = set(get_args(tp))
+            if key not in value:
+                return True
+            if value[key] not in lits:
+                return True
+    return False
+
+
+def _validate_literal(
+    tp: Any, value: Any
+) -> bool:  # pyright: ignore[reportExplicitAny, reportAny]
+    if get_origin(tp) is Literal:
+        # if value not in get_args(tp):
+        #    print(
+        #        "value",
+        #        value,
+        #        "get_origin",
+        #        get_origin(tp),
+        #        "get_args",
+        #        get_args(tp),
+        #        "tp",
+        #        tp,
+        #    )
+        return value in get_args(tp)
+    return True
+
+
+def _validate_generic(
+    origin: Any,  # pyright: ignore[reportExplicitAny, reportAny]
+    args: tuple[Any, ...],  # pyright: ignore[reportExplicitAny]
+    value: Any,  # pyright: ignore[reportExplicitAny, reportAny]
+    path: str,
+    issues: list[str],
+    depth: int,
+) -> None:
+    if origin in (list, tuple, set):
+        if not isinstance(value, origin):
+            issues.append(
+                f"{path}: expected {origin.__name__}, got {type(value).__name__}"
+            )
+            return
+        elem_types: tuple[Any, ...]
+        if not args:
+            return
+        if origin is tuple and len(args) != 2 and args and args[-1] is Ellipsis:
+            # Homogenous tuple like Tuple[T, ...]
+            elem_types = (args[0],)
+        else:
+            elem_types = args
+        for i, elem in enumerate(value):  # pyright: ignore[reportUnknownVariableType]
+            check_tp = elem_types[min(i, len(elem_types) - 1)]
+            _runtime_type_check(check_tp, elem, f"{path}[{i}]", issues, depth + 1)
+    elif origin is dict:
+        if not isinstance(value, dict):
+            issues.append(f"{path}: expected dict, got {type(value).__name__}")
+            return
+        if len(args) == 2:
+            kt, vt = args
+            for i, (k, v) in enumerate(
+                value.items()
+            ):  # pyright: ignore[reportUnknownVariableType]
+                if i >= 50:  # limit to avoid huge cost
+                    break
+                _runtime_type_check(kt, k, f"{path}.<key>", issues, depth + 1)
+                _runtime_type_check(vt, v, f"{path}[{repr(k)}]", issues, depth + 1)
+    else:
+        # Fallback: basic instance check
+        if not isinstance(value, origin):
+            issues.append(
+                f"{path}: expected {getattr(origin, '__name__', origin)}, got {type(value).__name__}"
+            )
+
+
+def _runtime_type_check(
+    tp: Any,
+    value: Any,
+    path: str,
+    issues: list[str],
+    depth: int = 0,
+    max_depth: int = 6,
+) -> None:
+    if depth > max_depth:
+        return
+    if _is_any(tp):  # Any accepts everything
+        return
+    if tp is object:
+        return
+    # Fast-path: accept None when annotation explicitly allows it (before Optional unwrapping).
+    # Without this guard, we unwrap Optional[T] to T and then incorrectly flag None values.
+    if value is None:
+        try:
+            if tp is None or tp is type(None):  # direct None annotation
+                return
+            if _is_union_type(tp):
+                args = get_args(tp)
+                # If any variant is exactly NoneType we accept None immediately
+                if any(a is type(None) for a in args):  # noqa: E721
+                    return
+        except Exception:  # pragma: no cover - defensive
+            pass
+    # Handle optionals
+    base = _unwrap_optional(tp)
+    origin = get_origin(base)
+    # Early guard: if 'base' is not a type / TypedDict / union / literal container we skip.
+    if not (
+        isinstance(base, type)
+        or _is_typed_dict(base)
+        or _is_union_type(base)
+        or origin is not None
+        or base is None
+    ):
+        # Prevent messages like 'expected UnionType, got dict' when a runtime value
+        # (e.g. already a dict) was accidentally passed as the spec.
+        return
+    if origin is Literal:
+        if not _validate_literal(tp, value):
+            issues.append(f"{path}: value {value!r} not in {get_args(base)!r}")
+        return
+    if _is_typed_dict(base):
+        try:
+            _validate_typed_dict(path, base, value, issues)
+        except KeyError as ke:
+            issues.append(str(ke))
+        return
+    if _is_union_type(base):  # handle Union / PEP604
+        union_args = get_args(base)
+        # Fast discriminant-based selection for TypedDict unions
+        chosen = _pick_typed_dict_union_variant(union_args, value)
+        if chosen is not None:
+            _runtime_type_check(chosen, value, path, issues, depth + 1, max_depth)
+            return
+        # Fallback: sequential attempt until one yields no new issues
+        best_variant: object | None = None
+        best_variant_missing = 10**9
+        # Track whether any variant matched strictly (zero issues) for early exit
+        for variant in union_args:  # type: ignore[reportExplicitAny]
+            # Skip early if literal discriminator mismatch
+            if _is_typed_dict(variant) and isinstance(value, dict):  # type: ignore[reportExplicitAny]
+                try:
+                    if _variant_literal_mismatch(variant, value):
+                        continue
+                except Exception:
+                    # defensive: skip on unexpected errors
+                    continue
+            trial_issues: list[str] = []
+            if _is_typed_dict(variant) and isinstance(value, dict):  # type: ignore[reportExplicitAny]
+                # Probe with allow_extra to focus on missing keys first
+                try:
+                    _validate_typed_dict(
+                        path,
+                        variant,
+                        value,
+                        trial_issues,
+                        allow_extra=True,
+                        record_unexpected=False,
+                    )  # type: ignore[reportExplicitAny]
+                except KeyError:
+                    # Should not raise with allow_extra=True, but ignore if it does
+                    pass
+                missing_count = sum(
+                    1 for m in trial_issues if m.endswith("missing key")
+                )
+                if missing_count < best_variant_missing:
+                    best_variant_missing = missing_count
+                    best_variant = variant
+                if missing_count == 0:
+                    # Re-run strictly to record any unexpected keys / nested issues
+                    strict_issues: list[str] = []
+                    try:
+                        _validate_typed_dict(
+                            path,
+                            variant,
+                            value,
+                            strict_issues,
+                            allow_extra=False,
+                            record_unexpected=True,
+                        )  # type: ignore[reportExplicitAny]
+                    except KeyError as ke:
+                        strict_issues.append(str(ke))
+                    issues.extend(strict_issues)
+                    return
+            else:
+                _runtime_type_check(
+                    variant, value, path, trial_issues, depth + 1, max_depth
+                )  # type: ignore[reportExplicitAny]
+                if not trial_issues:
+                    return
+
+        # No variant matched perfectly. Produce detailed diagnostics explaining why.
+        def _variant_name(v: object) -> str:
+            return getattr(v, "__name__", repr(v))
+
+        if isinstance(value, dict):
+            diagnostics: list[str] = []
+            MAX_VARIANTS = 12
+            shown = 0
+            for variant in union_args:  # type: ignore[reportExplicitAny]
+                if shown >= MAX_VARIANTS:
+                    diagnostics.append(
+                        f"... ({len(union_args) - shown} more variants omitted)"
+                    )
+                    break
+                if not _is_typed_dict(variant):  # type: ignore[reportExplicitAny]
+                    continue
+                shown += 1
+                v_issues: list[str] = []
+                try:
+                    _validate_typed_dict(
+                        path,
+                        variant,
+                        value,
+                        v_issues,
+                        allow_extra=False,
+                        record_unexpected=True,
+                    )  # type: ignore[reportExplicitAny]
+                except KeyError as ke:
+                    v_issues.append(str(ke))
+                missing: list[str] = []
+                unexpected: list[str] = []
+                nested: list[str] = []
+                for msg in v_issues:
+                    if msg.endswith("missing key"):
+                        comp = msg.split(":", 1)[0].removeprefix(f"{path}.")
+                        missing.append(comp)
+                    elif msg.endswith("unexpected key"):
+                        comp = msg.split(":", 1)[0].removeprefix(f"{path}.")
+                        unexpected.append(comp)
+                    else:
+                        nested.append(msg)
+                literal_mismatches: list[str] = []
+                ann = getattr(variant, "__annotations__", {})  # type: ignore[reportExplicitAny]
+                for k in _UNION_DISCRIMINATOR_KEYS:
+                    if k in ann and get_origin(ann[k]) is Literal:  # type: ignore[reportExplicitAny]
+                        allowed = set(get_args(ann[k]))
+                        if k not in value:
+                            literal_mismatches.append(
+                                f"{k}=<missing> expected one of {sorted(allowed)!r}"
+                            )
+                        elif value[k] not in allowed:
+                            literal_mismatches.append(
+                                f"{k}={value[k]!r} not in {sorted(allowed)!r}"
+                            )
+                parts: list[str] = []
+                if missing:
+                    parts.append(f"missing={missing}")
+                if unexpected:
+                    parts.append(f"unexpected={unexpected}")
+                if literal_mismatches:
+                    parts.append(f"literal={literal_mismatches}")
+                if nested and len(nested) < 4:
+                    parts.append(f"nested={nested}")
+                elif nested:
+                    parts.append(f"nestedIssues={len(nested)}")
+                if not parts:
+                    parts.append("(no direct key issues – likely nested mismatch)")
+                diagnostics.append(f"{_variant_name(variant)} -> " + ", ".join(parts))  # type: ignore[reportExplicitAny]
+            if best_variant is not None:
+                best_name = _variant_name(best_variant)
+                diagnostics.sort(
+                    key=lambda d: 0 if d.startswith(best_name + " ->") else 1
+                )
+            issues.append(
+                f"{path}: dict not compatible with any of {len(union_args)} union variants. Details: "
+                + " | ".join(diagnostics)
+            )
+            return
+        else:
+            issues.append(
+                f"{path}: value {type(value).__name__} not compatible with any union variant ({len(union_args)})"
+            )
+        return
+    if origin is not None:
+        _validate_generic(origin, get_args(base), value, path, issues, depth)
+        return
+    # Primitive / class check
+    if base is None:
+        if value is not None:
+            issues.append(f"{path}: expected None, got {type(value).__name__}")
+        return
+    if not isinstance(value, base):
+        # Improve union residual case readability (should rarely happen)
+        if _is_union_type(base):
+            issues.append(f"{path}: value {value!r} not in union {get_args(base)!r}")
+        else:
+            issues.append(
+                f"{path}: expected {getattr(base, '__name__', base)}, got {type(value).__name__}"
+            )
+
+
+def runtime_type_check(tp: object, value: object, path: str = "value") -> list[str]:
+    """Issues of value against annotation tp, as the reflective checker reports them."""
+    issues: list[str] = []
+    _runtime_type_check(tp, value, path, issues)
+    return issues
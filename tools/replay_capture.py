@@ -0,0 +1,174 @@
+"""Replay a recorded HCU capture through HCUController.
+
+Reads a capture written by server.recorder (the "Record HCU traffic" option,
+or hcu_simulator.py --check --record), serves its first getSystemState
+response from a local HCUSimulator and pushes its HMIP_SYSTEM_EVENT frames
+verbatim over the websocket to a real HCUController, keeping the recorded
+inter-arrival times at 1x, scaled by --speed, or as fast as possible
+(--speed max). Reports the achieved event rate, measured until the
+controller merged the last event, how long merging lagged behind the last
+frame and how many notifications the listeners received.
+
+Usage:
+    python tools/replay_capture.py CAPTURE [--speed 1|N|max] [--max-gap 5]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+import sys
+from typing import Any, cast
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from hcu_simulator import HCUSimulator  # noqa: E402
+
+from server.recorder import read_capture  # noqa: E402
+from server.server import HCUController  # noqa: E402
+from server.state import StateChanges  # noqa: E402
+from server.types.hmip_system import SystemState  # noqa: E402
+
+# (seconds since the previous replayed frame, raw frame, events in it)
+Frame = tuple[float, str, int]
+# How long merging may lag behind the last replayed frame (seconds)
+MERGE_TIMEOUT = 30.0
+
+
+def load_capture(path: str, max_gap: float) -> tuple[SystemState | None, list[Frame]]:
+    """The first full system state and the event frames of a capture."""
+    state: SystemState | None = None
+    frames: list[Frame] = []
+    previous: float | None = None
+    for record in read_capture(path):
+        message = cast(dict[str, Any], json.loads(record["frame"]))
+        msg_type = message.get("type")
+        body = message.get("body")
+        if msg_type == "HMIP_SYSTEM_RESPONSE" and state is None:
+            inner = body.get("body") if isinstance(body, dict) else None
+            if isinstance(inner, dict) and "devices" in inner:
+                state = cast(SystemState, inner)
+            continue
+        if msg_type != "HMIP_SYSTEM_EVENT" or not isinstance(body, dict):
+            continue
+        # Restarts or idle stretches: clamp the gap
+        gap = (
+            0.0 if previous is None else min(max(record["t"] - previous, 0.0), max_gap)
+        )
+        previous = record["t"]
+        events = len(body.get("eventTransaction", {}).get("events", {}))
+        frames.append((gap, record["frame"], events))
+    return state, frames
+
+
+async def replay(
+    state: SystemState, frames: list[Frame], speed: float
+) -> dict[str, float]:
+    simulator = HCUSimulator(state=state)
+    url = await simulator.start()
+    notifications = 0
+
+    def on_state(_state: SystemState, _changes: StateChanges) -> None:
+        nonlocal notifications
+        notifications += 1
+
+    async with aiohttp.ClientSession() as session:
+        controller = HCUController("127.0.0.1", "", "", "", session=session)
+        controller.url = url
+        controller.logger.setLevel(logging.WARNING)  # per-message INFO logs
+        _ = controller.add_state_listener(on_state)
+        await controller.async_start()
+        if not await controller.async_wait_until_ready(5.0):
+            raise RuntimeError("controller did not connect to the replay server")
+        _ = await controller.async_fetch_system_state()
+        notifications = 0
+
+        # Count the pushed events the state actor merged (stale ones included)
+        store = controller.state_store
+        apply_events = store.apply_events
+        merged = 0
+
+        def counting_apply(
+            batch: Any, timestamp: int | None = None  # noqa: ANN401
+        ) -> StateChanges:
+            nonlocal merged
+            batch = list(batch)
+            merged += len(batch)
+            return apply_events(batch, timestamp)
+
+        store.apply_events = counting_apply
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        due = 0.0
+        for gap, frame, events in frames:
+            if speed > 0:
+                due += gap / speed
+                delay = start + due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await simulator.broadcast_frame(frame, events)
+        sent = loop.time()
+        # Frames are still in flight to (or queued in) the controller here:
+        # done once every sent event went through a merge
+        deadline = sent + MERGE_TIMEOUT
+        while merged < simulator.sent_events:
+            if loop.time() > deadline:
+                raise RuntimeError(
+                    f"only {merged} of {simulator.sent_events} events merged "
+                    f"{MERGE_TIMEOUT:g}s after the last frame"
+                )
+            await asyncio.sleep(0.001)
+        drained = loop.time()
+        await asyncio.sleep(1.0)  # let coalesced notifications flush
+        await controller.async_stop()
+    await simulator.stop()
+    return {
+        "duration": drained - start,
+        "lag": drained - sent,
+        "events": simulator.sent_events,
+        "frames": simulator.sent_transactions,
+        "notifications": notifications,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _ = parser.add_argument("capture")
+    _ = parser.add_argument(
+        "--speed", default="1", help="1 for real time, N for N times faster, max"
+    )
+    _ = parser.add_argument(
+        "--max-gap", type=float, default=5.0, help="longest pause replayed (s)"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    speed = 0.0 if args.speed == "max" else float(args.speed)
+    if speed < 0:
+        parser.error("--speed must be positive or max")
+
+    state, frames = load_capture(args.capture, args.max_gap)
+    if state is None:
+        sys.exit("capture contains no getSystemState response to start from")
+    if not frames:
+        sys.exit("capture contains no HMIP_SYSTEM_EVENT frames")
+    recorded = sum(gap for gap, _, _ in frames)
+    print(
+        f"replaying {len(frames)} frames ({sum(e for _, _, e in frames)} events, "
+        f"{recorded:.1f}s recorded) with {len(state['devices'])} devices "
+        f"at {'max' if speed == 0 else f'{speed:g}x'} speed"
+    )
+    result = asyncio.run(replay(state, frames, speed))
+    rate = result["events"] / result["duration"] if result["duration"] else 0.0
+    print(
+        f"merged {result['events']:.0f} events in {result['duration']:.2f}s "
+        f"({rate:.0f}/s); the last {result['lag'] * 1000:.1f} ms after the last "
+        f"frame; {result['notifications']:.0f} notifications"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Schema-driven synthetic HCU system states.
+
+Builds SystemState payloads that satisfy the TypedDicts in
+server/types/hmip_system.py by walking their annotations, cycling through the
+Device variants so every device model shows up. Used by the benchmarks and
+the HCU simulator.
+"""
+
+from pathlib import Path
+import random
+import sys
+import types
+from typing import Any, Literal, Union, cast, get_args, get_origin
+
+INTEGRATION_DIR = (
+    Path(__file__).resolve().parents[1] / "custom_components" / "homematicip_local"
+)
+if str(INTEGRATION_DIR) not in sys.path:
+    sys.path.insert(0, str(INTEGRATION_DIR))
+
+from server.types import hmip_system  # noqa: E402
+from server.types.hmip_system import SystemState  # noqa: E402
+
+_NONE_TYPE = type(None)
+
+
+def _is_typed_dict(tp: object) -> bool:
+    return isinstance(tp, type) and hasattr(tp, "__required_keys__")
+
+
+def _is_union(tp: object) -> bool:
+    origin = get_origin(tp)
+    return origin is Union or origin is types.UnionType
+
+
+def sample_value(tp: object, rnd: random.Random, key: str = "") -> Any:  # noqa: ANN401
+    """Return a value valid for annotation tp."""
+    if tp is Any or tp is object:
+        return None
+    if tp is None or tp is _NONE_TYPE:
+        return None
+    origin = get_origin(tp)
+    if origin is Literal:
+        return rnd.choice(get_args(tp))
+    if _is_union(tp):
+        options = [a for a in get_args(tp) if a is not _NONE_TYPE]
+        if not options:
+            return None
+        return sample_value(rnd.choice(options), rnd, key)
+    if _is_typed_dict(tp):
+        return sample_typed_dict(cast(type, tp), rnd)
+    if origin in (list, set, tuple):
+        args = [a for a in get_args(tp) if a is not Ellipsis]
+        if not args:
+            return origin()
+        items = [sample_value(args[0], rnd, key) for _ in range(rnd.randint(0, 2))]
+        return origin(items)
+    if origin is dict:
+        args = get_args(tp)
+        if len(args) != 2 or args[0] is None:
+            return {}
+        if get_origin(args[0]) is Literal:
+            keys = list(get_args(args[0]))
+        else:
+            keys = [str(i) for i in range(rnd.randint(1, 2))]
+        return {k: sample_value(args[1], rnd, key) for k in keys}
+    if tp is bool:
+        return rnd.random() < 0.5
+    if tp is int:
+        return rnd.randint(0, 1000)
+    if tp is float:
+        return round(rnd.uniform(0, 100), 2)
+    if tp is str:
+        return f"{key or 'value'}-{rnd.randint(0, 9999)}"
+    return None
+
+
+def sample_typed_dict(spec: type, rnd: random.Random) -> dict[str, Any]:
+    annotations: dict[str, object] = getattr(spec, "__annotations__", {})
+    return {key: sample_value(tp, rnd, key) for key, tp in annotations.items()}
+
+
+def device_variants() -> list[type]:
+    variants: list[type] = [
+        v for v in get_args(hmip_system.Device) if _is_typed_dict(v)
+    ]
+    return variants
+
+
+def make_device(did: str, variant: type, rnd: random.Random) -> dict[str, Any]:
+    device = sample_typed_dict(variant, rnd)
+    device["id"] = did
+    device["label"] = f"Device {did}"
+    channels = device.get("functionalChannels")
+    if isinstance(channels, dict):
+        for channel in cast(dict[str, dict[str, Any]], channels).values():
+            if "deviceId" in channel:
+                channel["deviceId"] = did
+            if "groups" in channel:
+                channel["groups"] = []
+    return device
+
+
+def make_system_state(devices: int, seed: int = 1) -> SystemState:
+    """A schema-valid SystemState with the given number of devices."""
+    rnd = random.Random(seed)
+    template = sample_typed_dict(cast(type, SystemState), rnd)
+    variants = device_variants()
+    template["devices"] = {
+        f"3014F711A{i:015X}": make_device(
+            f"3014F711A{i:015X}", variants[i % len(variants)], rnd
+        )
+        for i in range(devices)
+    }
+    return cast(SystemState, template)